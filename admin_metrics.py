@@ -0,0 +1,107 @@
+"""
+Admin Metrics Page
+Hidden Streamlit view over the tracing JSONL: p50/p95/p99 per stage and per
+LLM provider for a chosen time window. Opened with
+?admin=metrics&token=<ADMIN_TOKEN>; disabled while ADMIN_TOKEN is unset.
+Not linked from the UI.
+"""
+
+import os
+import hmac
+import time
+
+import streamlit as st
+
+from tracing import load_spans, summarize
+from stats_store import get_stats
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+WINDOWS = {
+    "Last hour": 3600,
+    "Last 6 hours": 6 * 3600,
+    "Last 24 hours": 24 * 3600,
+    "Last 7 days": 7 * 24 * 3600,
+}
+
+
+def is_admin_request():
+    """True when the URL asks for the metrics page and carries the configured admin token."""
+    params = st.query_params
+    if params.get("admin") != "metrics" or not ADMIN_TOKEN:
+        return False
+    token = params.get("token") or ""
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load(window_seconds):
+    return load_spans(window_seconds)
+
+
+def render_metrics_page():
+    st.title("Pipeline metrics")
+    window_label = st.selectbox("Time window", list(WINDOWS), index=2)
+    if st.button("Refresh"):
+        _load.clear()
+    window_seconds = WINDOWS[window_label]
+    spans = _load(window_seconds)
+
+    _render_usage(window_seconds)
+
+    if not spans:
+        st.info("No traces recorded in this window.")
+        return
+
+    generated = sum(1 for s in spans if s['name'] == 'node_render' and s.get('status') == 'ok')
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Spans", len(spans))
+    col2.metric("Errors", sum(1 for s in spans if s.get('status') != 'ok'))
+    col3.metric("Node renders", generated)
+
+    st.subheader("Per stage")
+    st.dataframe(summarize(spans, ('name',)), use_container_width=True)
+
+    llm = [s for s in spans if s['name'] == 'llm']
+    if llm:
+        st.subheader("LLM calls per provider")
+        st.dataframe(summarize(llm, ('provider', 'call')), use_container_width=True)
+
+    images = [s for s in spans if s['name'] == 'image_fetch']
+    if images:
+        st.subheader("Image sources")
+        st.dataframe(summarize(images, ('source',)), use_container_width=True)
+
+    st.subheader("Slowest spans")
+    slowest = sorted(spans, key=lambda s: s['duration_ms'], reverse=True)[:25]
+    st.dataframe([
+        {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s['ts'])),
+            'name': s['name'],
+            'duration_ms': s['duration_ms'],
+            'status': s.get('status'),
+            'provider': s.get('provider') or s.get('source') or s.get('tier'),
+            'error': s.get('error'),
+        }
+        for s in slowest
+    ], use_container_width=True)
+
+
+def _render_usage(window_seconds):
+    """Visit / generation counters and their time series from the stats store."""
+    stats = get_stats()
+    totals = stats.totals()
+    if not totals:
+        return
+    st.subheader("Usage")
+    cols = st.columns(len(totals))
+    for col, (name, info) in zip(cols, totals.items()):
+        col.metric(name.replace('_', ' ').capitalize(), info['value'])
+    bucket = 3600 if window_seconds <= 24 * 3600 else 86400
+    chart = {}
+    for name in totals:
+        for ts, value in stats.time_series(name, window_seconds, bucket):
+            label = time.strftime('%m-%d %H:00' if bucket == 3600 else '%Y-%m-%d', time.localtime(ts))
+            chart.setdefault(label, {})[name] = value
+    if chart:
+        st.bar_chart([dict({name: 0 for name in totals}, time=k, **chart[k]) for k in sorted(chart)], x='time')
@@ -7,12 +7,13 @@ Uses Hugging Face Inference API + Mistral for prompt generation
 Flow: Slide Text → Image Prompt (Mistral) → HF API → Generated Image → PPT
 """
 
-import requests
 import os
 from typing import Optional, Dict
 from io import BytesIO
 from PIL import Image
 from dotenv import load_dotenv
+from artifact_store import get_store
+from resources import http_session
 
 load_dotenv()
 
@@ -74,7 +75,7 @@ Given this slide title and content, create a detailed, descriptive prompt for ge
             "temperature": 0.7
         }
 
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=data, timeout=30)
+        response = http_session().post(MISTRAL_API_URL, headers=headers, json=data, timeout=30)
 
         if response.status_code == 200:
             result = response.json()
@@ -126,7 +127,7 @@ def generate_image_with_huggingface(prompt: str, output_path: str) -> bool:
         print(f"   Prompt: {prompt[:100]}...")
 
         # Call Hugging Face API
-        response = requests.post(HF_API_URL, headers=headers, json=payload, timeout=60)
+        response = http_session().post(HF_API_URL, headers=headers, json=payload, timeout=60)
 
         if response.status_code == 200:
             # Save image
@@ -153,19 +154,20 @@ def generate_image_with_huggingface(prompt: str, output_path: str) -> bool:
         return False
 
 
-def generate_slide_image(slide_title: str, slide_content: str, output_dir: str = "temp_images") -> Optional[str]:
+def generate_slide_image(slide_title: str, slide_content: str, output_dir: Optional[str] = None) -> Optional[str]:
     """
     Complete flow: Slide Text → Image Prompt → HF API → Image → Save
 
     Args:
         slide_title: Title of the slide
         slide_content: Content/bullets of the slide
-        output_dir: Directory to save images
+        output_dir: Directory to save images (defaults to an artifact-store scratch dir)
 
     Returns:
         Path to generated image or None if failed
     """
     try:
+        output_dir = output_dir or get_store().scratch_subdir(prefix='images_')
         # Step 1: Generate image prompt from slide text using Mistral
         print(f"\n📝 Processing slide: {slide_title}")
         image_prompt = generate_image_prompt_from_text(slide_content, slide_title)
@@ -188,13 +190,13 @@ def generate_slide_image(slide_title: str, slide_content: str, output_dir: str =
         return None
 
 
-def generate_images_for_all_slides(slides: list, output_dir: str = "temp_images") -> Dict[int, str]:
+def generate_images_for_all_slides(slides: list, output_dir: Optional[str] = None) -> Dict[int, str]:
     """
     Generate AI images for multiple slides
 
     Args:
         slides: List of slide dictionaries with 'title' and 'bullets'
-        output_dir: Directory to save images
+        output_dir: Directory to save images (defaults to an artifact-store scratch dir)
 
     Returns:
         Dictionary mapping slide index to image path
@@ -202,6 +204,7 @@ def generate_images_for_all_slides(slides: list, output_dir: str = "temp_images"
     images = {}
 
     try:
+        output_dir = output_dir or get_store().scratch_subdir(prefix='images_')
         os.makedirs(output_dir, exist_ok=True)
 
         for idx, slide in enumerate(slides):
@@ -6,15 +6,20 @@ Uses OpenAI to structure content intelligently
 import os
 import json
 import shutil
-import requests
 import urllib.parse
-import tempfile
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
+from artifact_store import get_store
+from tracing import span
+from resources import http_session
 
+# Free image sources (override the base URLs to use a proxy or a local stand-in server)
+POLLINATIONS_URL = os.getenv("POLLINATIONS_URL", "https://image.pollinations.ai")
+LOREMFLICKR_URL = os.getenv("LOREMFLICKR_URL", "https://loremflickr.com")
+PICSUM_URL = os.getenv("PICSUM_URL", "https://picsum.photos")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🖼️ POLLINATIONS.AI FREE IMAGE GENERATION (No API Key Needed)
@@ -27,7 +32,7 @@ def generate_slide_image(title, bullets=None, width=800, height=500, output_path
     Returns the path to the downloaded image, or None on failure.
     """
     if not output_path:
-        output_path = os.path.join(tempfile.gettempdir(), f"slide_img_{hash(title) & 0xFFFFFFFF}.jpg")
+        output_path = get_store().scratch_path(suffix='.jpg', prefix='slide_img_')
 
     # Extract 2-3 keywords from title for image search
     stop_words = {'the', 'a', 'an', 'in', 'on', 'of', 'and', 'for', 'to', 'is', 'are', 'was',
@@ -40,8 +45,10 @@ def generate_slide_image(title, bullets=None, width=800, height=500, output_path
     # Method 1: Pollinations.ai (AI-generated)
     try:
         prompt = urllib.parse.quote(f"professional illustration {title[:60]}, modern clean style, no text")
-        url = f"https://image.pollinations.ai/prompt/{prompt}?width={width}&height={height}&nologo=true"
-        response = requests.get(url, timeout=20)
+        url = f"{POLLINATIONS_URL}/prompt/{prompt}?width={width}&height={height}&nologo=true"
+        with span("image_fetch", source="pollinations") as s:
+            response = http_session().get(url, timeout=20)
+            s.set(status_code=response.status_code, bytes=len(response.content))
         if response.status_code == 200 and len(response.content) > 5000:
             content_type = response.headers.get('content-type', '')
             if 'image' in content_type or len(response.content) > 10000:
@@ -54,8 +61,10 @@ def generate_slide_image(title, bullets=None, width=800, height=500, output_path
 
     # Method 2: LoremFlickr (keyword-based real photos)
     try:
-        url = f"https://loremflickr.com/{width}/{height}/{keyword_str}"
-        response = requests.get(url, timeout=15, allow_redirects=True)
+        url = f"{LOREMFLICKR_URL}/{width}/{height}/{keyword_str}"
+        with span("image_fetch", source="loremflickr") as s:
+            response = http_session().get(url, timeout=15, allow_redirects=True)
+            s.set(status_code=response.status_code, bytes=len(response.content))
         if response.status_code == 200 and len(response.content) > 5000:
             with open(output_path, 'wb') as f:
                 f.write(response.content)
@@ -66,8 +75,10 @@ def generate_slide_image(title, bullets=None, width=800, height=500, output_path
 
     # Method 3: Picsum (random high-quality photos as fallback)
     try:
-        url = f"https://picsum.photos/{width}/{height}"
-        response = requests.get(url, timeout=15, allow_redirects=True)
+        url = f"{PICSUM_URL}/{width}/{height}"
+        with span("image_fetch", source="picsum") as s:
+            response = http_session().get(url, timeout=15, allow_redirects=True)
+            s.set(status_code=response.status_code, bytes=len(response.content))
         if response.status_code == 200 and len(response.content) > 5000:
             with open(output_path, 'wb') as f:
                 f.write(response.content)
@@ -87,22 +98,34 @@ def generate_slide_image(title, bullets=None, width=800, height=500, output_path
 def create_chart_image(df, chart_type="bar", title="Chart", output_path=None):
     """
     Create a chart image from a pandas DataFrame.
-    Returns the path to the saved chart image, or None on failure.
+    Returns the path to the saved chart image, or None on failure. Without
+    output_path the PNG is cached in the artifact store (see chart_render.chart_key).
     """
     try:
+        # First column as labels, numeric columns as data, reduced to what fits on a slide
+        from chart_reduce import reduce_frame
+        from chart_render import chart_key
+        plot_df = reduce_frame(df, chart_type)
+        store = get_store()
+        key = None
+        if not output_path:
+            key = chart_key('png', plot_df, chart_type, title)
+            cached = store.object_path(key)
+            if cached:
+                store.touch(cached)
+                print(f"[CHART] Chart cached: {cached}")
+                return cached
+
         import matplotlib
         matplotlib.use('Agg')
         import matplotlib.pyplot as plt
+        import pandas as pd
 
         fig, ax = plt.subplots(figsize=(8, 5))
 
-        # Use first column as labels, rest as data
-        if len(df.columns) >= 2:
-            label_col = df.columns[0]
-            data_cols = df.columns[1:]
-
-            # Limit rows for readability
-            plot_df = df.head(15)
+        if len(plot_df.columns) >= 2:
+            label_col = plot_df.columns[0]
+            data_cols = plot_df.columns[1:]
 
             if chart_type == "pie":
                 # Pie chart uses first data column only
@@ -112,9 +135,18 @@ def create_chart_image(df, chart_type="bar", title="Chart", output_path=None):
                        colors=plt.cm.Set3.colors[:len(values)])
                 ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
             elif chart_type == "line":
+                x = plot_df[label_col]
+                categorical = not pd.api.types.is_datetime64_any_dtype(x) and not pd.api.types.is_numeric_dtype(x)
+                if categorical:
+                    x = x.astype(str)
+                # Markers only while they can be told apart
+                marker = 'o' if len(plot_df) <= 30 else None
                 for col in data_cols:
-                    ax.plot(plot_df[label_col].astype(str), plot_df[col].astype(float),
-                            marker='o', linewidth=2, label=col)
+                    ax.plot(x, plot_df[col].astype(float), marker=marker, linewidth=2, label=col)
+                if categorical and len(plot_df) > 30:
+                    # A downsampled series: label every few points, not all of them
+                    from matplotlib.ticker import MaxNLocator
+                    ax.xaxis.set_major_locator(MaxNLocator(12))
                 ax.set_xlabel(label_col, fontsize=11)
                 ax.set_title(title, fontsize=14, fontweight='bold')
                 ax.legend()
@@ -135,9 +167,11 @@ def create_chart_image(df, chart_type="bar", title="Chart", output_path=None):
         plt.tight_layout()
 
         if not output_path:
-            output_path = os.path.join(tempfile.gettempdir(), f"chart_{hash(title) & 0xFFFFFFFF}.png")
+            output_path = store.scratch_path(suffix='.png', prefix='chart_')
         fig.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
         plt.close(fig)
+        if key:
+            output_path = store.put_file(output_path, name="chart.png", key=key)
         print(f"[CHART] Chart saved: {output_path}")
         return output_path
     except Exception as e:
@@ -166,41 +200,62 @@ except ImportError:
 
 # ISSUE 5: Clean markdown symbols from text
 import re
-def clean_markdown(text):
-    """Remove markdown formatting symbols from text and fix spacing"""
-    if not text:
-        return ""
+
+# (pattern, replacement) in the order clean_markdown applies them; compiled once at import
+_MARKDOWN_RULES = [
     # Remove bold markers: **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
+    (re.compile(r'\*\*(.+?)\*\*'), r'\1'),
+    (re.compile(r'__(.+?)__'), r'\1'),
     # Remove italic markers: *text* or _text_
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'_(.+?)_', r'\1', text)
+    (re.compile(r'\*(.+?)\*'), r'\1'),
+    (re.compile(r'_(.+?)_'), r'\1'),
     # Remove header markers: # ## ### etc.
-    text = re.sub(r'^#{1,6}\s*', '', text, flags=re.MULTILINE)
+    (re.compile(r'^#{1,6}\s*', re.MULTILINE), ''),
     # Remove inline code: `text`
-    text = re.sub(r'`(.+?)`', r'\1', text)
+    (re.compile(r'`(.+?)`'), r'\1'),
     # Remove links: [text](url) -> text
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-    # Remove bullet markers at start (will be added back as proper bullets)
-    text = re.sub(r'^[\-\*•]\s*', '', text.strip())
-
-    # ── FIX SPACING ISSUES ──
+    (re.compile(r'\[([^\]]+)\]\([^)]+\)'), r'\1'),
+]
+# Numbers worth a stat callout, most specific first (see _detect_stat_content)
+_STAT_PATTERNS = [re.compile(p) for p in (
+    r'(\d[\d,]*\.?\d*\s*%)',
+    r'(\$[\d,]+\.?\d*\s*[BMKbmk]?)',
+    r'(Rs\.?\s*[\d,]+\.?\d*\s*(?:Crore|Lakh|cr|lakh)?)',
+    r'(\d[\d,]*\.?\d*\s*[xX]\b)',
+    r'(\d[\d,]*\+)',
+    r'(\b\d{3,}[\d,]*\b)',
+)]
+# Remove bullet markers at start (will be added back as proper bullets)
+_BULLET_MARKER = re.compile(r'^[\-\*•]\s*')
+_SPACING_RULES = [
     # Add space after period/comma if missing (e.g., "word.Next" -> "word. Next")
-    text = re.sub(r'([a-zA-Z\u0900-\u097F])\.([A-Z\u0900-\u097F])', r'\1. \2', text)
-    text = re.sub(r'([a-zA-Z\u0900-\u097F]),([a-zA-Z\u0900-\u097F])', r'\1, \2', text)
+    (re.compile(r'([a-zA-Z\u0900-\u097F])\.([A-Z\u0900-\u097F])'), r'\1. \2'),
+    (re.compile(r'([a-zA-Z\u0900-\u097F]),([a-zA-Z\u0900-\u097F])'), r'\1, \2'),
     # Add space after colon/semicolon if missing
-    text = re.sub(r'([a-zA-Z\u0900-\u097F]):([a-zA-Z\u0900-\u097F])', r'\1: \2', text)
-    text = re.sub(r'([a-zA-Z\u0900-\u097F]);([a-zA-Z\u0900-\u097F])', r'\1; \2', text)
+    (re.compile(r'([a-zA-Z\u0900-\u097F]):([a-zA-Z\u0900-\u097F])'), r'\1: \2'),
+    (re.compile(r'([a-zA-Z\u0900-\u097F]);([a-zA-Z\u0900-\u097F])'), r'\1; \2'),
     # Fix missing space between lowercase and uppercase (camelCase splits)
     # e.g., "healthcareArtificial" -> "healthcare Artificial"
-    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    (re.compile(r'([a-z])([A-Z])'), r'\1 \2'),
     # Add space after closing paren if missing before a letter
-    text = re.sub(r'\)([a-zA-Z\u0900-\u097F])', r') \1', text)
+    (re.compile(r'\)([a-zA-Z\u0900-\u097F])'), r') \1'),
     # Add space before opening paren if missing after a letter
-    text = re.sub(r'([a-zA-Z\u0900-\u097F])\(', r'\1 (', text)
+    (re.compile(r'([a-zA-Z\u0900-\u097F])\('), r'\1 ('),
     # Fix multiple spaces
-    text = re.sub(r'\s+', ' ', text)
+    (re.compile(r'\s+'), ' '),
+]
+
+def clean_markdown(text):
+    """Remove markdown formatting symbols from text and fix spacing"""
+    if not text:
+        return ""
+    for pattern, repl in _MARKDOWN_RULES:
+        text = pattern.sub(repl, text)
+    text = _BULLET_MARKER.sub('', text.strip())
+
+    # ── FIX SPACING ISSUES ──
+    for pattern, repl in _SPACING_RULES:
+        text = pattern.sub(repl, text)
     # Fix space before punctuation
     text = text.replace(' ,', ',').replace(' .', '.').replace(' :', ':').replace(' ;', ';')
 
@@ -493,16 +548,8 @@ class ModernPPTDesigner:
         """Detect bullets with stats/numbers. Returns [(number, description)]."""
         stats = []
         for bullet in bullets:
-            patterns = [
-                r'(\d[\d,]*\.?\d*\s*%)',
-                r'(\$[\d,]+\.?\d*\s*[BMKbmk]?)',
-                r'(Rs\.?\s*[\d,]+\.?\d*\s*(?:Crore|Lakh|cr|lakh)?)',
-                r'(\d[\d,]*\.?\d*\s*[xX]\b)',
-                r'(\d[\d,]*\+)',
-                r'(\b\d{3,}[\d,]*\b)',
-            ]
-            for pat in patterns:
-                match = re.search(pat, bullet)
+            for pat in _STAT_PATTERNS:
+                match = pat.search(bullet)
                 if match:
                     num_str = match.group(1).strip()
                     desc = bullet.replace(match.group(0), '').strip(' :-,.')
@@ -1196,14 +1243,35 @@ class ModernPPTDesigner:
 
         return slide
     
-    def create_chart_slide(self, title, chart_image_path):
-        """Create a slide with an embedded chart image"""
+    def create_chart_slide(self, title, chart_image_path=None, chart=None):
+        """
+        Create a slide with an uploaded-data chart: a native, editable chart part when
+        chart ({'df', 'chart_type'}) is given, the matplotlib image if that fails or only
+        chart_image_path is.
+        """
         slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
         self._add_bg(slide)
         self._add_red_top_bar(slide)
         self._add_title_text(slide, title, y=0.2, font_size=28)
         self._add_underline(slide, y=0.75)
 
+        if chart is not None:
+            from chart_render import add_native_chart
+            colors = {
+                'series': [self.colors["primary"], self.colors["secondary"], self.colors["accent"],
+                           self.colors.get("gold", self.colors["secondary"])],
+                'text': self.colors["text"],
+                'grid': self.colors["card_bg_alt"],
+            }
+            try:
+                add_native_chart(slide, chart['df'], chart.get('chart_type', 'bar'), title,
+                                 Inches(1), Inches(1.0), Inches(8), Inches(4.3), colors=colors)
+                return slide
+            except Exception as e:
+                print(f"[CHART] Native chart failed ({e}), falling back to an image")
+                chart_image_path = create_chart_image(chart['df'], chart_type=chart.get('chart_type', 'bar'),
+                                                      title=title)
+
         # Chart image centered
         if chart_image_path and os.path.exists(chart_image_path):
             try:
@@ -1429,13 +1497,14 @@ def generate_beautiful_ppt(slides_or_text, output_path, color_scheme="corporate"
         for idx, slide in enumerate(content_slides, start=1):
             title = slide.get("title", "")
             bullets = slide.get("bullets", [])
+            chart = slide.get("chart")
             chart_image = slide.get("chart_image_path")
             title_lower = title.lower()
 
-            if chart_image and os.path.exists(chart_image):
+            if chart or (chart_image and os.path.exists(chart_image)):
                 # Chart slide (from Excel/CSV data)
                 print(f"  [LAYOUT] Chart slide {idx}: {title[:40]}")
-                designer.create_chart_slide(title, chart_image)
+                designer.create_chart_slide(title, chart_image, chart=chart)
                 continue
 
             if not title and not bullets:
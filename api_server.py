@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Deck Generation HTTP API
+Small stdlib HTTP service for other internal services. Jobs run on the same
+job_queue / deck_pipeline as the Streamlit app.
+
+Endpoints:
+    POST /v1/decks                {"topic", "theme", "language", "slides"} -> 202 {"id", ...}
+    GET  /v1/decks/<id>           job status
+    GET  /v1/decks/<id>/download  the finished .pptx (streamed)
+    GET  /v1/bulk/<run>/download?sig=...
+                                  a finished bulk run's ZIP (streamed; the signed
+                                  link the app's bulk mode shows, see bulk_download_url)
+    GET  /healthz                 liveness + queue depth
+
+Run standalone with `python api_server.py`, or alongside the Streamlit app
+by setting DECK_API_ENABLED=true (the app starts it on a background thread).
+Point MISTRAL_API_URL / GROQ_API_URL at a stand-in server to test end to end.
+"""
+
+import os
+import re
+import hmac
+import json
+import shutil
+import hashlib
+import secrets
+import threading
+from urllib.parse import quote, urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from deck_pipeline import generate_deck
+from batch_generate import BULK_DIR, ZIP_NAME
+from job_queue import submit_job, get_job, queue_depth, ACTIVE_STATES
+
+API_HOST = os.getenv("DECK_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("DECK_API_PORT", "8600"))
+API_TOKEN = os.getenv("DECK_API_TOKEN", "")
+API_MAX_PENDING = int(os.getenv("DECK_API_MAX_PENDING", "16"))
+# Where browsers reach this API (behind the same proxy as the app); enables bulk ZIP links
+API_PUBLIC_URL = os.getenv("DECK_API_PUBLIC_URL", "")
+MAX_BODY_BYTES = 64 * 1024
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+CHUNK_SIZE = 64 * 1024
+
+_submit_lock = threading.Lock()
+_api_jobs = set()   # ids of jobs this API submitted that may still be queued/running
+_server = None
+_server_lock = threading.Lock()
+
+_JOB_PATH = re.compile(r'^/v1/decks/([0-9a-f]{32})(/download)?/?$')
+_BULK_PATH = re.compile(r'^/v1/bulk/([0-9a-f]{16})/download/?$')
+
+# Bulk ZIP links are opened by a browser, so they carry a signature instead of the
+# bearer token. Without DECK_API_TOKEN the key is per process (links die on restart).
+_LINK_KEY = (API_TOKEN or secrets.token_hex(32)).encode('utf-8')
+
+
+def _api_pending():
+    """Jobs submitted through the API that are still waiting or running (app jobs do not count)."""
+    for job_id in list(_api_jobs):
+        job = get_job(job_id)
+        if job is None or job['status'] not in ACTIVE_STATES:
+            _api_jobs.discard(job_id)
+    return len(_api_jobs)
+
+
+def _bulk_sig(run_key):
+    return hmac.new(_LINK_KEY, f"bulk:{run_key}".encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+
+def bulk_download_url(run_key):
+    """Signed link to a bulk run's ZIP, or None when DECK_API_PUBLIC_URL is not set."""
+    if not API_PUBLIC_URL:
+        return None
+    return f"{API_PUBLIC_URL.rstrip('/')}/v1/bulk/{run_key}/download?sig={_bulk_sig(run_key)}"
+
+
+def _job_view(job):
+    """Public fields of a job record."""
+    view = {
+        'id': job['id'],
+        'status': job['status'],
+        'stage': job['stage'],
+        'progress': job['progress'],
+        'message': job.get('message'),
+        'error': job.get('error'),
+    }
+    result = job.get('result') or {}
+    if job['status'] == 'done' and not result.get('success'):
+        view['status'] = 'failed'
+        view['error'] = result.get('error') or 'generation failed'
+    if result.get('success'):
+        view['download_url'] = f"/v1/decks/{job['id']}/download"
+        view['ai_source'] = result.get('ai_source')
+    return view
+
+
+class DeckAPIHandler(BaseHTTPRequestHandler):
+    server_version = "DeckAPI/1.0"
+
+    def log_message(self, fmt, *args):
+        print(f"[API] {self.address_string()} {fmt % args}")
+
+    # ── helpers ──
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        if not API_TOKEN:
+            return True
+        supplied = self.headers.get('Authorization', '').encode('utf-8')
+        if hmac.compare_digest(supplied, f"Bearer {API_TOKEN}".encode('utf-8')):
+            return True
+        self._send_json(401, {'error': 'unauthorized'})
+        return False
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            raise ValueError('body missing or too large')
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    # ── routes ──
+    def do_GET(self):
+        if self.path.rstrip('/') == '/healthz':
+            with _submit_lock:
+                api_pending = _api_pending()
+            return self._send_json(200, {'ok': True, 'pending': queue_depth(), 'api_pending': api_pending})
+        url = urlsplit(self.path)
+        bulk = _BULK_PATH.match(url.path)
+        if bulk:
+            return self._send_bulk_zip(bulk.group(1), parse_qs(url.query).get('sig', [''])[0])
+        if not self._authorized():
+            return
+        match = _JOB_PATH.match(self.path)
+        job = get_job(match.group(1)) if match else None
+        if job is None or job.get('meta', {}).get('source') != 'api':
+            return self._send_json(404, {'error': 'not found'})
+        if not match.group(2):
+            return self._send_json(200, _job_view(job))
+
+        result = job.get('result') or {}
+        if job['status'] in ACTIVE_STATES:
+            return self._send_json(409, _job_view(job), {'Retry-After': '2'})
+        ppt_path = result.get('ppt_path')
+        if not result.get('success') or not ppt_path or not os.path.exists(ppt_path):
+            return self._send_json(410, {'error': 'deck not available'})
+        self._send_file(ppt_path)
+
+    def _send_bulk_zip(self, run_key, sig):
+        if not hmac.compare_digest(sig.encode('utf-8'), _bulk_sig(run_key).encode('utf-8')):
+            return self._send_json(403, {'error': 'invalid link'})
+        zip_path = os.path.join(BULK_DIR, run_key, ZIP_NAME)
+        if not os.path.exists(zip_path):
+            return self._send_json(410, {'error': 'bulk run not available'})
+        self._send_file(zip_path, 'application/zip')
+
+    def _send_file(self, path, content_type=PPTX_MIME):
+        name = os.path.basename(path)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(name)}")
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/v1/decks':
+            return self._send_json(404, {'error': 'not found'})
+        if not self._authorized():
+            return
+        try:
+            body = self._read_json()
+            if not isinstance(body, dict):
+                raise ValueError('request body must be a JSON object')
+            topic = str(body.get('topic') or '').strip()
+            if not topic:
+                raise ValueError('topic is required')
+            request = {
+                'topic': topic,
+                'theme': str(body.get('theme') or 'modern').lower(),
+                'language': str(body.get('language') or 'English'),
+                'num_slides': max(1, min(int(body.get('slides') or 10), 50)),
+            }
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {'error': str(e)})
+
+        # Backpressure: refuse new work instead of queueing without bound
+        with _submit_lock:
+            if _api_pending() >= API_MAX_PENDING:
+                return self._send_json(429, {'error': 'queue full, retry later'}, {'Retry-After': '10'})
+            job_id = submit_job(generate_deck, request, meta={'source': 'api', 'topic': topic})
+            _api_jobs.add(job_id)
+        self._send_json(202, _job_view(get_job(job_id)), {'Location': f"/v1/decks/{job_id}"})
+
+
+def start_background(host=API_HOST, port=API_PORT):
+    """Start the API on a daemon thread once per process (safe across Streamlit reruns)."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), DeckAPIHandler)
+        except OSError as e:
+            print(f"[API] Could not bind {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="deck-api", daemon=True).start()
+        print(f"[API] Listening on http://{host}:{port}")
+        return _server
+
+
+if __name__ == "__main__":
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    server = ThreadingHTTPServer((API_HOST, API_PORT), DeckAPIHandler)
+    server.daemon_threads = True
+    print(f"[API] Listening on http://{API_HOST}:{API_PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,367 @@
+"""
+Content-Addressed Artifact Store
+Single place where generated files (decks, previews, PDFs, images, bulk ZIPs)
+are written. Objects are keyed by the SHA-256 of their content and filename
+(render caches key theirs by the SHA-256 of their inputs instead), written
+atomically, reference-counted by the sessions using them and evicted
+least-recently-used under a disk quota by a background GC thread.
+
+Every app process runs its own GC over the same directory, so references are
+kept on disk as marker files that any process can see. A marker counts while
+its session keeps heartbeating (mtime within the session TTL). Objects used in
+the last ARTIFACT_GRACE_SECONDS are never evicted, which covers a new object
+between its commit and the first acquire().
+
+Layout (under ARTIFACT_DIR):
+    objects/<key>/<filename>     committed artifact + anything derived from it
+                                 (e.g. <name>_preview/ with thumbnails and PDF)
+    refs/<key>/<session id>      one marker per session holding the object
+    scratch/<uuid>...            in-progress writes; removed after SCRATCH_TTL
+"""
+
+import os
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from typing import Dict, Optional, Set
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(_PROJECT_DIR, "output", "artifacts"))
+ARTIFACT_QUOTA_MB = float(os.getenv("ARTIFACT_QUOTA_MB", "2048"))
+ARTIFACT_TTL_HOURS = float(os.getenv("ARTIFACT_TTL_HOURS", "24"))
+ARTIFACT_GC_INTERVAL = float(os.getenv("ARTIFACT_GC_INTERVAL", "300"))
+SESSION_TTL_HOURS = float(os.getenv("ARTIFACT_SESSION_TTL_HOURS", "6"))
+ARTIFACT_GRACE_SECONDS = float(os.getenv("ARTIFACT_GRACE_SECONDS", "600"))
+SCRATCH_TTL_SECONDS = 3600
+# A session's ref markers are re-touched at most this often by heartbeat()
+REF_TOUCH_SECONDS = 60
+
+KEY_LENGTH = 32  # hex chars of the SHA-256 used as object key
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, f))
+            except OSError:
+                pass
+    return total
+
+
+def _hash_file(path, name):
+    """Object key for a file: its content plus the name it is committed under."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    # Same bytes under another name (e.g. a .txt vs a .pkl blob) is a different object
+    h.update(b'\0' + name.encode('utf-8'))
+    return h.hexdigest()[:KEY_LENGTH]
+
+
+class ArtifactStore:
+    """Disk-backed content-addressed store with session refcounts and LRU eviction."""
+
+    def __init__(self, root: str = ARTIFACT_DIR, quota_mb: float = ARTIFACT_QUOTA_MB,
+                 ttl_hours: float = ARTIFACT_TTL_HOURS, session_ttl_hours: float = SESSION_TTL_HOURS,
+                 grace_seconds: float = ARTIFACT_GRACE_SECONDS):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.refs_dir = os.path.join(self.root, "refs")
+        self.scratch_dir = os.path.join(self.root, "scratch")
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_hours * 3600
+        self.session_ttl_seconds = session_ttl_hours * 3600
+        self.grace_seconds = grace_seconds
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        os.makedirs(self.scratch_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._refs: Dict[str, Set[str]] = {}        # key -> session ids (this process's markers)
+        self._sessions: Dict[str, float] = {}       # session id -> last seen
+        self._touched: Dict[str, float] = {}        # session id -> last marker refresh
+        self._gc_thread = None
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Writing
+    # ─────────────────────────────────────────────────────────────────────
+
+    def scratch_path(self, suffix: str = "", prefix: str = "") -> str:
+        """Unique path for an in-progress write (Node, LibreOffice, downloads)."""
+        return os.path.join(self.scratch_dir, f"{prefix}{uuid.uuid4().hex}{suffix}")
+
+    def scratch_subdir(self, prefix: str = "") -> str:
+        """Fresh scratch directory for writers that produce several files."""
+        path = self.scratch_path(prefix=prefix)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def put_file(self, src_path: str, name: Optional[str] = None, key: Optional[str] = None,
+                 session_id: Optional[str] = None) -> str:
+        """
+        Commit a finished file. The source is moved (not copied) into the store.
+        Returns the committed path objects/<key>/<name>; identical content under
+        the same name returns the already-stored copy. `key` stores it under a key derived from
+        what it was made from instead of its content (render caches); an object
+        already under that key wins. With session_id the object is acquired for
+        that session before it becomes visible, so no GC can remove it in between.
+        """
+        name = name or os.path.basename(src_path)
+        key = key or _hash_file(src_path, name)
+        final_dir = os.path.join(self.objects_dir, key)
+        if session_id:
+            self._add_ref(key, session_id)
+        existing = self._object_file(final_dir)
+        if existing:
+            os.unlink(src_path)
+            self.touch(existing)
+            return existing
+
+        # Stage under scratch, then rename the whole key directory into place:
+        # readers either see nothing or the complete object.
+        staging = self.scratch_subdir(prefix="commit_")
+        shutil.move(src_path, os.path.join(staging, name))
+        try:
+            os.rename(staging, final_dir)
+        except OSError:
+            # Another writer committed the same content first
+            shutil.rmtree(staging, ignore_errors=True)
+            existing = self._object_file(final_dir)
+            if existing:
+                return existing
+            raise
+        return os.path.join(final_dir, name)
+
+    def put_bytes(self, data: bytes, name: str, key: Optional[str] = None,
+                  session_id: Optional[str] = None) -> str:
+        """Commit in-memory bytes. Returns the committed path."""
+        tmp = self.scratch_path(suffix=os.path.splitext(name)[1])
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        return self.put_file(tmp, name=name, key=key, session_id=session_id)
+
+    def discard(self, path: str):
+        """Remove a scratch file or directory that will not be committed."""
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.unlink(path)
+        except OSError:
+            pass
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Reading / bookkeeping
+    # ─────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _object_file(key_dir: str) -> Optional[str]:
+        try:
+            files = sorted(f for f in os.listdir(key_dir) if os.path.isfile(os.path.join(key_dir, f)))
+        except OSError:
+            return None
+        return os.path.join(key_dir, files[0]) if files else None
+
+    def object_path(self, key: str) -> Optional[str]:
+        """Committed file for an object key (None if it was never stored or has been evicted)."""
+        return self._object_file(os.path.join(self.objects_dir, key))
+
+    def key_for_path(self, path: str) -> Optional[str]:
+        """Object key for a committed path (or anything derived inside it)."""
+        rel = os.path.relpath(os.path.abspath(path), self.objects_dir)
+        if rel.startswith('..'):
+            return None
+        return rel.split(os.sep, 1)[0]
+
+    def touch(self, path: str):
+        """Mark an object as recently used (LRU order survives restarts via mtime)."""
+        key = self.key_for_path(path)
+        if key:
+            try:
+                os.utime(os.path.join(self.objects_dir, key))
+            except OSError:
+                pass
+
+    def _ref_path(self, key: str, session_id: str) -> str:
+        return os.path.join(self.refs_dir, key, session_id)
+
+    def _add_ref(self, key: str, session_id: str):
+        marker = self._ref_path(key, session_id)
+        for attempt in range(3):
+            # Another process may remove the (empty) key directory between makedirs and open
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            try:
+                with open(marker, 'a'):
+                    pass
+                os.utime(marker)
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+        with self._lock:
+            self._refs.setdefault(key, set()).add(session_id)
+            self._sessions[session_id] = time.time()
+
+    def _referenced(self, key: str, now: float) -> bool:
+        """True while any process's session holds key; markers of sessions gone quiet are removed."""
+        ref_dir = os.path.join(self.refs_dir, key)
+        try:
+            holders = os.listdir(ref_dir)
+        except OSError:
+            return False
+        live = False
+        for holder in holders:
+            marker = os.path.join(ref_dir, holder)
+            try:
+                if now - os.path.getmtime(marker) <= self.session_ttl_seconds:
+                    live = True
+                else:
+                    os.unlink(marker)
+            except OSError:
+                pass
+        if not live:
+            try:
+                os.rmdir(ref_dir)
+            except OSError:
+                pass
+        return live
+
+    def acquire(self, session_id: str, path: str):
+        """Record that session_id is using the object at path (protects it from eviction)."""
+        key = self.key_for_path(path)
+        if not key:
+            return
+        self._add_ref(key, session_id)
+        self.touch(path)
+
+    def release(self, session_id: str, path: Optional[str] = None):
+        """Drop one reference (or every reference held by session_id when path is None)."""
+        with self._lock:
+            if path is None:
+                keys = [k for k, s in self._refs.items() if session_id in s]
+                self._sessions.pop(session_id, None)
+                self._touched.pop(session_id, None)
+            else:
+                key = self.key_for_path(path)
+                keys = [key] if key else []
+            for key in keys:
+                holders = self._refs.get(key)
+                if holders:
+                    holders.discard(session_id)
+                    if not holders:
+                        del self._refs[key]
+        for key in keys:
+            try:
+                os.unlink(self._ref_path(key, session_id))
+                os.rmdir(os.path.join(self.refs_dir, key))
+            except OSError:
+                pass
+
+    def heartbeat(self, session_id: str):
+        """Keep a session's references alive (its markers are refreshed every REF_TOUCH_SECONDS)."""
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = now
+            if now - self._touched.get(session_id, 0) < REF_TOUCH_SECONDS:
+                return
+            self._touched[session_id] = now
+            keys = [k for k, s in self._refs.items() if session_id in s]
+        for key in keys:
+            try:
+                os.utime(self._ref_path(key, session_id))
+            except OSError:
+                pass
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Garbage collection
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _expire_sessions(self, now):
+        with self._lock:
+            stale = [sid for sid, seen in self._sessions.items() if now - seen > self.session_ttl_seconds]
+        for sid in stale:
+            self.release(sid)
+
+    def gc(self) -> Dict[str, int]:
+        """
+        Evict unreferenced objects older than the TTL, then least-recently-used
+        unreferenced objects until the store fits in its quota.
+        Also clears scratch leftovers from crashed writers.
+        """
+        now = time.time()
+        self._expire_sessions(now)
+        removed, freed = 0, 0
+
+        for entry in os.listdir(self.scratch_dir):
+            path = os.path.join(self.scratch_dir, entry)
+            try:
+                if now - os.path.getmtime(path) > SCRATCH_TTL_SECONDS:
+                    self.discard(path)
+            except OSError:
+                pass
+
+        objects = []
+        for key in os.listdir(self.objects_dir):
+            key_dir = os.path.join(self.objects_dir, key)
+            try:
+                objects.append((os.path.getmtime(key_dir), key, _dir_size(key_dir)))
+            except OSError:
+                continue
+        objects.sort()  # oldest access first
+        total = sum(size for _, _, size in objects)
+
+        for last_used, key, size in objects:
+            # Just committed or just used (maybe not acquired yet), or held by a session in any process
+            if now - last_used < self.grace_seconds or self._referenced(key, now):
+                continue
+            if now - last_used > self.ttl_seconds or total > self.quota_bytes:
+                shutil.rmtree(os.path.join(self.objects_dir, key), ignore_errors=True)
+                total -= size
+                freed += size
+                removed += 1
+        # Markers left behind for objects that are gone
+        present = {key for _, key, _ in objects}
+        for key in os.listdir(self.refs_dir):
+            if key not in present:
+                self._referenced(key, now)
+        if removed:
+            print(f"[ARTIFACTS] GC removed {removed} objects ({freed // 1024} KB), {total // 1024} KB in use")
+        return {"removed": removed, "freed_bytes": freed, "used_bytes": total}
+
+    def start_gc(self, interval: float = ARTIFACT_GC_INTERVAL):
+        """Run gc() on a daemon thread every `interval` seconds (idempotent)."""
+        with self._lock:
+            if self._gc_thread is not None:
+                return
+
+            def _loop():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.gc()
+                    except Exception as e:
+                        print(f"[ARTIFACTS] GC failed: {e}")
+
+            self._gc_thread = threading.Thread(target=_loop, name="artifact-gc", daemon=True)
+            self._gc_thread.start()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ArtifactStore:
+    """Process-wide artifact store (GC thread starts on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+                _store.start_gc()
+    return _store
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Headless Batch Deck Generation
+Generates one deck per row of a CSV or JSONL file (topic, theme, slides,
+language) without the Streamlit UI, using the same pipeline as the app
+(MultiAIGenerator → PptxGenJS, python-pptx fallback).
+
+Usage:
+    python batch_generate.py topics.csv --out output/batch --llm-workers 4 --render-workers 2 --zip
+
+Writes the decks into --out plus results.jsonl (one line per row, appended
+as rows finish). Re-running with --resume skips rows already marked ok.
+The app's bulk mode runs the same run_batch() in a background job, with one
+run directory per CSV under BULK_DIR; sweep_runs() expires those after
+BULK_TTL_HOURS and keeps them under BULK_QUOTA_MB.
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from deck_pipeline import generate_code, build_deck
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+BULK_DIR = os.getenv("BULK_DIR", os.path.join(_PROJECT_DIR, "output", "bulk"))
+BULK_TTL_HOURS = float(os.getenv("BULK_TTL_HOURS", "24"))
+BULK_QUOTA_MB = float(os.getenv("BULK_QUOTA_MB", "2048"))
+
+DEFAULT_THEME = 'modern'
+DEFAULT_SLIDES = 10
+DEFAULT_LANGUAGE = 'English'
+MANIFEST_NAME = 'results.jsonl'
+ZIP_NAME = 'bulk_presentations.zip'
+
+
+def normalize_row(raw, index):
+    """Row dict with defaults applied; topic is required."""
+    row = {str(k).strip().lower(): v for k, v in raw.items() if k is not None}
+    topic = str(row.get('topic') or '').strip()
+    try:
+        slides = int(float(row.get('slides') or DEFAULT_SLIDES))
+    except (TypeError, ValueError):
+        slides = DEFAULT_SLIDES
+    return {
+        'row': index,
+        'topic': topic,
+        'theme': str(row.get('theme') or DEFAULT_THEME).strip().lower(),
+        'slides': max(1, slides),
+        'language': str(row.get('language') or DEFAULT_LANGUAGE).strip(),
+    }
+
+
+def load_rows(path):
+    """Yield normalized rows from a .csv or .jsonl file (streamed, not loaded at once)."""
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        with open(path, 'r', encoding='utf-8') as f:
+            index = 0
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                yield normalize_row(json.loads(line), index)
+                index += 1
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for index, raw in enumerate(csv.DictReader(f)):
+                yield normalize_row(raw, index)
+
+
+def deck_name(row):
+    """Stable, filesystem-safe output name for a row."""
+    slug = re.sub(r'[^\w]+', '_', row['topic'])[:40].strip('_') or 'presentation'
+    return f"{row['row']:05d}_{slug}.pptx"
+
+
+def read_manifest(out_dir):
+    """Entries already generated successfully whose deck is still on disk (for resume)."""
+    done = {}
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # partial line from an interrupted run
+            if entry.get('status') == 'ok' and entry.get('path') and os.path.exists(entry['path']):
+                done[entry['row']] = entry
+    return done
+
+
+class ZipSink:
+    """On-disk ZIP that finished decks are appended to as they complete."""
+
+    def __init__(self, path, existing=()):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._zf = zipfile.ZipFile(path, 'a' if os.path.exists(path) else 'w', zipfile.ZIP_DEFLATED)
+            self._names = set(self._zf.namelist())
+        except zipfile.BadZipFile:
+            # An interrupted run never wrote the central directory: rebuild from checkpointed decks
+            print(f"[BATCH] {path} is incomplete, rebuilding from finished decks")
+            self._zf = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+            self._names = set()
+        for entry in existing:
+            self.add(entry['path'], os.path.basename(entry['path']))
+
+    def add(self, src, arcname):
+        with self._lock:
+            if arcname not in self._names:
+                self._zf.write(src, arcname)
+                self._names.add(arcname)
+
+    def close(self):
+        with self._lock:
+            self._zf.close()
+
+
+def _run_usage(path):
+    """(last write time, bytes) of everything in a run directory."""
+    last, size = 0.0, 0
+    for dirpath, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                stat = os.stat(os.path.join(dirpath, f))
+            except OSError:
+                continue
+            last, size = max(last, stat.st_mtime), size + stat.st_size
+    return last, size
+
+
+def sweep_runs(root=BULK_DIR, ttl_hours=BULK_TTL_HOURS, quota_mb=BULK_QUOTA_MB, keep=()):
+    """
+    Delete run directories under root not written to for ttl_hours, then the least
+    recently written ones until the rest fit in quota_mb. Directories in `keep`
+    (runs in progress) are left alone. Returns the number removed.
+    """
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return 0
+    keep = {os.path.abspath(path) for path in keep}
+    runs = []
+    for name in names:
+        path = os.path.abspath(os.path.join(root, name))
+        if os.path.isdir(path) and path not in keep:
+            runs.append((path, *_run_usage(path)))
+    total = sum(_run_usage(path)[1] for path in keep if os.path.isdir(path))
+    total += sum(size for _path, _last, size in runs)
+    cutoff = time.time() - ttl_hours * 3600
+    quota = quota_mb * 1024 * 1024
+    removed = 0
+    for path, last, size in sorted(runs, key=lambda run: run[1]):
+        if last >= cutoff and total <= quota:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        print(f"[BATCH] Removed {removed} old bulk run(s) from {root}")
+    return removed
+
+
+def _llm_step(row, attempt, backoff):
+    """LLM pool: PptxGenJS code for one row. Returns (js_code, ai_source, error)."""
+    if attempt > 1:
+        time.sleep(backoff * (attempt - 1))
+    try:
+        return generate_code({
+            'topic': row['topic'],
+            'theme': row['theme'],
+            'language': row['language'],
+            'num_slides': row['slides'],
+        })
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+
+
+def _render_step(row, js_code, out_dir, sink):
+    """Render pool: build the deck straight into out_dir (the checkpoint) and stream it into the ZIP."""
+    try:
+        dest = os.path.join(out_dir, deck_name(row))
+        success, result = build_deck([], row['topic'], row['theme'], js_code=js_code, out_path=dest)
+        if not success:
+            return None, result or 'render failed'
+        if sink:
+            sink.add(dest, os.path.basename(dest))
+        return dest, None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(rows, out_dir, llm_workers=4, render_workers=2, retries=2, resume=False,
+              zip_path=None, backoff=2.0, on_progress=None):
+    """
+    Generate every row through two bounded pools: `llm_workers` concurrent LLM
+    calls and `render_workers` concurrent Node/python-pptx renders.
+
+    Each finished deck is written to out_dir (the checkpoint), optionally
+    appended to zip_path, and recorded in out_dir/results.jsonl. With
+    resume=True rows already recorded as ok are skipped. Rows are pulled from
+    the iterator only as capacity frees up, so memory stays flat for any size.
+
+    Returns:
+        dict: {'ok', 'failed', 'skipped'}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    done = read_manifest(out_dir) if resume else {}
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    counts = {'ok': 0, 'failed': 0, 'skipped': 0}
+    if zip_path and not resume and os.path.exists(zip_path):
+        os.unlink(zip_path)
+    sink = ZipSink(zip_path, existing=done.values()) if zip_path else None
+    max_in_flight = (llm_workers + render_workers) * 2
+    started = {}
+    rows = iter(rows)
+
+    def _entry(row, status, path=None, attempts=0, ai_source=None, error=None):
+        return dict(row, status=status, path=path, attempts=attempts,
+                    seconds=round(time.time() - started.pop(row['row'], time.time()), 2),
+                    ai_source=ai_source, error=str(error)[:500] if error else None)
+
+    llm_pool = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="batch-llm")
+    render_pool = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix="batch-render")
+    futures = {}  # future -> (step, row, attempt, ai_source)
+    try:
+        with open(manifest_path, 'a' if resume else 'w', encoding='utf-8') as manifest:
+
+            def _record(entry):
+                manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                manifest.flush()
+                counts[entry['status']] += 1
+                print(f"[BATCH] {counts['ok'] + counts['failed']} done ({counts['failed']} failed) "
+                      f"— row {entry['row']}: {entry['status']}")
+                if on_progress:
+                    on_progress(dict(counts))
+
+            def _retry_or_fail(row, attempt, error):
+                print(f"[BATCH] Row {row['row']} attempt {attempt} failed: {str(error)[:120]}")
+                if attempt <= retries:
+                    futures[llm_pool.submit(_llm_step, row, attempt + 1, backoff)] = ('llm', row, attempt + 1, None)
+                else:
+                    _record(_entry(row, 'failed', attempts=attempt, error=error))
+
+            exhausted = False
+            while True:
+                while not exhausted and len(futures) < max_in_flight:
+                    row = next(rows, None)
+                    if row is None:
+                        exhausted = True
+                    elif row['row'] in done:
+                        counts['skipped'] += 1
+                    elif not row['topic']:
+                        _record(_entry(row, 'failed', error='missing topic'))
+                    else:
+                        started[row['row']] = time.time()
+                        futures[llm_pool.submit(_llm_step, row, 1, backoff)] = ('llm', row, 1, None)
+                if not futures:
+                    break
+
+                finished, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step, row, attempt, ai_source = futures.pop(future)
+                    if step == 'llm':
+                        js_code, ai_source, error = future.result()
+                        if js_code:
+                            futures[render_pool.submit(_render_step, row, js_code, out_dir, sink)] = \
+                                ('render', row, attempt, ai_source)
+                        else:
+                            _retry_or_fail(row, attempt, error or 'AI error')
+                    else:
+                        path, error = future.result()
+                        if path:
+                            _record(_entry(row, 'ok', path=path, attempts=attempt, ai_source=ai_source))
+                        else:
+                            _retry_or_fail(row, attempt, error)
+    finally:
+        for future in futures:
+            future.cancel()
+        llm_pool.shutdown(wait=True)
+        render_pool.shutdown(wait=True)
+        if sink:
+            sink.close()
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate presentations in bulk without the web UI.")
+    parser.add_argument('input', help="CSV or JSONL with columns topic, theme, slides, language")
+    parser.add_argument('--out', default=os.path.join('output', 'batch'), help="output directory for decks and results.jsonl")
+    parser.add_argument('--llm-workers', '--workers', dest='llm_workers', type=int, default=4,
+                        help="concurrent LLM calls")
+    parser.add_argument('--render-workers', type=int, default=2, help="concurrent Node/python-pptx renders")
+    parser.add_argument('--retries', type=int, default=2, help="retries per deck after a failure")
+    parser.add_argument('--resume', action='store_true', help="skip rows already ok in results.jsonl")
+    parser.add_argument('--zip', action='store_true', help=f"also collect decks into {ZIP_NAME}")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    counts = run_batch(load_rows(args.input), args.out,
+                       llm_workers=max(1, args.llm_workers), render_workers=max(1, args.render_workers),
+                       retries=max(0, args.retries), resume=args.resume,
+                       zip_path=os.path.join(args.out, ZIP_NAME) if args.zip else None)
+    print(f"[BATCH] Finished in {time.time() - started:.1f}s: {counts['ok']} ok, "
+          f"{counts['failed']} failed, {counts['skipped']} skipped → {args.out}")
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
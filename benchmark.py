@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Offline Pipeline Benchmark
+Runs the full deck pipeline against mock_services (no network, no API keys)
+and reports per-stage wall time, CPU time, peak RSS and output size.
+
+Stages (PptxGenJS path):  search → llm → render → fix_backgrounds → pdf → thumbnails
+Stages (fallback path):   llm_text → fallback_render (python-pptx + images)
+
+    python benchmark.py                              # 5/10/20/50 slides, print table
+    python benchmark.py --save-baseline              # store results as the baseline
+    python benchmark.py --baseline benchmark_baseline.json --threshold 0.2
+
+Stages whose tools (node, libreoffice, pdftoppm) are not installed are
+reported as skipped. Exit status is 1 when a stage regressed past the threshold.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import threading
+
+from mock_services import MockServices
+
+SLIDE_COUNTS = (5, 10, 20, 50)
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+MIN_REGRESSION_SECONDS = 0.05  # ignore noise on very fast stages
+
+
+def _rss_bytes():
+    """Current resident set size of this process (Linux /proc, else ru_maxrss)."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+def _child_usage():
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * 1024
+    except Exception:
+        return 0.0, 0
+
+
+class StageTimer:
+    """Measures one stage: wall, CPU (own + subprocesses) and peak RSS (sampled)."""
+
+    SAMPLE_SECONDS = 0.01
+
+    def __init__(self, name):
+        self.name = name
+        self.result = {'stage': name, 'status': 'ok'}
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self._peak = max(self._peak, _rss_bytes())
+            self._stop.wait(self.SAMPLE_SECONDS)
+
+    def __enter__(self):
+        self._peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._child_cpu, _ = _child_usage()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        child_cpu, child_peak = _child_usage()
+        self._stop.set()
+        self._sampler.join()
+        self.result.update(
+            wall_s=round(wall, 4),
+            cpu_s=round(cpu + (child_cpu - self._child_cpu), 4),
+            peak_rss_mb=round(self._peak / 1048576, 1),
+            child_peak_rss_mb=round(child_peak / 1048576, 1),
+        )
+        if exc is not None:
+            self.result.update(status='failed', error=f"{exc_type.__name__}: {exc}")
+            return True  # record the failure, keep benchmarking
+        return False
+
+    def output(self, path):
+        if path and os.path.exists(path):
+            if os.path.isdir(path):
+                size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(path) for f in fs)
+            else:
+                size = os.path.getsize(path)
+            self.result['output_kb'] = round(size / 1024, 1)
+
+    def skip(self, reason):
+        self.result.update(status='skipped', error=reason)
+
+
+def run_pptxgenjs_path(slides, work_dir):
+    """search → llm → render → fix_backgrounds → pdf → thumbnails."""
+    import deck_pipeline
+    from web_search import search_google
+    from ppt_to_images import rasterize_pdf
+
+    stages = []
+    topic = f"Benchmark deck with {slides} slides"
+
+    with StageTimer('search') as t:
+        results = search_google(topic, 'mock', 'mock', num_results=5)
+        t.result['items'] = len(results)
+    stages.append(t.result)
+
+    with StageTimer('llm') as t:
+        js_code, _source, error = deck_pipeline.generate_code({'topic': topic, 'num_slides': slides})
+        if not js_code:
+            raise RuntimeError(error or 'no code')
+        t.result['output_kb'] = round(len(js_code) / 1024, 1)
+    stages.append(t.result)
+
+    # Time fix_pptx_backgrounds separately from the Node render that calls it
+    fix_timer = StageTimer('fix_backgrounds')
+    original_fix = deck_pipeline.fix_pptx_backgrounds
+
+    def _timed_fix(path):
+        with fix_timer:
+            original_fix(path)
+        fix_timer.output(path)
+
+    ppt_path = os.path.join(work_dir, f"deck_{slides}.pptx")
+    with StageTimer('render') as t:
+        if not js_code:
+            t.skip('no code')
+        elif not shutil.which('node'):
+            t.skip('node not installed')
+        else:
+            deck_pipeline.fix_pptx_backgrounds = _timed_fix
+            try:
+                ok, result = deck_pipeline.run_pptxgenjs(js_code, ppt_path)
+            finally:
+                deck_pipeline.fix_pptx_backgrounds = original_fix
+            if not ok:
+                raise RuntimeError(str(result)[:200])
+            t.output(ppt_path)
+    if 'wall_s' in fix_timer.result and t.result['status'] == 'ok':
+        t.result['wall_s'] = round(t.result['wall_s'] - fix_timer.result['wall_s'], 4)
+        t.result['cpu_s'] = round(t.result['cpu_s'] - fix_timer.result['cpu_s'], 4)
+    else:
+        fix_timer.skip('render did not run')
+    stages.extend([t.result, fix_timer.result])
+
+    pdf_path = os.path.join(work_dir, f"deck_{slides}.pdf")
+    with StageTimer('pdf') as t:
+        if not os.path.exists(ppt_path):
+            t.skip('no deck')
+        elif not (shutil.which('libreoffice') or shutil.which('soffice')):
+            t.skip('libreoffice not installed')
+        else:
+            import subprocess
+            subprocess.run([shutil.which('libreoffice') or shutil.which('soffice'), '--headless',
+                            '--convert-to', 'pdf', '--outdir', work_dir, ppt_path],
+                           capture_output=True, timeout=300)
+            if not os.path.exists(pdf_path):
+                raise RuntimeError('PDF conversion failed')
+            t.output(pdf_path)
+    stages.append(t.result)
+
+    thumbs_dir = os.path.join(work_dir, f"thumbs_{slides}")
+    with StageTimer('thumbnails') as t:
+        if not os.path.exists(pdf_path):
+            t.skip('no pdf')
+        elif not shutil.which('pdftoppm'):
+            t.skip('pdftoppm not installed')
+        else:
+            os.makedirs(thumbs_dir, exist_ok=True)
+            thumbs = rasterize_pdf(pdf_path, thumbs_dir)
+            t.result['pages'] = len([p for p in thumbs if p])
+            t.output(thumbs_dir)
+    stages.append(t.result)
+    return stages
+
+
+def run_fallback_path(slides, work_dir):
+    """llm_text → fallback_render (python-pptx designer with images from the mock)."""
+    from multi_ai_generator import MultiAIGenerator
+    from ai_ppt_generator import generate_beautiful_ppt
+
+    stages = []
+    topic = f"Benchmark fallback with {slides} slides"
+    content = []
+    with StageTimer('llm_text') as t:
+        result = MultiAIGenerator().generate_ppt_content(topic=topic, min_slides=slides, max_slides=slides)
+        text = result.get('output', '')
+        title, bullets = None, []
+        for line in text.splitlines():
+            line = line.strip()
+            if line.lower().startswith('slide'):
+                if title:
+                    content.append({'slide_number': len(content) + 1, 'title': title, 'bullets': bullets})
+                title, bullets = line.split(':', 1)[-1].strip(), []
+            elif line.startswith('- '):
+                bullets.append(line[2:])
+        if title:
+            content.append({'slide_number': len(content) + 1, 'title': title, 'bullets': bullets})
+        if not content:
+            raise RuntimeError('no slide content')
+    stages.append(t.result)
+
+    ppt_path = os.path.join(work_dir, f"fallback_{slides}.pptx")
+    with StageTimer('fallback_render') as t:
+        if not content:
+            t.skip('no content')
+        else:
+            ok = generate_beautiful_ppt(content, ppt_path, color_scheme='modern', use_ai=False,
+                                        original_topic=topic, min_slides=slides, max_slides=slides,
+                                        generate_ai_images=True)
+            if not ok:
+                raise RuntimeError('generate_beautiful_ppt failed')
+            t.output(ppt_path)
+    stages.append(t.result)
+    return stages
+
+
+def compare(results, baseline, threshold):
+    """Regressions: stages whose wall time grew more than `threshold` over the baseline."""
+    base = {(r['slides'], r['path'], r['stage']): r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        old = base.get((r['slides'], r['path'], r['stage']))
+        if not old or r['status'] != 'ok' or old.get('status') != 'ok':
+            continue
+        delta = r['wall_s'] - old['wall_s']
+        if delta > MIN_REGRESSION_SECONDS and delta > old['wall_s'] * threshold:
+            r['baseline_wall_s'] = old['wall_s']
+            regressions.append(r)
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'slides':>6} {'path':<9} {'stage':<16} {'status':<8} {'wall s':>8} {'cpu s':>8} "
+          f"{'rss MB':>7} {'child MB':>8} {'out KB':>8}")
+    for r in results:
+        print(f"{r['slides']:>6} {r['path']:<9} {r['stage']:<16} {r['status']:<8} "
+              f"{r.get('wall_s', 0):>8.3f} {r.get('cpu_s', 0):>8.3f} {r.get('peak_rss_mb', 0):>7.1f} "
+              f"{r.get('child_peak_rss_mb', 0):>8.1f} {r.get('output_kb', 0):>8.1f}"
+              + (f"  ({r['error']})" if r.get('error') and r['status'] != 'ok' else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmark of the deck pipeline.")
+    parser.add_argument('--slides', type=int, nargs='+', default=list(SLIDE_COUNTS))
+    parser.add_argument('--latency', type=float, default=0.0, help="mock API latency in seconds")
+    parser.add_argument('--recordings', help="directory of recorded responses for mock_services")
+    parser.add_argument('--skip-fallback', action='store_true', help="only benchmark the PptxGenJS path")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="write results to --baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument('--json', help="also write raw results to this file")
+    args = parser.parse_args(argv)
+
+    with MockServices(latency=args.latency, recordings_dir=args.recordings) as mock:
+        # Must be in place before the pipeline modules read their endpoint settings
+        os.environ.update(mock.env())
+        os.environ.setdefault('ARTIFACT_DIR', os.path.join('output', 'benchmark', 'artifacts'))
+        work_dir = os.path.join('output', 'benchmark', time.strftime('%Y%m%d-%H%M%S'))
+        os.makedirs(work_dir, exist_ok=True)
+
+        results = []
+        for slides in args.slides:
+            print(f"[BENCH] {slides} slides...")
+            for stage in run_pptxgenjs_path(slides, work_dir):
+                results.append(dict(stage, slides=slides, path='pptxgenjs'))
+            if not args.skip_fallback:
+                for stage in run_fallback_path(slides, work_dir):
+                    results.append(dict(stage, slides=slides, path='fallback'))
+        print(f"[BENCH] Mock calls: {mock.calls}")
+
+    print_table(results)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'latency': args.latency,
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[BENCH] Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n[BENCH] {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r['slides']} slides {r['path']}/{r['stage']}: "
+                      f"{r['baseline_wall_s']:.3f}s → {r['wall_s']:.3f}s")
+            return 1
+        print("\n[BENCH] No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Session Blob Store
+Large per-session values (extracted upload text, chart DataFrames, logo data
+URIs, generated PptxGenJS code, full AI output) live here instead of in
+st.session_state, which only keeps the returned key.
+
+Blobs are artifact-store objects: keyed by the SHA-256 of their serialized
+content (identical uploads from different sessions are stored once), held by
+the sessions that put them and evicted by the artifact GC once those sessions
+expire. Recently used values are also kept deserialized in a process-wide
+memory LRU, so a rerun does not go to disk. Values handed out by get() are
+shared between sessions and must be treated as read-only.
+
+    key = get_blobs().put(session_id, df)
+    df = get_blobs().get(key)
+"""
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from artifact_store import get_store
+
+BLOB_CACHE_MB = float(os.getenv("BLOB_CACHE_MB", "64"))
+
+# Serialized form per value type: (file name in the store, encode, decode)
+_TEXT = ("blob.txt", lambda v: v.encode('utf-8'), lambda b: b.decode('utf-8'))
+_BYTES = ("blob.bin", bytes, bytes)
+_PICKLE = ("blob.pkl", lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads)
+_FORMATS = {name: (encode, decode) for name, encode, decode in (_TEXT, _BYTES, _PICKLE)}
+
+
+def _format_for(value):
+    if isinstance(value, str):
+        return _TEXT
+    if isinstance(value, (bytes, bytearray)):
+        return _BYTES
+    return _PICKLE
+
+
+class BlobStore:
+    """Content-addressed values on top of the artifact store, with a bounded in-memory LRU."""
+
+    def __init__(self, store=None, cache_mb: float = BLOB_CACHE_MB):
+        self.store = store or get_store()
+        self.cache_bytes = int(cache_mb * 1024 * 1024)
+        self._cache = OrderedDict()  # key -> (value, serialized size)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, session_id: str, value: Any) -> str:
+        """Store value for session_id and return its key (same content -> same key)."""
+        name, encode, _decode = _format_for(value)
+        data = encode(value)
+        path = self.store.put_bytes(data, name=name, session_id=session_id)
+        key = self.store.key_for_path(path)
+        self._remember(key, value, len(data))
+        return key
+
+    def get(self, key: Optional[str], default: Any = None) -> Any:
+        """Value for key, or default when key is empty or the blob has been evicted."""
+        if not key:
+            return default
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit:
+                self._cache.move_to_end(key)
+                return hit[0]
+        path = self.store.object_path(key)
+        if not path:
+            return default
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            value = _FORMATS[os.path.basename(path)][1](data)
+        except Exception as e:
+            print(f"[BLOBS] Could not read {key}: {e}")
+            return default
+        self.store.touch(path)
+        self._remember(key, value, len(data))
+        return value
+
+    def acquire(self, session_id: str, key: Optional[str]):
+        """session_id also holds key, an object stored by someone else (e.g. a table's column files)."""
+        path = self.store.object_path(key) if key else None
+        if path:
+            self.store.acquire(session_id, path)
+
+    def release(self, session_id: str, key: Optional[str]):
+        """session_id no longer needs key (the GC may evict it once nobody holds it)."""
+        path = self.store.object_path(key) if key else None
+        if path:
+            self.store.release(session_id, path)
+
+    def _remember(self, key, value, size):
+        if size > self.cache_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return
+            self._cache[key] = (value, size)
+            self._cached_bytes += size
+            while self._cached_bytes > self.cache_bytes:
+                _key, (_value, evicted) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted
+
+
+_blobs = None
+_blobs_lock = threading.Lock()
+
+
+def get_blobs() -> BlobStore:
+    """Process-wide blob store."""
+    global _blobs
+    if _blobs is None:
+        with _blobs_lock:
+            if _blobs is None:
+                _blobs = BlobStore()
+    return _blobs
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chart Reduction Benchmark
+Times chart_reduce.reduce_frame on synthetic uploads of a million rows (or
+--rows) for each chart the upload step offers, and reports how many rows
+come out of it.
+
+    python chart_benchmark.py                       # 1,000,000 rows, 5 repeats
+    python chart_benchmark.py --rows 100000 200000 --repeat 10 --json charts.json
+
+Cases: text labels (bar / pie: top-N + Other; line: LTTB over row order) and a
+per-minute time series (bar: calendar buckets; line: LTTB over time).
+"""
+
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from chart_reduce import reduce_frame
+
+ROW_COUNTS = (1_000_000,)
+CATEGORIES = 200
+
+
+def make_frames(rows, seed=0):
+    """{case: DataFrame} with `rows` rows each."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Product {i}" for i in range(CATEGORIES)])
+    # Skewed popularity, so the top-N is not a coin toss
+    weights = 1.0 / np.arange(1, CATEGORIES + 1)
+    categories = pd.DataFrame({
+        'Product': names[rng.choice(CATEGORIES, size=rows, p=weights / weights.sum())],
+        'Revenue': rng.gamma(2.0, 50.0, size=rows),
+        'Units': rng.integers(1, 20, size=rows).astype('float64'),
+    })
+    series = pd.DataFrame({
+        'Timestamp': pd.date_range('2021-01-01', periods=rows, freq='min'),
+        'Load': np.cumsum(rng.standard_normal(rows)) + 1000.0,
+    })
+    return {'categories': categories, 'timeseries': series}
+
+
+def time_call(fn, repeat):
+    """(best seconds, result) over `repeat` runs after one warm-up."""
+    result = fn()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(rows, repeat):
+    results = []
+    for case, df in make_frames(rows).items():
+        for chart_type in ("bar", "pie", "line"):
+            if case == 'timeseries' and chart_type == 'pie':
+                continue
+            seconds, out = time_call(lambda: reduce_frame(df, chart_type), repeat)
+            results.append({
+                'rows': rows, 'case': case, 'chart_type': chart_type,
+                'ms': round(seconds * 1000, 2),
+                'rows_out': len(out), 'mb_in': round(df.memory_usage(deep=True).sum() / 1e6, 1),
+            })
+    return results
+
+
+def print_table(results):
+    print(f"{'rows':>10}  {'case':<11} {'chart':<5} {'reduce ms':>10} {'rows out':>8} {'MB in':>7}")
+    for r in results:
+        print(f"{r['rows']:>10,}  {r['case']:<11} {r['chart_type']:<5} {r['ms']:>10.1f} "
+              f"{r['rows_out']:>8} {r['mb_in']:>7.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time chart data reduction on large synthetic uploads.")
+    parser.add_argument('--rows', type=int, nargs='+', default=list(ROW_COUNTS))
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (best is reported)")
+    parser.add_argument('--json', help="also write raw results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        print(f"[BENCH] {rows:,} rows")
+        results.extend(run(rows, args.repeat))
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
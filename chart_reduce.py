@@ -0,0 +1,213 @@
+"""
+Chart Data Reduction
+Shrinks whatever was uploaded to what a chart can show, with NumPy instead of
+row loops, before anything is plotted:
+
+    bar / pie   sums per label, the CHART_TOP_N largest kept and the rest
+                folded into one "Other" slice (date labels: sums per day /
+                month / quarter / year, whichever fits)
+    line        Largest-Triangle-Three-Buckets downsampling to
+                CHART_LINE_POINTS points, which keeps the peaks and dips a
+                plain stride would drop
+
+The first column is the label (as in the chart slide); value columns are the
+numeric ones among the rest, and a text label column that parses as dates is
+treated as a date axis.
+
+    frame = reduce_frame(df, chart_type="line")
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+CHART_TOP_N = int(os.getenv("CHART_TOP_N", "12"))
+PIE_TOP_N = 8
+CHART_LINE_POINTS = int(os.getenv("CHART_LINE_POINTS", "200"))
+OTHER_LABEL = "Other"
+# Share of sampled values that must parse for a column to count as numeric / dates
+NUMERIC_SHARE = 0.9
+DATE_SHARE = 0.8
+_SAMPLE = 500
+# Calendar buckets tried, finest first, for bar / pie charts over a date label
+_DATE_UNITS = ('D', 'M', 'Q', 'Y')
+
+
+def _as_dates(series):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # "could not infer format"
+        return pd.to_datetime(series, errors='coerce')
+
+
+def detect_columns(df):
+    """(label column, its kind 'date' | 'number' | 'text', [numeric value columns])."""
+    if df is None or not len(df.columns):
+        return None, None, []
+    label = df.columns[0]
+    values = []
+    for col in df.columns[1:]:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_numeric_dtype(series):
+            values.append(col)
+            continue
+        sample = series.dropna().head(_SAMPLE)
+        if len(sample) and pd.to_numeric(sample, errors='coerce').notna().mean() >= NUMERIC_SHARE:
+            values.append(col)
+
+    series = df[label]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        kind = 'date'
+    elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        kind = 'number'
+    else:
+        sample = series.dropna().head(_SAMPLE).astype(str)
+        # Plain numbers ("2021") and bare month names ("Jan") also parse as dates; those stay categories
+        dated = sample[sample.str.contains(r'\d') & pd.to_numeric(sample, errors='coerce').isna()]
+        kind = 'date' if len(sample) and _as_dates(dated).notna().sum() >= DATE_SHARE * len(sample) else 'text'
+    return label, kind, values
+
+
+def _value_matrix(df, values):
+    """rows x series float64 array, NaN for blanks / unparseable cells."""
+    if not values:
+        return np.empty((len(df), 0))
+    return np.column_stack([pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+                            for col in values])
+
+
+def top_n(labels, matrix, n=CHART_TOP_N, other=OTHER_LABEL):
+    """
+    Sum the rows of matrix per label. Up to n labels come back in first-seen order;
+    beyond that the n-1 with the largest first-series total are kept, largest first,
+    and the rest are folded into `other`. Returns (labels, sums).
+    """
+    codes, uniques = pd.factorize(labels if isinstance(labels, pd.Series) else pd.Series(labels), sort=False)
+    if (codes < 0).any():  # blank labels
+        matrix = matrix[codes >= 0]
+        codes = codes[codes >= 0]
+    matrix = np.nan_to_num(matrix)
+    sums = np.column_stack([np.bincount(codes, weights=matrix[:, j], minlength=len(uniques))
+                            for j in range(matrix.shape[1])]) if matrix.shape[1] else np.zeros((len(uniques), 0))
+    if len(uniques) <= n:
+        return list(uniques), sums
+    order = np.argsort(-sums[:, 0], kind='stable') if sums.shape[1] else np.arange(len(uniques))
+    head, tail = order[:n - 1], order[n - 1:]
+    return [uniques[i] for i in head] + [other], np.vstack([sums[head], sums[tail].sum(axis=0)])
+
+
+def lttb(x, y, points=CHART_LINE_POINTS):
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps (first and last always).
+    x must be sorted ascending; both are 1-D float arrays without NaNs.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    # Bucket i (1..points-2) covers [edges[i], edges[i+1]); the first and last points are their own buckets
+    edges = np.floor(np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    starts = edges[:-1]
+    lengths = np.diff(edges)
+    # Mean of every bucket at once (the final point is cut off, or reduceat would add it to the
+    # last bucket); the "next bucket" average for the last one is the final point
+    avg_x = np.append(np.add.reduceat(x[:-1], starts) / lengths, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], starts) / lengths, y[-1])
+
+    keep = np.empty(points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = starts[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _line(df, label, kind, values, points):
+    matrix = _value_matrix(df, values)
+    if kind == 'date':
+        dates = _as_dates(df[label]).to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(dates)
+        x = dates.astype('int64').astype('float64')
+    elif kind == 'number':
+        x = pd.to_numeric(df[label], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        valid = ~np.isnan(x)
+    else:
+        x = np.arange(len(df), dtype='float64')
+        valid = np.ones(len(df), dtype=bool)
+    if values:
+        valid &= ~np.isnan(matrix[:, 0])
+    rows = np.flatnonzero(valid)
+    if kind in ('date', 'number'):
+        rows = rows[np.argsort(x[rows], kind='stable')]
+    # The first series picks the points; the other series are shown at the same x positions
+    keep = rows[lttb(x[rows], matrix[rows, 0], points)] if values else rows[:points]
+    out = pd.DataFrame(matrix[keep], columns=values)
+    labels = df[label].iloc[keep]
+    out.insert(0, label, (_as_dates(labels) if kind == 'date' else labels).to_numpy())
+    return out
+
+
+def _bucket_label(unit, code):
+    if unit == 'Q':
+        year, quarter = divmod(int(code), 4)
+        return f"{1970 + year} Q{quarter + 1}"
+    return str(np.datetime64(int(code), unit))
+
+
+def _bucket_codes(dates, unit):
+    codes = dates.astype('datetime64[M]' if unit == 'Q' else f'datetime64[{unit}]').astype(np.int64)
+    return codes // 3 if unit == 'Q' else codes
+
+
+def _date_buckets(df, label, values, limit):
+    """Sums per day / month / quarter / year: the finest that fits in limit buckets (the latest years if none does)."""
+    dates = _as_dates(df[label]).to_numpy(dtype='datetime64[ns]')
+    valid = ~np.isnat(dates)
+    dates = dates[valid]
+    matrix = np.nan_to_num(_value_matrix(df, values)[valid])
+    if not len(dates):
+        return pd.DataFrame(columns=[label] + values)
+    # Bucket numbers counted from the epoch, so the buckets in range are one bincount;
+    # the unit is picked from the first and last date before converting every row
+    ends = np.array([dates.min(), dates.max()])
+    for unit in _DATE_UNITS:
+        first, last = _bucket_codes(ends, unit)
+        span = int(last - first) + 1
+        if span <= limit:
+            break
+    codes = _bucket_codes(dates, unit) - first
+    counts = np.bincount(codes, minlength=span)
+    buckets = np.flatnonzero(counts)[-limit:]
+    out = pd.DataFrame({col: np.bincount(codes, weights=matrix[:, j], minlength=span)[buckets]
+                        for j, col in enumerate(values)})
+    out.insert(0, label, [_bucket_label(unit, first + b) for b in buckets])
+    return out
+
+
+def reduce_frame(df, chart_type="bar", limit=None, points=CHART_LINE_POINTS):
+    """At most `limit` categories (bar / pie) or `points` points (line), label column first."""
+    label, kind, values = detect_columns(df)
+    if label is None or not values:
+        return df.head(limit or CHART_TOP_N) if df is not None else df
+    if chart_type == "line":
+        return _line(df, label, kind, values, points)
+    limit = limit or (PIE_TOP_N if chart_type == "pie" else CHART_TOP_N)
+    if len(df) <= limit and df[label].is_unique:
+        # Already one row per category (a small sheet, or a frame reduced before)
+        out = pd.DataFrame(_value_matrix(df, values), columns=values)
+        labels = df[label]
+        out.insert(0, label, labels.dt.strftime('%Y-%m-%d').to_numpy() if kind == 'date' and
+                   pd.api.types.is_datetime64_any_dtype(labels) else labels.to_numpy())
+        return out
+    if kind == 'date':
+        return _date_buckets(df, label, values, limit)
+    labels, sums = top_n(df[label], _value_matrix(df, values), n=limit)
+    out = pd.DataFrame(sums, columns=values)
+    out.insert(0, label, [str(v) for v in labels])
+    return out
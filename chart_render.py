@@ -0,0 +1,264 @@
+"""
+Native Data Charts
+Uploaded-data charts as real PowerPoint chart parts instead of matplotlib
+PNGs: python-pptx's CategoryChartData on the built-in designer path, and a
+PptxGenJS addChart() slide appended to the generated code on the Node path.
+Both render instantly, stay editable in PowerPoint (the numbers travel in an
+embedded workbook) and add a few KB to the deck.
+
+The frame is reduced first (chart_reduce), so there are never more than a
+dozen categories or a few hundred line points to write.
+
+Rendered charts are cached in the artifact store under chart_key(): a
+fingerprint of the reduced data, chart type, title and theme. A python-pptx
+chart is kept as its styled chart XML plus the embedded workbook (building
+the workbook is most of the cost); create_chart_image keeps the PNG.
+Regenerating, re-theming back or editing other slides reuses them.
+
+    add_native_chart(slide, df, "bar", "Revenue by region", Inches(1), Inches(1), Inches(8), Inches(4.3))
+    js_code += pptxgenjs_chart_code(df, "line", "Daily load", theme="dark")
+"""
+
+import io
+import copy
+import json
+import hashlib
+import zipfile
+
+import pandas as pd
+
+from artifact_store import get_store, KEY_LENGTH
+from chart_reduce import reduce_frame
+
+# Line charts get markers while there are few enough points to tell them apart
+MARKER_POINTS = 30
+# Part of every cache key: bump when chart styling changes
+CHART_RENDER_VERSION = 1
+
+
+def chart_key(kind, frame, chart_type, title, theme=None):
+    """
+    Artifact key for a rendered chart: SHA-256 over the reduced frame's contents and
+    column names, the chart type, title and theme (any JSON-able value), and `kind`
+    ('pptx', 'png', ...). Stable across processes, unlike hash().
+    """
+    h = hashlib.sha256(json.dumps([CHART_RENDER_VERSION, kind, chart_type, title, theme,
+                                   [str(c) for c in frame.columns]], default=str).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:KEY_LENGTH]
+
+
+def _series(frame, chart_type):
+    if frame is None or len(frame.columns) < 2:
+        return [], []
+    labels = frame[frame.columns[0]]
+    if pd.api.types.is_datetime64_any_dtype(labels):
+        intraday = (labels.dt.normalize() != labels).any()
+        labels = labels.dt.strftime('%Y-%m-%d %H:%M' if intraday else '%Y-%m-%d')
+    categories = [str(v) for v in labels]
+    series = [(str(col), [None if pd.isna(v) else float(v) for v in frame[col]])
+              for col in frame.columns[1:]]
+    return categories, series[:1] if chart_type == "pie" else series
+
+
+def chart_series(df, chart_type="bar"):
+    """(category labels, [(series name, values)]) of the reduced frame; pies get one series."""
+    return _series(reduce_frame(df, chart_type), chart_type)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# python-pptx
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _style_chart(chart, chart_type, series_count, colors):
+    from pptx.enum.chart import XL_LEGEND_POSITION
+    from pptx.util import Pt
+
+    palette = colors.get('series') or []
+    text_color = colors.get('text')
+    chart.has_title = False  # the slide title says it
+    chart.has_legend = chart_type == "pie" or series_count > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+        chart.legend.font.size = Pt(11)
+        if text_color is not None:
+            chart.legend.font.color.rgb = text_color
+
+    plot = chart.plots[0]
+    if chart_type == "pie":
+        plot.has_data_labels = True
+        plot.data_labels.show_percentage = True
+        plot.data_labels.show_value = False
+        plot.data_labels.number_format = '0.0%'
+        plot.data_labels.number_format_is_linked = False
+        for i, point in enumerate(plot.series[0].points):
+            if palette:
+                point.format.fill.solid()
+                point.format.fill.fore_color.rgb = palette[i % len(palette)]
+        return
+
+    if chart_type != "line":
+        plot.gap_width = 60
+    for i, s in enumerate(plot.series):
+        if not palette:
+            continue
+        color = palette[i % len(palette)]
+        if chart_type == "line":
+            s.format.line.color.rgb = color
+            s.format.line.width = Pt(2.25)
+            s.smooth = False
+        else:
+            s.format.fill.solid()
+            s.format.fill.fore_color.rgb = color
+    for axis in (chart.category_axis, chart.value_axis):
+        axis.tick_labels.font.size = Pt(10)
+        if text_color is not None:
+            axis.tick_labels.font.color.rgb = text_color
+    chart.value_axis.has_major_gridlines = True
+    if colors.get('grid') is not None:
+        chart.value_axis.major_gridlines.format.line.color.rgb = colors['grid']
+    chart.value_axis.tick_labels.number_format = '#,##0.##'
+    chart.value_axis.tick_labels.number_format_is_linked = False
+
+
+def _pack_chart_part(chart_part):
+    """Zip of the styled chart XML (without its link to the workbook part) and the workbook."""
+    from pptx.opc.oxml import serialize_part_xml
+    from pptx.oxml.ns import qn
+
+    element = copy.deepcopy(chart_part._element)
+    for external in element.findall(qn('c:externalData')):
+        element.remove(external)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('chart.xml', serialize_part_xml(element))
+        zf.writestr('data.xlsx', chart_part.chart_workbook.xlsx_part.blob)
+    return buf.getvalue()
+
+
+def _add_cached_chart(slide, path, x, y, cx, cy):
+    """
+    Graphic frame for a chart part rebuilt from a cached zip (what shapes.add_chart does,
+    minus building it). Uses python-pptx internals: the version is pinned in
+    requirements.txt and tests/test_chart_render.py reopens decks built this way.
+    """
+    from pptx.parts.chart import ChartPart
+    from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+
+    with zipfile.ZipFile(path) as zf:
+        xml, xlsx = zf.read('chart.xml'), zf.read('data.xlsx')
+    package = slide.part.package
+    chart_part = ChartPart.load(package.next_partname(ChartPart.partname_template), CT.DML_CHART, package, xml)
+    chart_part.chart_workbook.update_from_xlsx_blob(xlsx)
+    rId = slide.part.relate_to(chart_part, RT.CHART)
+    shapes = slide.shapes
+    graphic_frame = shapes._add_chart_graphicFrame(rId, x, y, cx, cy)
+    shapes._recalculate_extents()
+    return shapes._shape_factory(graphic_frame)
+
+
+def add_native_chart(slide, df, chart_type, title, x, y, cx, cy, colors=None):
+    """
+    Add df as a native chart to a python-pptx slide. colors: optional
+    {'series': [RGBColor], 'text': RGBColor, 'grid': RGBColor}.
+    Returns the chart; raises ValueError if there is nothing numeric to plot.
+    """
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE
+
+    frame = reduce_frame(df, chart_type)
+    categories, series = _series(frame, chart_type)
+    if not categories or not series:
+        raise ValueError("no numeric columns to chart")
+    colors = colors or {}
+    store = get_store()
+    key = chart_key('pptx', frame, chart_type, title,
+                    {name: [str(c) for c in value] if isinstance(value, list) else str(value)
+                     for name, value in colors.items()})
+    cached = store.object_path(key)
+    if cached:
+        try:
+            graphic_frame = _add_cached_chart(slide, cached, x, y, cx, cy)
+            store.touch(cached)
+            return graphic_frame.chart
+        except Exception as e:
+            print(f"[CHART] Cached chart {key} unusable ({e}), rebuilding")
+
+    chart_data = CategoryChartData()
+    chart_data.categories = categories
+    for name, values in series:
+        chart_data.add_series(name, values)
+
+    if chart_type == "pie":
+        kind = XL_CHART_TYPE.PIE
+    elif chart_type == "line":
+        kind = XL_CHART_TYPE.LINE_MARKERS if len(categories) <= MARKER_POINTS else XL_CHART_TYPE.LINE
+    else:
+        kind = XL_CHART_TYPE.COLUMN_CLUSTERED
+    graphic_frame = slide.shapes.add_chart(kind, x, y, cx, cy, chart_data)
+    _style_chart(graphic_frame.chart, chart_type, len(series), colors)
+    try:
+        store.put_bytes(_pack_chart_part(graphic_frame.chart_part), name="chart.zip", key=key)
+    except Exception as e:
+        print(f"[CHART] Could not cache chart: {e}")
+    return graphic_frame.chart
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PptxGenJS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def pptxgenjs_chart_code(df, chart_type, title, theme="modern", brand_accent=""):
+    """
+    JavaScript that adds one chart slide to `pptx` (run by node_pptx/pptx_wrapper.js after
+    the generated slides), or '' if there is nothing to plot. Colors come from the same
+    theme_palette() as the generated slides, brand accent included.
+    """
+    from multi_ai_generator import theme_palette
+
+    categories, series = chart_series(df, chart_type)
+    if not categories or not series:
+        return ''
+    palette = theme_palette(theme, brand_accent)
+    data = [{'name': name, 'labels': categories, 'values': values} for name, values in series]
+    colors = [palette[k] for k in ("ACCENT", "TEAL", "GOLD", "MUTED", "TITLE")]
+    options = {
+        'x': 0.6, 'y': 1.4, 'w': 12.1, 'h': 5.6,
+        'chartColors': colors,
+        'showTitle': False,
+        'showLegend': chart_type == "pie" or len(series) > 1,
+        'legendPos': 'b',
+        'legendFontSize': 12,
+        'legendColor': palette["BODY"],
+        'catAxisLabelColor': palette["BODY"],
+        'valAxisLabelColor': palette["BODY"],
+        'catAxisLabelFontSize': 11,
+        'valAxisLabelFontSize': 11,
+        'valAxisLabelFormatCode': '#,##0.##',
+        'valGridLine': {'color': palette["MUTED"], 'style': 'dash', 'size': 0.5},
+    }
+    if chart_type == "pie":
+        js_type = 'pie'
+        options.update(showPercent=True, showValue=False, dataLabelColor=palette["TITLE"],
+                       dataLabelFormatCode='0.0%')
+    elif chart_type == "line":
+        js_type = 'line'
+        options.update(lineSize=2, lineDataSymbol='circle' if len(categories) <= MARKER_POINTS else 'none')
+    else:
+        js_type = 'bar'
+        options.update(barDir='col', barGapWidthPct=60)
+    title_options = {'x': 0.6, 'y': 0.4, 'w': 12.1, 'h': 0.8, 'fontSize': 28, 'bold': True,
+                     'color': palette["TITLE"], 'fontFace': 'Calibri'}
+    return f"""
+// Uploaded data chart (native chart part, added by chart_render.py)
+try {{
+    const chartSlide = pptx.addSlide();
+    chartSlide.background = {{ color: {json.dumps(palette["BG"])} }};
+    chartSlide.addText({json.dumps(title)}, {json.dumps(title_options)});
+    chartSlide.addShape(pptx.ShapeType.rect, {{ x: 0.6, y: 1.2, w: 1.2, h: 0.06, fill: {{ color: {json.dumps(palette["ACCENT"])} }} }});
+    chartSlide.addChart(pptx.ChartType.{js_type}, {json.dumps(data)}, {json.dumps(options)});
+}} catch (err) {{
+    console.error('[CHART] ' + err.message);
+}}
+"""
@@ -96,7 +96,6 @@ Generates detailed articles from topics using Groq API and Ollama
 from dotenv import load_dotenv
 load_dotenv()
 import os
-print("DEBUG: DEEPSEEK_API_KEY =", os.getenv("DEEPSEEK_API_KEY"))
 
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
@@ -0,0 +1,401 @@
+"""
+Deck Generation Pipeline
+Streamlit-free building blocks shared by the chat UI, background jobs and
+batch tools: run AI-generated PptxGenJS code through Node.js, post-process
+the PPTX, fall back to python-pptx, and commit the result to the artifact store.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import json as json_mod
+from datetime import datetime
+
+from artifact_store import get_store
+from tracing import span, traced
+from resources import get_generator
+from warmup import wait_for_node_modules
+
+# pptx/PptxGenJS redeclarations the AI sometimes adds (the wrapper provides `pptx`)
+_PPTX_REDECLARATIONS = [re.compile(p, re.MULTILINE) for p in (
+    r'^\s*(const|let|var)\s+pptx\s*=\s*new\s+PptxGenJS[^\n]*\n?',
+    r'^\s*(const|let|var)\s+pptx\s*=\s*require[^\n]*\n?',
+    r'^\s*pptx\.layout\s*=[^\n]*\n?',
+)]
+_SLIDE_DECLARATION = re.compile(r'\s*let\s+(slide\d+)\s*=\s*pptx\.addSlide\(\)')
+_BARE_PPTX_CALL = re.compile(r'\bpptx\.(addShape|addText|addImage)\b')
+_CHAINED_ADD_SLIDE = re.compile(r'pptx\.addSlide\(\)\.(addShape|addText)')
+_ADD_SLIDE_PREFIX = re.compile(r'pptx\.addSlide\(\)\.')
+# Slide order in ppt/presentation.xml and the relationships that name each slide's part
+_SLIDE_ID_LIST = re.compile(r'<p:sldIdLst>(.*?)</p:sldIdLst>', re.DOTALL)
+_SLIDE_ID = re.compile(r'<p:sldId\b[^>]*/>')
+_REL_ID = re.compile(r'r:id="([^"]+)"')
+_RELATIONSHIP = re.compile(r'<Relationship\b[^>]*/?>')
+_XML_ATTR = re.compile(r'(\w+)="([^"]*)"')
+
+
+@traced("fix_backgrounds")
+def fix_pptx_backgrounds(pptx_path):
+    """Post-process PPTX: replace slide.background <p:bgPr> with full-slide rectangle shapes.
+    Fixes blank display in PowerPoint/Google Slides where layout bg1=white overrides bgPr.
+    """
+    import zipfile as _zipfile, shutil as _shutil, re as _re
+    import os as _os
+
+    # Slide dimensions for LAYOUT_WIDE (13.33" x 7.5" in EMU)
+    SLIDE_W = 12192000
+    SLIDE_H = 6858000
+
+    try:
+        with _zipfile.ZipFile(pptx_path, 'r') as zin:
+            info_map = {info.filename: info for info in zin.infolist()}
+            file_contents = {info.filename: zin.read(info.filename) for info in zin.infolist()}
+
+        modified = False
+        slide_pattern = _re.compile(r'^ppt/slides/slide\d+\.xml$')
+        bg_pattern = _re.compile(
+            r'<p:bg><p:bgPr><a:solidFill><a:srgbClr val="([0-9A-Fa-f]{6})"/>'
+            r'</a:solidFill></p:bgPr></p:bg>'
+        )
+
+        for fname in file_contents:
+            if not slide_pattern.match(fname):
+                continue
+            xml = file_contents[fname].decode('utf-8')
+
+            # Skip if already processed
+            if 'name="BG_RECT"' in xml:
+                continue
+
+            match = bg_pattern.search(xml)
+            if not match:
+                continue
+
+            bg_color = match.group(1).upper()
+
+            # Build full-slide background rectangle as first shape in spTree
+            bg_rect = (
+                f'<p:sp><p:nvSpPr><p:cNvPr id="999" name="BG_RECT"/>'
+                f'<p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+                f'<p:spPr><a:xfrm><a:off x="0" y="0"/>'
+                f'<a:ext cx="{SLIDE_W}" cy="{SLIDE_H}"/></a:xfrm>'
+                f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+                f'<a:solidFill><a:srgbClr val="{bg_color}"/></a:solidFill>'
+                f'<a:ln><a:noFill/></a:ln></p:spPr></p:sp>'
+            )
+
+            # Insert after </p:grpSpPr> (before other shapes = bottom of z-order)
+            insert_after = '</p:grpSpPr>'
+            pos = xml.find(insert_after)
+            if pos == -1:
+                continue
+            pos += len(insert_after)
+            xml = xml[:pos] + bg_rect + xml[pos:]
+            file_contents[fname] = xml.encode('utf-8')
+            modified = True
+
+        if not modified:
+            return
+
+        # Rewrite PPTX preserving original compress_type per file
+        tmp_path = pptx_path + '.bgfix.tmp'
+        with _zipfile.ZipFile(tmp_path, 'w') as zout:
+            for arcname, content in file_contents.items():
+                orig_info = info_map.get(arcname)
+                compress = orig_info.compress_type if orig_info else _zipfile.ZIP_DEFLATED
+                zout.writestr(arcname, content, compress_type=compress)
+
+        _shutil.move(tmp_path, pptx_path)
+        print("[FIX_BG] Background rectangles added to PPTX slides.")
+
+    except Exception as e:
+        print(f"[FIX_BG] Post-processing failed (non-critical): {e}")
+        try:
+            if _os.path.exists(pptx_path + '.bgfix.tmp'):
+                _os.unlink(pptx_path + '.bgfix.tmp')
+        except:
+            pass
+
+
+def move_chart_slide(pptx_path, position=1):
+    """
+    Move the last slide of a PPTX to `position` (0-based) if it holds a chart part,
+    i.e. the uploaded-data slide appended after the generated code. Only the slide
+    order in ppt/presentation.xml changes.
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(pptx_path, 'r') as zin:
+            presentation = zin.read('ppt/presentation.xml').decode('utf-8')
+            rels = zin.read('ppt/_rels/presentation.xml.rels').decode('utf-8')
+            id_list = _SLIDE_ID_LIST.search(presentation)
+            slide_ids = _SLIDE_ID.findall(id_list.group(1)) if id_list else []
+            if len(slide_ids) <= position + 1:
+                return False
+            rel_id = _REL_ID.search(slide_ids[-1]).group(1)
+            target = next((dict(_XML_ATTR.findall(rel)).get('Target') for rel in _RELATIONSHIP.findall(rels)
+                           if dict(_XML_ATTR.findall(rel)).get('Id') == rel_id), None)
+            slide_name = os.path.basename(target or '')
+            slide_rels = f'ppt/slides/_rels/{slide_name}.rels'
+            if slide_rels not in zin.namelist() or '/relationships/chart"' not in zin.read(slide_rels).decode('utf-8'):
+                print("[CHART] Last slide has no chart; slide order left as is")
+                return False
+
+            order = slide_ids[:position] + slide_ids[-1:] + slide_ids[position:-1]
+            start, end = id_list.span(1)
+            presentation = presentation[:start] + ''.join(order) + presentation[end:]
+
+            tmp_path = pptx_path + '.order.tmp'
+            with zipfile.ZipFile(tmp_path, 'w') as zout:
+                for info in zin.infolist():
+                    data = presentation.encode('utf-8') if info.filename == 'ppt/presentation.xml' else zin.read(info)
+                    zout.writestr(info, data, compress_type=info.compress_type)
+        os.replace(tmp_path, pptx_path)
+        return True
+    except Exception as e:
+        print(f"[CHART] Reordering slides failed (non-critical): {e}")
+        try:
+            if os.path.exists(pptx_path + '.order.tmp'):
+                os.unlink(pptx_path + '.order.tmp')
+        except OSError:
+            pass
+        return False
+
+
+def run_pptxgenjs(js_code, output_path):
+    """Execute PptxGenJS code via Node.js subprocess. Returns (success, path_or_error)."""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    wrapper_path = os.path.join(project_dir, "node_pptx", "pptx_wrapper.js")
+    node_cwd = os.path.join(project_dir, "node_pptx")
+
+    # Strip any pptx/PptxGenJS redeclarations the AI may have added
+    for pattern in _PPTX_REDECLARATIONS:
+        js_code = pattern.sub('', js_code)
+
+    # Fix AI mistake: pptx.addShape/addText → slide1.addShape/addText (if slide1 not yet declared)
+    def _fix_pptx_calls(code):
+        lines = code.split('\n')
+        current_slide = 'slide1'
+        fixed = []
+        for line in lines:
+            # Track current slide variable
+            m = _SLIDE_DECLARATION.match(line)
+            if m:
+                current_slide = m.group(1)
+            # Fix pptx.addShape/addText/addImage calls outside slide variable
+            line = _BARE_PPTX_CALL.sub(f'{current_slide}.\\1', line)
+            # Fix chained: pptx.addSlide().addShape → extract addSlide to separate line
+            if _CHAINED_ADD_SLIDE.search(line):
+                slide_num = int(current_slide.replace('slide','')) + 1
+                next_slide = f'slide{slide_num}'
+                line = f'let {next_slide} = pptx.addSlide();\n' + _ADD_SLIDE_PREFIX.sub(f'{next_slide}.', line)
+                current_slide = next_slide
+            fixed.append(line)
+        return '\n'.join(fixed)
+
+    js_code = _fix_pptx_calls(js_code)
+
+    # Write AI code to a scratch file in the artifact store
+    temp_js_path = get_store().scratch_path(suffix='.js', prefix='pptx_slides_')
+    try:
+        with open(temp_js_path, 'w') as f:
+            f.write(js_code)
+
+        if not wait_for_node_modules():
+            return False, 'PptxGenJS node_modules not installed (run: python warmup.py)'
+
+        with span("node_render", code_chars=len(js_code)) as s:
+            result = subprocess.run(
+                ['node', wrapper_path, output_path, temp_js_path],
+                capture_output=True, text=True, timeout=45,
+                cwd=node_cwd
+            )
+            s.set(returncode=result.returncode)
+
+        if result.returncode == 0:
+            try:
+                response = json_mod.loads(result.stdout.strip())
+                if response.get('success'):
+                    # Post-process: add background rectangles for viewer compatibility
+                    fix_pptx_backgrounds(response['path'])
+                    return True, response['path']
+            except:
+                pass
+
+        # Parse error
+        err_msg = result.stderr or result.stdout or 'Node.js execution failed'
+        try:
+            err_data = json_mod.loads(err_msg.strip())
+            return False, err_data.get('error', err_msg)
+        except:
+            return False, err_msg
+    except subprocess.TimeoutExpired:
+        return False, 'Node.js execution timed out (45s)'
+    except Exception as e:
+        return False, str(e)
+    finally:
+        try:
+            os.unlink(temp_js_path)
+        except:
+            pass
+
+
+def deck_filename(topic):
+    """Meaningful download filename for a deck on `topic`."""
+    if topic:
+        words = re.sub(r'[^\w\s]', '', str(topic)).split()
+        meaningful_words = [w for w in words[:5] if len(w) > 2][:4]
+        topic_slug = '_'.join(meaningful_words) if meaningful_words else 'presentation'
+    else:
+        topic_slug = 'presentation'
+    topic_slug = re.sub(r'[^\w]', '_', topic_slug)[:40]
+    topic_slug = re.sub(r'_+', '_', topic_slug).strip('_')
+    date_str = datetime.now().strftime("%Y%m%d")
+    return f"{topic_slug}_{date_str}.pptx"
+
+
+def _commit_deck(store, ppt_path, ppt_filename, out_path, session_id=None):
+    """Move a rendered scratch deck to out_path, or commit it to the artifact store."""
+    if out_path:
+        shutil.move(ppt_path, out_path)
+        return out_path
+    return store.put_file(ppt_path, name=ppt_filename, session_id=session_id)
+
+
+def build_deck(content, topic, theme, js_code=None, chart=None, progress=None, out_path=None, brand_accent='',
+               session_id=None):
+    """
+    Render a deck — tries PptxGenJS first, falls back to python-pptx.
+
+    Args:
+        content: parsed slide dicts used by the python-pptx fallback
+        js_code: AI-generated PptxGenJS code (primary path)
+        chart: optional {'df', 'chart_type', 'chart_title'} for an uploaded-data chart slide
+        progress: optional callback(stage, percent, message)
+        out_path: write the deck here instead of the artifact store (batch runs)
+        brand_accent: custom accent hex for the chart slide, as in the generated slides
+        session_id: session that gets the committed deck acquired (held until it picks the job up)
+
+    Returns:
+        (success, ppt_path_or_error)
+    """
+    store = get_store()
+    ppt_filename = deck_filename(topic)
+    # Render into scratch, then commit to the content-addressed store
+    ppt_path = store.scratch_path(suffix='.pptx')
+
+    # ── PRIMARY: PptxGenJS via Node.js ──
+    print(f"[GENERATE_PPT] js_code present: {bool(js_code)}, length: {len(js_code) if js_code else 0}")
+    if js_code:
+        if progress:
+            progress('render', 60, "Rendering PowerPoint file...")
+        chart_js = ''
+        if chart:
+            from chart_render import pptxgenjs_chart_code
+            chart_js = pptxgenjs_chart_code(chart['df'], chart.get('chart_type', 'bar'),
+                                            chart.get('chart_title') or "Data", theme, brand_accent)
+        success, result = run_pptxgenjs(js_code + chart_js, ppt_path)
+        print(f"[GENERATE_PPT] run_pptxgenjs result: success={success}, result={str(result)[:200]}")
+        if success:
+            if chart_js:
+                # The chart slide is appended after the generated ones; show it right after the title
+                move_chart_slide(ppt_path, position=1)
+            ppt_path = _commit_deck(store, ppt_path, ppt_filename, out_path, session_id)
+            print(f"[PPTXGENJS] Successfully generated: {ppt_path}")
+            return True, ppt_path
+        else:
+            store.discard(ppt_path)
+            print(f"[PPTXGENJS] Failed: {result}, falling back to python-pptx")
+
+    # ── FALLBACK: python-pptx ──
+    # Guard: if content is empty, nothing to render → fail gracefully
+    has_content = isinstance(content, list) and any(
+        slide.get('bullets') or slide.get('main_title') or slide.get('title', '').strip()
+        for slide in content if isinstance(slide, dict)
+    )
+    if not has_content:
+        print("[GENERATE_PPT] No slide content to render — AI generation failed.")
+        return False, "AI generation failed. Please try again."
+    if progress:
+        progress('fallback', 70, "Building slides with the built-in designer...")
+
+    from ai_ppt_generator import generate_beautiful_ppt
+
+    # Inject chart slide if Excel/CSV data is available (rendered as a native chart)
+    if isinstance(content, list) and chart:
+        chart_slide = {"slide_number": 2, "title": chart.get('chart_title') or "Data", "bullets": [], "chart": chart}
+        content = content[:1] + [chart_slide] + content[1:]
+
+    success = generate_beautiful_ppt(content, ppt_path, color_scheme=theme, use_ai=False, original_topic=topic, min_slides=6, max_slides=6, generate_ai_images=True)
+    if success and os.path.exists(ppt_path):
+        ppt_path = _commit_deck(store, ppt_path, ppt_filename, out_path, session_id)
+    else:
+        store.discard(ppt_path)
+    return success, ppt_path
+
+
+def generate_code(request):
+    """
+    LLM step only: PptxGenJS code for a deck request.
+
+    Returns:
+        (js_code_or_None, ai_source, error)
+    """
+    js_result = get_generator().generate_pptxgenjs_code(
+        topic=request.get('topic', ''),
+        theme=request.get('theme', 'modern'),
+        language=request.get('language', 'English'),
+        web_context=request.get('web_context', ''),
+        error_context=request.get('error_context', ''),
+        num_slides=request.get('num_slides', 10),
+        logo_data=request.get('logo_data'),
+        company_name=request.get('company_name', ''),
+        brand_accent=request.get('brand_accent', ''),
+    )
+    js_code = js_result.get('output') or None
+    if not js_code:
+        print(f"[PIPELINE] PptxGenJS generation failed: {js_result.get('error')}")
+    return js_code, js_result.get('ai_source'), js_result.get('error')
+
+
+def generate_deck(request, progress=None):
+    """
+    Full pipeline for one deck: AI → PptxGenJS code (unless already supplied) → render.
+
+    request keys: topic, theme, language, num_slides, web_context, error_context,
+    logo_data, company_name, brand_accent, js_code, ai_source (provider that wrote
+    js_code), slides, chart.
+
+    Returns:
+        dict: {'success', 'ppt_path', 'js_code', 'ai_source', 'error'}
+    """
+    def _report(stage, pct, message):
+        if progress:
+            progress(stage, pct, message)
+
+    topic = request.get('topic', '')
+    theme = request.get('theme', 'modern')
+    js_code = request.get('js_code')
+    # The provider comes back with this request's own result: the module-level
+    # "last source" is shared by every job running at the same time
+    ai_source = request.get('ai_source') if js_code else None
+
+    if not js_code:
+        _report('llm', 15, "AI generating slide content...")
+        js_code, ai_source, _error = generate_code(request)
+
+    _report('render', 50, "Building slide layout...")
+    success, result = build_deck(list(request.get('slides') or []), topic, theme,
+                                 js_code=js_code, chart=request.get('chart'), progress=progress,
+                                 brand_accent=request.get('brand_accent', ''),
+                                 session_id=request.get('session_id'))
+    _report('done', 100, "Done")
+    return {
+        'success': success,
+        'ppt_path': result if success else None,
+        'js_code': js_code,
+        'ai_source': ai_source,
+        'error': None if success else result,
+    }
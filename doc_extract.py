@@ -0,0 +1,556 @@
+"""
+Document Text Extraction
+Text (and per-page structure / tables) from uploaded documents, cached by the
+SHA-256 of the file bytes so a re-upload of the same file is not parsed again.
+
+PDFs are split into page ranges that a process pool extracts in parallel
+(PyPDF2 and pdfplumber are pure Python, so threads would not help); pages come
+back in document order. Each page is read with PyPDF2 first and only pages
+whose text fails a density probe (scanned, vector-outlined or oddly encoded
+pages) are re-read with pdfplumber, instead of re-parsing the whole document.
+
+Word and PowerPoint files are read straight from their ZIP parts with
+iterparse (word/document.xml, then each slide and its notes) instead of
+building the python-docx / python-pptx object model, so tables and speaker
+notes come through as well and memory does not grow with the document. Large
+decks are split across the same process pool by slide.
+
+Results are pickled under EXTRACT_CACHE_DIR, shared by every session and
+process on the host, and evicted least-recently-used beyond EXTRACT_CACHE_MB.
+
+    result = extract_document("report.pdf", data, progress=lambda done, total: ...)
+    result['text'], result['pages'], result['table'], result['error']
+"""
+
+import io
+import os
+import re
+import uuid
+import pickle
+import atexit
+import zipfile
+import hashlib
+import posixpath
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from artifact_store import get_store
+from lazy_imports import module_available
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+# Below this many pages the pool's start-up and IPC cost more than they save
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "20"))
+# Density probe: PyPDF2 output with fewer printable characters than this is retried with pdfplumber
+MIN_PAGE_CHARS = 20
+# PPTX slides use the same pool
+PPTX_SLIDES_PER_TASK = int(os.getenv("PPTX_SLIDES_PER_TASK", "10"))
+PPTX_PARALLEL_MIN_SLIDES = int(os.getenv("PPTX_PARALLEL_MIN_SLIDES", "40"))
+
+PDFPLUMBER_AVAILABLE = module_available("pdfplumber")
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXTRACT_CACHE_DIR = os.getenv("EXTRACT_CACHE_DIR", os.path.join(_PROJECT_DIR, "output", "extract_cache"))
+EXTRACT_CACHE_MB = float(os.getenv("EXTRACT_CACHE_MB", "512"))
+# Part of every cache key: bump when an extractor's output changes so old results are not served
+EXTRACT_VERSION = 3
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Process pool / PDF pages
+# ─────────────────────────────────────────────────────────────────────────────
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Process pool shared by all sessions for PDF and PPTX extraction ('spawn': the app process is multithreaded)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+                atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_dense(text):
+    return sum(1 for ch in text if ch.isprintable() and not ch.isspace()) >= MIN_PAGE_CHARS
+
+
+def extract_pdf_pages(source, start, stop, on_page=None):
+    """
+    Text of pages [start, stop) of a PDF (path or bytes).
+    Returns (start, [(text, engine), ...]); engine is 'pypdf2', 'pdfplumber' or None when a page failed.
+    Runs in pool workers (picklable arguments only there); on_page(pages_read) is for in-process use.
+    """
+    import PyPDF2
+
+    stream = source if isinstance(source, str) else io.BytesIO(source)
+    reader = PyPDF2.PdfReader(stream)
+    pages, sparse = [], []
+    for page_num in range(start, stop):
+        try:
+            text = reader.pages[page_num].extract_text() or ''
+            pages.append((text, 'pypdf2'))
+        except Exception as e:
+            print(f"[EXTRACT] PyPDF2 could not read page {page_num + 1}: {e}")
+            pages.append(('', None))
+        if not _is_dense(pages[-1][0]):
+            sparse.append(page_num)
+        if on_page:
+            on_page(len(pages))
+
+    if sparse and PDFPLUMBER_AVAILABLE:
+        import pdfplumber
+        stream = source if isinstance(source, str) else io.BytesIO(source)
+        try:
+            with pdfplumber.open(stream) as pdf:
+                for page_num in sparse:
+                    try:
+                        text = pdf.pages[page_num].extract_text() or ''
+                    except Exception as e:
+                        print(f"[EXTRACT] pdfplumber could not read page {page_num + 1}: {e}")
+                        continue
+                    if len(text.strip()) > len(pages[page_num - start][0].strip()):
+                        pages[page_num - start] = (text, 'pdfplumber')
+        except Exception as e:
+            print(f"[EXTRACT] pdfplumber could not open PDF: {e}")
+    return start, pages
+
+
+def _run_parallel(task, data, suffix, total, per_task, workers, progress=None):
+    """
+    task(path, start, stop) -> (start, items) over [0, total) in ranges on the process pool.
+    Workers read the document from a scratch file instead of each receiving a pickled copy.
+    Returns the items in order; raises if the pool fails (callers fall back to serial).
+    """
+    store = get_store()
+    path = store.scratch_path(suffix=suffix, prefix='extract_')
+    with open(path, 'wb') as f:
+        f.write(data)
+    try:
+        step = max(1, min(per_task, -(-total // workers)))
+        items = [None] * total
+        done = 0
+        pool = _get_pool()
+        futures = [pool.submit(task, path, start, min(start + step, total))
+                   for start in range(0, total, step)]
+        for future in as_completed(futures):
+            start, chunk = future.result()
+            items[start:start + len(chunk)] = chunk
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+        return items
+    finally:
+        store.discard(path)
+
+
+def extract_pdf(data, progress=None, workers=PDF_WORKERS):
+    """
+    Per-page text for a PDF given as bytes, in page order: [(text, engine), ...].
+    progress(pages_done, total_pages) is called from the calling thread as pages finish.
+    """
+    import PyPDF2
+
+    total = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+    if not total:
+        return []
+    if total < PDF_PARALLEL_MIN_PAGES or workers < 2:
+        return _extract_serial(data, total, progress)
+    try:
+        return _run_parallel(extract_pdf_pages, data, '.pdf', total, PDF_PAGES_PER_TASK, workers, progress)
+    except Exception as e:
+        # A worker died (OOM, killed) or the pool cannot start here: do it in-process
+        print(f"[EXTRACT] Parallel PDF extraction failed ({e}); extracting serially")
+        _reset_pool()
+        return _extract_serial(data, total, progress)
+
+
+def _extract_serial(data, total, progress):
+    on_page = (lambda done: progress(done, total)) if progress else None
+    return extract_pdf_pages(data, 0, total, on_page=on_page)[1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Word / PowerPoint: streamed from the ZIP's XML parts, no object model
+# ─────────────────────────────────────────────────────────────────────────────
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+_RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_HEADING_STYLE = re.compile(r'^(?:Heading\s*(\d)|Title)$', re.IGNORECASE)
+
+
+def _open_zip(source):
+    return zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source))
+
+
+def _docx_paragraph(p):
+    """Text of a w:p; heading styles become Markdown headings (chunking splits on them)."""
+    parts = []
+    for el in p.iter():
+        if el.tag == _W + 't':
+            parts.append(el.text or '')
+        elif el.tag == _W + 'tab':
+            parts.append('\t')
+        elif el.tag in (_W + 'br', _W + 'cr'):
+            parts.append('\n')
+    text = ''.join(parts)
+    style = p.find(f'{_W}pPr/{_W}pStyle')
+    heading = _HEADING_STYLE.match(style.get(_W + 'val', '')) if style is not None and text.strip() else None
+    if heading:
+        text = '#' * int(heading.group(1) or 1) + ' ' + text.strip()
+    return text
+
+
+def _table_rows(tbl, row_tag, cell_tag, paragraph_tag, paragraph_text):
+    """'cell | cell' per row of a Word or DrawingML table (nested tables are flattened into their cell)."""
+    rows = []
+    for tr in tbl.findall(row_tag):
+        cells = [' '.join(paragraph_text(p).strip() for p in tc.iter(paragraph_tag)).strip()
+                 for tc in tr.findall(cell_tag)]
+        if any(cells):
+            rows.append(' | '.join(cells))
+    return '\n'.join(rows)
+
+
+def iter_docx_blocks(source):
+    """
+    Body paragraphs and tables of a .docx (path or bytes) in document order, one string each.
+    word/document.xml is parsed incrementally and finished elements are dropped, so memory
+    stays flat however long the document is.
+    """
+    with _open_zip(source) as zf, zf.open('word/document.xml') as xml:
+        body, paragraph_depth, table_depth = None, 0, 0
+        for event, el in ET.iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                if el.tag == _W + 'body':
+                    body = el
+                elif el.tag == _W + 'p':
+                    paragraph_depth += 1
+                elif el.tag == _W + 'tbl':
+                    table_depth += 1
+                continue
+            if el.tag == _W + 'p':
+                paragraph_depth -= 1
+                if paragraph_depth or table_depth:
+                    continue  # text box or table cell paragraph: part of its container
+                yield _docx_paragraph(el)
+            elif el.tag == _W + 'tbl':
+                table_depth -= 1
+                if table_depth:
+                    continue
+                rows = _table_rows(el, _W + 'tr', _W + 'tc', _W + 'p', _docx_paragraph)
+                if rows:
+                    yield rows
+            else:
+                continue
+            if body is not None:
+                body.clear()  # everything in it so far has been emitted
+
+
+def _drawing_paragraph(p):
+    return ''.join((el.text or '') if el.tag == _A + 't' else '\n'
+                   for el in p.iter() if el.tag in (_A + 't', _A + 'br'))
+
+
+def _is_notes_body(sp):
+    ph = sp.find(f'{_P}nvSpPr/{_P}nvPr/{_P}ph')
+    return ph is not None and ph.get('type') == 'body'
+
+
+def _pptx_blocks(xml, notes=False):
+    """Text of each shape and table in a slide (or, with notes=True, the notes text) part."""
+    for _event, el in ET.iterparse(xml):
+        if el.tag == _P + 'sp':
+            body = el.find(_P + 'txBody')
+            if body is not None and (not notes or _is_notes_body(el)):
+                text = '\n'.join(_drawing_paragraph(p) for p in body.findall(_A + 'p')).strip()
+                if text:
+                    yield text
+            el.clear()
+        elif el.tag == _A + 'tbl' and not notes:
+            rows = _table_rows(el, _A + 'tr', _A + 'tc', _A + 'p', _drawing_paragraph)
+            if rows:
+                yield rows
+            el.clear()
+
+
+def _relationships(zf, part):
+    """{rId: (type, part name)} from the .rels file of `part`."""
+    folder, name = posixpath.split(part)
+    rels_name = posixpath.join(folder, '_rels', name + '.rels')
+    if rels_name not in zf.NameToInfo:
+        return {}
+    rels = {}
+    with zf.open(rels_name) as xml:
+        for _event, el in ET.iterparse(xml):
+            if el.tag == _RELATIONSHIP and el.get('TargetMode') != 'External':
+                target = el.get('Target', '')
+                target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+                rels[el.get('Id')] = (el.get('Type', ''), target)
+    return rels
+
+
+def _pptx_slide_parts(zf):
+    """Slide part names in presentation order (from presentation.xml, not file numbering)."""
+    rels = _relationships(zf, 'ppt/presentation.xml')
+    parts = []
+    with zf.open('ppt/presentation.xml') as xml:
+        for _event, el in ET.iterparse(xml):
+            if el.tag == _P + 'sldId':
+                rel = rels.get(el.get(_R_ID))
+                if rel and rel[1] in zf.NameToInfo:
+                    parts.append(rel[1])
+    return parts
+
+
+def _pptx_slide_text(zf, part):
+    """Shapes and tables of one slide, then its speaker notes as 'Notes: ...'."""
+    with zf.open(part) as xml:
+        blocks = list(_pptx_blocks(xml))
+    for rel_type, target in _relationships(zf, part).values():
+        if rel_type.endswith('/notesSlide') and target in zf.NameToInfo:
+            with zf.open(target) as xml:
+                notes = '\n'.join(_pptx_blocks(xml, notes=True))
+            if notes:
+                blocks.append(f"Notes: {notes}")
+    return '\n'.join(blocks)
+
+
+def iter_pptx_slides(source):
+    """Text of each slide of a .pptx (path or bytes), in order, one slide XML part at a time."""
+    with _open_zip(source) as zf:
+        for part in _pptx_slide_parts(zf):
+            yield _pptx_slide_text(zf, part)
+
+
+def extract_pptx_slides(source, start, stop):
+    """(start, [text of slides start..stop-1]); runs in pool workers like extract_pdf_pages."""
+    with _open_zip(source) as zf:
+        parts = _pptx_slide_parts(zf)[start:stop]
+        return start, [_pptx_slide_text(zf, part) for part in parts]
+
+
+def extract_pptx(data, progress=None, workers=PDF_WORKERS):
+    """Per-slide text of a .pptx given as bytes; large decks are split across the process pool."""
+    with _open_zip(data) as zf:
+        total = len(_pptx_slide_parts(zf))
+    if total >= PPTX_PARALLEL_MIN_SLIDES and workers >= 2:
+        try:
+            return _run_parallel(extract_pptx_slides, data, '.pptx', total, PPTX_SLIDES_PER_TASK, workers, progress)
+        except Exception as e:
+            print(f"[EXTRACT] Parallel PPTX extraction failed ({e}); extracting serially")
+            _reset_pool()
+    slides = []
+    for text in iter_pptx_slides(data):
+        slides.append(text)
+        if progress:
+            progress(len(slides), total)
+    return slides
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Extractors per file type: each returns a dict of 'text' / 'pages' / 'table'
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _extract_text_file(data, progress=None):
+    return {'text': data.decode('utf-8')}
+
+
+def _extract_pdf(data, progress=None):
+    pages = extract_pdf(data, progress=progress)
+    extracted = [f"--- Page {n} ---\n{text}" for n, (text, _engine) in enumerate(pages, 1) if text.strip()]
+    engines = {}
+    for _text, engine in pages:
+        engines[engine] = engines.get(engine, 0) + 1
+    content = '\n\n'.join(extracted)
+    print(f"[EXTRACT] PDF: {len(extracted)}/{len(pages)} pages with text, {len(content)} chars, engines {engines}")
+    return {'text': content, 'pages': [text for text, _engine in pages]}
+
+
+def _extract_docx(data, progress=None):
+    return {'text': '\n'.join(iter_docx_blocks(data))}
+
+
+def _extract_pptx(data, progress=None):
+    slides = extract_pptx(data, progress=progress)
+    slide_texts = [f"--- Slide {n} ---\n{text}" for n, text in enumerate(slides, 1) if text]
+    content = '\n\n'.join(slide_texts)
+    print(f"[EXTRACT] PPTX: {len(slide_texts)} slides, {len(content)} chars")
+    return {'text': content, 'pages': slides}
+
+
+def _extract_table(ext):
+    def _read(data, progress=None):
+        from table_ingest import ingest_table
+        return {'table': ingest_table(data, ext, progress=progress)}
+    return _read
+
+
+EXTRACTORS = {
+    'txt': _extract_text_file,
+    'pdf': _extract_pdf,
+    'docx': _extract_docx,
+    'ppt': _extract_pptx,
+    'pptx': _extract_pptx,
+    'csv': _extract_table('csv'),
+    'xlsx': _extract_table('xlsx'),
+    'xls': _extract_table('xls'),
+}
+
+
+def pdf_to_text(data, progress=None):
+    """Whole-document text with '--- Page N ---' headers for pages that have text."""
+    return _extract_pdf(data, progress)['text']
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ExtractCache:
+    """Extraction results pickled on disk, one file per key; least-recently-used files go first when over quota."""
+
+    def __init__(self, root=EXTRACT_CACHE_DIR, quota_mb=EXTRACT_CACHE_MB):
+        self.root = os.path.abspath(root)
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._used = None  # bytes on disk, measured on first put
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[EXTRACT] Dropping unreadable cache entry {key}: {e}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # LRU order is the file mtime, shared by every process
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.quota_bytes:
+            return
+        tmp = os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"[EXTRACT] Could not cache {key}: {e}")
+            self._remove(tmp)
+            return
+        with self._lock:
+            if self._used is None:
+                self._used = self._disk_usage()
+            else:
+                self._used += len(data)
+            if self._used > self.quota_bytes:
+                self._evict()
+
+    def _disk_usage(self):
+        total = 0
+        for entry in os.scandir(self.root):
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self):
+        """Remove least-recently-used entries until the cache is at 90% of its quota (lock held)."""
+        entries = []
+        for entry in os.scandir(self.root):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        used = sum(size for _, size, _ in entries)
+        target = self.quota_bytes * 0.9
+        removed = 0
+        for _mtime, size, path in entries:
+            if used <= target:
+                break
+            self._remove(path)
+            used -= size
+            removed += 1
+        self._used = used
+        print(f"[EXTRACT] Cache evicted {removed} entries, {used // 1024} KB in use")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ExtractCache:
+    """Process-wide extraction cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractCache()
+    return _cache
+
+
+def extract_document(file_name, data, progress=None):
+    """
+    Extract an uploaded file. Returns {'text', 'pages', 'table', 'cached', 'error'}:
+    pages is per-page (PDF) or per-slide (PPTX) text, table a table_ingest.TableData for CSV/Excel.
+    Unsupported types come back with error None and no text.
+    """
+    ext = file_name.lower().split('.')[-1]
+    result = {'text': '', 'pages': None, 'table': None, 'cached': False, 'error': None}
+    extractor = EXTRACTORS.get(ext)
+    if not extractor:
+        return result
+
+    key = f"{hashlib.sha256(data).hexdigest()}_{ext}_v{EXTRACT_VERSION}"
+    cache = get_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        print(f"[EXTRACT] Cache hit for {file_name}")
+        return dict(result, **cached, cached=True)
+
+    try:
+        extracted = extractor(data, progress)
+    except Exception as e:
+        print(f"[EXTRACT] {file_name}: {e}")
+        return dict(result, error=str(e))
+    cache.put(key, extracted)
+    return dict(result, **extracted)
@@ -0,0 +1,117 @@
+"""
+Document Passage Index
+In-process BM25 index over the passages of a session's uploaded files, built
+when files are added or removed. Prompts ask it for the passages that match
+what is being generated (the topic and title, or one slide and its edit
+instruction) and get the best ones packed up to a token budget, instead of
+whatever text happens to come first.
+
+    index = build_index([("report.pdf", text), ("notes.docx", text2)])
+    context = index.pack("solar capacity targets", budget_tokens=1500)
+
+Indexes are plain Python objects and pickle cleanly, so a session keeps one as
+a blob (see stages.common.rebuild_doc_index).
+"""
+
+import os
+import re
+import math
+from collections import Counter
+
+from doc_summarize import split_chunks, chunk_labels
+
+DOC_INDEX_CHUNK_CHARS = int(os.getenv("DOC_INDEX_CHUNK_CHARS", "1200"))
+DOC_CONTEXT_TOKENS = int(os.getenv("DOC_CONTEXT_TOKENS", "1500"))
+EDIT_CONTEXT_TOKENS = int(os.getenv("EDIT_CONTEXT_TOKENS", "400"))
+# Terms in the query used when a deck has no topic of its own (see ChunkIndex.top_terms)
+DOC_QUERY_TERMS = int(os.getenv("DOC_QUERY_TERMS", "20"))
+# Rough size of a token for budgeting; prompts elsewhere are sized in characters
+CHARS_PER_TOKEN = 4
+
+# Words, including Devanagari vowel signs (which \w alone would split words at)
+_TOKEN = re.compile(r'[\w\u0900-\u097F]+')
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+about into more than then there these those which who what when where how not no can also add make
+slide slides point points presentation
+""".split())
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class ChunkIndex:
+    """BM25 (Okapi) over a fixed list of passages; each passage is (source, label, text)."""
+
+    def __init__(self, passages, k1=1.5, b=0.75):
+        self.passages = list(passages)
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> [(passage index, term frequency)]
+        self.lengths = []
+        for i, (_source, _label, text) in enumerate(self.passages):
+            terms = tokenize(text)
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((i, tf))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def __len__(self):
+        return len(self.passages)
+
+    def search(self, query, k=None):
+        """[(score, passage index)] best first; passages sharing no term with query are left out."""
+        n = len(self.passages)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1))
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(((score, i) for i, score in scores.items()), key=lambda hit: (-hit[0], hit[1]))
+        return ranked[:k] if k else ranked
+
+    def top_terms(self, n=DOC_QUERY_TERMS):
+        """The n terms that best characterize the documents (total tf × idf), as a search query."""
+        total = len(self.passages)
+        weights = {
+            term: sum(tf for _i, tf in postings) * math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items() if not term.isdigit()
+        }
+        ranked = sorted(weights, key=lambda term: (-weights[term], term))
+        return ranked[:n]
+
+    def pack(self, query, budget_tokens=DOC_CONTEXT_TOKENS):
+        """
+        The highest-scoring passages that fit in budget_tokens, in document order,
+        each under a '[file · Pages 3-4]' header. '' if nothing matches.
+        """
+        chosen, used = [], 0
+        for _score, i in self.search(query):
+            source, label, text = self.passages[i]
+            header = f"[{source} · {label}]" if label else f"[{source}]"
+            cost = estimate_tokens(header) + estimate_tokens(text)
+            if used + cost > budget_tokens:
+                continue  # a shorter, lower-ranked passage may still fit
+            chosen.append((i, f"{header}\n{text}"))
+            used += cost
+        return '\n\n'.join(block for _i, block in sorted(chosen))
+
+
+def build_index(documents, chunk_chars=DOC_INDEX_CHUNK_CHARS):
+    """Index [(file name, extracted text)] split into passages of about chunk_chars."""
+    passages = []
+    for source, text in documents:
+        chunks = split_chunks(text or '', chunk_chars=chunk_chars, max_chunks=None)
+        passages.extend((source, label, chunk) for label, chunk in zip(chunk_labels(chunks), chunks))
+    index = ChunkIndex(passages)
+    print(f"[INDEX] {len(index)} passages from {len(documents)} files, {len(index.postings)} terms")
+    return index
@@ -0,0 +1,266 @@
+"""
+Document Summarization
+Map-reduce condensing of uploaded documents too large to send to the model in
+one prompt. The text is split on page / slide / heading boundaries into
+about SUMMARY_MAX_CHUNKS chunks, the chunks are summarized concurrently
+(SUMMARY_WORKERS threads, no more than SUMMARY_RPS requests per second across
+the whole process), and the summaries are joined in document order into the
+digest the slide outline is generated from. A digest that is still too long
+is summarized once more.
+
+Chunk summaries are cached on disk by the SHA-256 of the chunk, so
+regenerating from the same upload (or a document that shares sections with an
+earlier one) only pays for chunks it has not seen. The whole run is bounded by
+SUMMARY_BUDGET_SECONDS: chunks still pending then are represented by an
+excerpt of their text instead of a summary.
+
+    result = summarize_document(text, progress=lambda done, total: ...)
+    result['content'], result['chunks'], result['summarized'], result['cached']
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from doc_extract import ExtractCache
+from resources import get_generator, shared
+
+# Documents up to this many characters go to the model as they are
+SUMMARY_DIRECT_CHARS = int(os.getenv("SUMMARY_DIRECT_CHARS", "8000"))
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "6000"))
+# Larger documents get larger chunks rather than more requests
+SUMMARY_MAX_CHUNKS = int(os.getenv("SUMMARY_MAX_CHUNKS", "40"))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "4"))
+SUMMARY_RPS = float(os.getenv("SUMMARY_RPS", "2"))
+SUMMARY_BUDGET_SECONDS = float(os.getenv("SUMMARY_BUDGET_SECONDS", "60"))
+# The digest handed to the outline prompt is kept under this size
+SUMMARY_REDUCE_CHARS = int(os.getenv("SUMMARY_REDUCE_CHARS", "12000"))
+SUMMARY_WORDS = 150
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", os.path.join(_PROJECT_DIR, "output", "summary_cache"))
+SUMMARY_CACHE_MB = float(os.getenv("SUMMARY_CACHE_MB", "64"))
+# Part of every cache key: bump when the summary prompt changes
+SUMMARY_VERSION = 1
+
+# Lines a new section starts at: extractor page/slide headers, Markdown headings,
+# and the separator between uploaded files
+_SECTION_START = re.compile(r'^(?:--- (?:Page|Slide) \d+ ---|#{1,6} \S.*|---)\s*$', re.MULTILINE)
+_MARKER = re.compile(r'^--- (Page|Slide) (\d+) ---', re.MULTILINE)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chunking
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _sections(text):
+    starts = [m.start() for m in _SECTION_START.finditer(text)]
+    bounds = [0] + [s for s in starts if s > 0] + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:]) if text[a:b].strip()]
+
+
+def _split_oversized(section, limit):
+    """Pieces of at most `limit` chars, cut at paragraph, line, sentence or word boundaries if there are any."""
+    if len(section) <= limit:
+        return [section]
+    for sep in ('\n\n', '\n', '. ', ' '):
+        # Each part keeps its separator, so the pieces join back into the original text
+        parts = section.split(sep)
+        parts = [part for part in [p + sep for p in parts[:-1]] + parts[-1:] if part]
+        if len(parts) > 1:
+            pieces, current = [], ''
+            for part in parts:
+                candidate = current + part
+                if len(candidate) <= limit:
+                    current = candidate
+                    continue
+                if current:
+                    pieces.append(current)
+                current = part
+            if current:
+                pieces.append(current)
+            return [p for piece in pieces for p in _split_oversized(piece, limit)]
+    return [section[i:i + limit] for i in range(0, len(section), limit)]
+
+
+def chunk_labels(chunks):
+    """
+    'Pages 3-5' / 'Slide 2' per chunk from the extractor headers ('' where there are none).
+    A chunk that starts partway through a page counts from that page.
+    """
+    labels, carried = [], None
+    for chunk in chunks:
+        markers = _MARKER.findall(chunk)
+        if carried and not _MARKER.match(chunk):
+            markers.insert(0, carried)
+        if not markers:
+            labels.append('')
+            continue
+        carried = markers[-1]
+        kind, first, last = markers[0][0], markers[0][1], markers[-1][1]
+        labels.append(f"{kind}s {first}-{last}" if first != last else f"{kind} {first}")
+    return labels
+
+
+def split_chunks(text, chunk_chars=SUMMARY_CHUNK_CHARS, max_chunks=SUMMARY_MAX_CHUNKS):
+    """Consecutive sections packed into chunks of about chunk_chars (grown so there are about max_chunks, if given)."""
+    limit = max(chunk_chars, -(-len(text) // max_chunks)) if max_chunks else chunk_chars
+    chunks, current = [], ''
+    for section in _sections(text):
+        for piece in _split_oversized(section, limit):
+            if current and len(current) + len(piece) > limit:
+                chunks.append(current)
+                current = ''
+            current += piece
+    if current.strip():
+        chunks.append(current)
+    return [c.strip() for c in chunks]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Map / reduce
+# ─────────────────────────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart, across every thread that shares it."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """Wait for a slot. Returns False (without taking one) if it would come after deadline."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            if deadline is not None and slot > deadline:
+                return False
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return True
+
+
+def get_rate_limiter():
+    """Process-wide limiter for summary requests (every session draws on the same provider quota)."""
+    return shared("rate:summary", lambda: RateLimiter(SUMMARY_RPS))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ExtractCache:
+    """Process-wide chunk summary cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractCache(root=SUMMARY_CACHE_DIR, quota_mb=SUMMARY_CACHE_MB)
+    return _cache
+
+
+def _cache_key(chunk):
+    return hashlib.sha256(f"v{SUMMARY_VERSION}:{SUMMARY_WORDS}:{chunk}".encode('utf-8')).hexdigest()
+
+
+def _summarize_chunk(chunk, label, deadline):
+    """Summary of chunk, or None if the budget ran out or the request failed."""
+    if not get_rate_limiter().acquire(deadline):
+        return None
+    result = get_generator().summarize_section(chunk, label=label, max_words=SUMMARY_WORDS)
+    if result.get('error'):
+        print(f"[SUMMARY] {result['error']}")
+        return None
+    summary = result['output']
+    get_cache().put(_cache_key(chunk), summary)
+    return summary
+
+
+def _excerpt(chunk, chars):
+    """Stand-in for a chunk without a summary: its opening chars, without the page header."""
+    body = _MARKER.sub('', chunk).strip()
+    return body[:chars].rsplit(' ', 1)[0] if len(body) > chars else body
+
+
+def _map(chunks, labels, deadline, progress=None):
+    """Summaries for chunks in order, plus counts of cache hits and of live summaries."""
+    cache = get_cache()
+    summaries = [cache.get(_cache_key(chunk)) for chunk in chunks]
+    cached = sum(1 for s in summaries if s is not None)
+    done = cached
+    if progress:
+        progress(done, len(chunks))
+    todo = [i for i, s in enumerate(summaries) if s is None]
+    if not todo:
+        return summaries, cached, 0
+
+    pool = ThreadPoolExecutor(max_workers=max(1, SUMMARY_WORKERS), thread_name_prefix="summary")
+    try:
+        pending = {pool.submit(_summarize_chunk, chunks[i], labels[i], deadline): i for i in todo}
+        while pending:
+            finished, _ = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+            if not finished:
+                print(f"[SUMMARY] Time budget spent; {len(pending)} chunks fall back to excerpts")
+                break
+            for future in finished:
+                i = pending.pop(future)
+                try:
+                    summaries[i] = future.result()
+                except Exception as e:
+                    print(f"[SUMMARY] Chunk {i} failed: {e}")
+                done += 1
+                if progress:
+                    progress(done, len(chunks))
+    finally:
+        # Requests already sent finish in the background and still fill the cache
+        pool.shutdown(wait=False, cancel_futures=True)
+    live = sum(1 for i in todo if summaries[i] is not None)
+    return summaries, cached, live
+
+
+def _digest(chunks, labels, summaries):
+    excerpt_chars = max(200, SUMMARY_DIRECT_CHARS // max(len(chunks), 1))
+    parts = []
+    for chunk, label, summary in zip(chunks, labels, summaries):
+        body = summary if summary is not None else _excerpt(chunk, excerpt_chars)
+        parts.append(f"[{label}]\n{body}" if label else body)
+    return '\n\n'.join(parts)
+
+
+def summarize_document(text, progress=None, budget_seconds=SUMMARY_BUDGET_SECONDS):
+    """
+    Condense text for the outline prompt. Returns {'content', 'chunks', 'summarized',
+    'cached', 'seconds'}; text up to SUMMARY_DIRECT_CHARS comes back unchanged.
+    progress(done, total) is called as chunks finish.
+    """
+    started = time.monotonic()
+    result = {'content': text, 'chunks': 0, 'summarized': 0, 'cached': 0, 'seconds': 0.0}
+    if len(text) <= SUMMARY_DIRECT_CHARS:
+        return result
+    deadline = started + budget_seconds
+
+    chunks = split_chunks(text)
+    labels = chunk_labels(chunks)
+    summaries, cached, live = _map(chunks, labels, deadline, progress)
+    content = _digest(chunks, labels, summaries)
+    result.update(chunks=len(chunks), summarized=cached + live, cached=cached)
+
+    # Reduce: a digest that is still too long is summarized once more, as a whole
+    if len(content) > SUMMARY_REDUCE_CHARS and time.monotonic() < deadline:
+        chunks = split_chunks(content, max_chunks=max(1, SUMMARY_WORKERS))
+        labels = [''] * len(chunks)
+        summaries, _cached, _live = _map(chunks, labels, deadline)
+        content = _digest(chunks, labels, summaries)
+    if len(content) > SUMMARY_REDUCE_CHARS:
+        content = content[:SUMMARY_REDUCE_CHARS].rsplit('\n', 1)[0]
+
+    result.update(content=content, seconds=round(time.monotonic() - started, 2))
+    print(f"[SUMMARY] {len(text)} chars -> {len(content)} chars from {result['chunks']} chunks "
+          f"({result['summarized']} summarized, {result['cached']} cached) in {result['seconds']}s")
+    return result
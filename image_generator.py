@@ -6,16 +6,20 @@ Image Generator for PPT Slides
 Uses Unsplash API to fetch relevant images for slides
 """
 
-import requests
 import os
 from typing import Optional, List
 import json
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    PIL_AVAILABLE = True
-except:
-    PIL_AVAILABLE = False
+from artifact_store import get_store
+from lazy_imports import lazy_import, module_available
+from resources import http_session
+
+# Imported on first use: most decks never need a placeholder image
+requests = lazy_import("requests")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
+PIL_AVAILABLE = module_available("PIL")
 
 # Unsplash API Configuration
 UNSPLASH_API_KEY = "YOUR_UNSPLASH_ACCESS_KEY"  # Will be replaced with env variable
@@ -53,7 +57,7 @@ def search_image(query: str, per_page: int = 1, orientation: str = "landscape")
         }
         
         # Try with timeout
-        response = requests.get(UNSPLASH_API_URL, params=params, timeout=8)
+        response = http_session().get(UNSPLASH_API_URL, params=params, timeout=8)
         
         if response.status_code == 200:
             data = response.json()
@@ -65,7 +69,7 @@ def search_image(query: str, per_page: int = 1, orientation: str = "landscape")
                 # Try with more general query if no results
                 print(f"⚠️ No results for '{query_simple}', trying generic...")
                 params["query"] = "business"
-                response = requests.get(UNSPLASH_API_URL, params=params, timeout=8)
+                response = http_session().get(UNSPLASH_API_URL, params=params, timeout=8)
                 if response.status_code == 200:
                     data = response.json()
                     if data.get("results"):
@@ -95,7 +99,7 @@ def download_image(image_url: str, save_path: str) -> bool:
         # Try to download with retries
         for attempt in range(2):
             try:
-                response = requests.get(image_url, timeout=10, allow_redirects=True)
+                response = http_session().get(image_url, timeout=10, allow_redirects=True)
                 if response.status_code == 200:
                     with open(save_path, "wb") as f:
                         f.write(response.content)
@@ -120,13 +124,14 @@ def download_image(image_url: str, save_path: str) -> bool:
         print(f"❌ Error downloading image: {str(e)}")
         return False
 
-def get_slide_image(slide_title: str, slide_content: str = "", output_dir: str = "temp_images") -> Optional[str]:
+def get_slide_image(slide_title: str, slide_content: str = "", output_dir: Optional[str] = None) -> Optional[str]:
     """
     Get relevant image for a slide based on title and content
     Returns local path to downloaded image
     """
     try:
-        # Create temp directory if it doesn't exist
+        # Default to a scratch directory in the artifact store (cleaned up by its GC)
+        output_dir = output_dir or get_store().scratch_subdir(prefix='images_')
         os.makedirs(output_dir, exist_ok=True)
         
         # Construct search query from slide title and content
@@ -162,7 +167,7 @@ def get_slide_image(slide_title: str, slide_content: str = "", output_dir: str =
         print(f"Error getting slide image: {str(e)}")
         return None
 
-def get_images_for_slides(slide_data: List[dict], output_dir: str = "temp_images") -> dict:
+def get_images_for_slides(slide_data: List[dict], output_dir: Optional[str] = None) -> dict:
     """
     Get images for multiple slides
     Returns dictionary mapping slide index to image path
@@ -175,6 +180,7 @@ def get_images_for_slides(slide_data: List[dict], output_dir: str = "temp_images
     images = {}
     
     try:
+        output_dir = output_dir or get_store().scratch_subdir(prefix='images_')
         for idx, slide in enumerate(slide_data):
             title = slide.get("title", f"Slide {idx}")
             content = slide.get("content", "")
@@ -0,0 +1,129 @@
+"""
+Background Job Queue
+Runs long deck-generation work (LLM call + Node/python-pptx render) on a
+worker pool instead of the Streamlit script thread. Jobs live in process
+memory keyed by id, so a rerun or a reconnecting browser tab can pick up
+the same job and its result instead of starting over.
+
+Jobs run on named pools: 'gen' for interactive deck generation and 'bulk'
+for whole bulk runs, so a few long bulk uploads cannot take every slot that
+normal generation needs.
+"""
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+GEN_WORKERS = int(os.getenv("GEN_WORKERS", "4"))
+BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", "1"))
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+POOL_SIZES = {'gen': GEN_WORKERS, 'bulk': BULK_JOB_WORKERS}
+_executors = {name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}job")
+              for name, size in POOL_SIZES.items()}
+_jobs = {}
+_active = {}   # dedupe key -> job id of a queued/running job
+_lock = threading.Lock()
+
+ACTIVE_STATES = ('queued', 'running')
+
+
+def _purge(now):
+    """Drop finished jobs nobody has looked at for JOB_TTL_SECONDS."""
+    stale = [jid for jid, job in _jobs.items()
+             if job['status'] not in ACTIVE_STATES and now - job['updated'] > JOB_TTL_SECONDS]
+    for jid in stale:
+        del _jobs[jid]
+
+
+def _update(job_id, **fields):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+            job['updated'] = time.time()
+
+
+def _run(job_id, fn, args, kwargs):
+    def progress(stage, percent=None, message=None):
+        fields = {'stage': stage}
+        if percent is not None:
+            fields['progress'] = int(percent)
+        if message is not None:
+            fields['message'] = message
+        _update(job_id, **fields)
+
+    _update(job_id, status='running', stage='running', message=None, started=time.time())
+    try:
+        result = fn(*args, progress=progress, **kwargs)
+        _update(job_id, status='done', stage='done', progress=100, result=result, finished=time.time())
+    except Exception as e:
+        print(f"[JOBS] Job {job_id} failed: {e}")
+        _update(job_id, status='failed', error=str(e), finished=time.time())
+    finally:
+        with _lock:
+            key = _jobs.get(job_id, {}).get('dedupe_key')
+            if key and _active.get(key) == job_id:
+                del _active[key]
+
+
+def submit_job(fn, *args, dedupe_key=None, meta=None, pool='gen', **kwargs):
+    """
+    Queue fn(*args, progress=callback, **kwargs) on `pool` and return its job id.
+    If a job with the same dedupe_key is still queued or running, its id is
+    returned instead — a second click does not start a second generation.
+    meta is stored with the job so a reconnecting client can restore context.
+    """
+    executor = _executors[pool]
+    now = time.time()
+    with _lock:
+        _purge(now)
+        if dedupe_key and dedupe_key in _active:
+            return _active[dedupe_key]
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = {
+            'id': job_id,
+            'status': 'queued',
+            'stage': 'queued',
+            'progress': 0,
+            'message': "Waiting for a free worker...",
+            'result': None,
+            'error': None,
+            'dedupe_key': dedupe_key,
+            'pool': pool,
+            'meta': dict(meta or {}),
+            'created': now,
+            'updated': now,
+            'started': None,
+            'finished': None,
+        }
+        if dedupe_key:
+            _active[dedupe_key] = job_id
+    executor.submit(_run, job_id, fn, args, kwargs)
+    return job_id
+
+
+def get_job(job_id):
+    """Snapshot of a job, or None if unknown/expired."""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        job['updated'] = time.time()
+        return dict(job)
+
+
+def active_jobs(pool=None):
+    """Snapshots of the jobs waiting or running (on one pool, or all of them)."""
+    with _lock:
+        return [dict(job) for job in _jobs.values()
+                if job['status'] in ACTIVE_STATES and (pool is None or job['pool'] == pool)]
+
+
+def queue_depth(pool=None):
+    """Number of jobs waiting or running (on one pool, or all of them)."""
+    with _lock:
+        return sum(1 for job in _jobs.values()
+                   if job['status'] in ACTIVE_STATES and (pool is None or job['pool'] == pool))
@@ -0,0 +1,73 @@
+"""
+Lazy Imports
+Module proxies that import on first attribute access, so heavy libraries
+(pandas, matplotlib, PyPDF2, pdfplumber, python-docx, PIL, requests) stay
+out of cold start and out of workers that never touch them.
+
+    pd = lazy_import("pandas")
+    PANDAS_AVAILABLE = module_available("pandas")   # checked without importing
+    ...
+    df = pd.read_csv(path)                          # pandas is imported here
+"""
+
+import sys
+import types
+import importlib
+import importlib.util
+import threading
+
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module; the real import happens on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with _import_lock:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # Cache so later lookups skip __getattr__ entirely
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_lazy_module'] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """Return the module if it is already imported, otherwise a LazyModule proxy for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def module_available(name):
+    """True if `name` can be imported, without importing it."""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(name):
+    """True once the real module has been imported (for startup reports)."""
+    return name in sys.modules
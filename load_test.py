@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Concurrent Session Load Test
+Simulates N users driving the chat flow at the same time inside one server
+process, against mock_services (no API keys, no network):
+
+    idle → awaiting_theme → awaiting_slides → awaiting_logo → generating → preview
+
+Each simulated user is a streamlit.testing AppTest session, so sessions share
+exactly what real users share: the job queue, preview worker, artifact store,
+LibreOffice and the stats files.
+
+    python load_test.py --sessions 50 --ramp 10 --latency 1.5
+
+Reports throughput, per-step latency percentiles, error classes and resource
+use (RSS, CPU, threads, open files, child processes, artifact disk usage).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import Counter
+
+from mock_services import MockServices
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_chatbot.py")
+TOPICS = [
+    "Artificial Intelligence in Healthcare", "Climate Change and Agriculture", "Digital India Mission",
+    "Startup Ecosystem in India", "Renewable Energy Transition", "Cybersecurity for Small Business",
+    "Financial Literacy for Students", "Electric Vehicles Adoption", "Space Exploration Programs",
+]
+THEMES = ['1', '2', '3', '4', '5', '6', '7']
+SLIDE_CHOICES = ['5', '8', '10']
+STEPS = ('load', 'topic', 'theme', 'slides', 'logo', 'generate', 'end_to_end')
+
+
+class SessionResult:
+    def __init__(self, index):
+        self.index = index
+        self.timings = {}
+        self.ok = False
+        self.error_class = None
+        self.error = None
+
+
+def _stage(at):
+    try:
+        return at.session_state['stage']
+    except Exception:
+        return None
+
+
+def _check(at, step):
+    """Raise if the script run produced an exception element."""
+    if len(at.exception):
+        raise RuntimeError(f"{step}: {at.exception[0].value}")
+
+
+def run_session(index, args):
+    """One simulated user: type a topic, pick theme/slides, skip logo, wait for the preview."""
+    from streamlit.testing.v1 import AppTest
+
+    result = SessionResult(index)
+    started = time.perf_counter()
+    step = 'load'
+    try:
+        at = AppTest.from_file(APP_FILE, default_timeout=args.step_timeout)
+        t = time.perf_counter()
+        at.run()
+        _check(at, step)
+        result.timings['load'] = time.perf_counter() - t
+
+        inputs = [
+            ('topic', random.choice(TOPICS), 'awaiting_theme'),
+            ('theme', random.choice(THEMES), 'awaiting_slides'),
+            ('slides', args.slides or random.choice(SLIDE_CHOICES), 'awaiting_logo'),
+            ('logo', 'skip', 'generating'),
+        ]
+        for step, text, expected in inputs:
+            time.sleep(random.uniform(0, args.think_time))
+            t = time.perf_counter()
+            at.chat_input(key="main_chat_input").set_value(text).run()
+            _check(at, step)
+            result.timings[step] = time.perf_counter() - t
+            stage = _stage(at)
+            # 'generating' may already have finished within the same run
+            if stage != expected and not (expected == 'generating' and stage == 'preview'):
+                raise AssertionError(f"{step}: expected stage {expected}, got {stage}")
+
+        step = 'generate'
+        t = time.perf_counter()
+        deadline = t + args.generate_timeout
+        while _stage(at) in ('generating', 'regenerating'):
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"generate: no preview after {args.generate_timeout}s")
+            time.sleep(args.poll)
+            at.run()
+            _check(at, step)
+        result.timings['generate'] = time.perf_counter() - t
+        if _stage(at) != 'preview':
+            raise AssertionError(f"generate: ended in stage {_stage(at)}")
+        result.ok = True
+    except Exception as e:
+        result.error_class = f"{step}:{type(e).__name__}"
+        result.error = str(e)[:300]
+    result.timings['end_to_end'] = time.perf_counter() - started
+    return result
+
+
+class ResourceSampler:
+    """Samples process resources while the test runs."""
+
+    def __init__(self, artifact_dir, interval=1.0):
+        self.artifact_dir = artifact_dir
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _rss_mb():
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return 0.0
+
+    @staticmethod
+    def _count(path):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            return 0
+
+    def _children(self):
+        pid = str(os.getpid())
+        count = 0
+        for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    if f.read().split(') ', 1)[1].split()[1] == pid:
+                        count += 1
+            except (OSError, IndexError):
+                continue
+        return count
+
+    def _disk_mb(self):
+        total = 0
+        for dirpath, _dirs, files in os.walk(self.artifact_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total / 1048576
+
+    def _run(self):
+        from job_queue import queue_depth
+        last_cpu, last_wall = time.process_time(), time.perf_counter()
+        while not self._stop.wait(self.interval):
+            cpu, wall = time.process_time(), time.perf_counter()
+            self.samples.append({
+                'rss_mb': self._rss_mb(),
+                'cpu_pct': 100 * (cpu - last_cpu) / max(wall - last_wall, 1e-6),
+                'threads': threading.active_count(),
+                'open_files': self._count('/proc/self/fd'),
+                'children': self._children(),
+                'artifact_mb': self._disk_mb(),
+                'jobs_pending': queue_depth(),
+            })
+            last_cpu, last_wall = cpu, wall
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self):
+        if not self.samples:
+            return {}
+        keys = self.samples[0].keys()
+        return {k: {'peak': round(max(s[k] for s in self.samples), 1),
+                    'mean': round(sum(s[k] for s in self.samples) / len(self.samples), 1)} for k in keys}
+
+
+def report(results, wall, resources):
+    from tracing import percentile
+
+    ok = [r for r in results if r.ok]
+    out = {
+        'sessions': len(results),
+        'ok': len(ok),
+        'failed': len(results) - len(ok),
+        'wall_s': round(wall, 1),
+        'decks_per_minute': round(len(ok) / wall * 60, 2) if wall else 0,
+        'latency_s': {},
+        'errors': dict(Counter(r.error_class for r in results if not r.ok)),
+        'error_samples': {},
+        'resources': resources,
+    }
+    for step in STEPS:
+        values = sorted(r.timings[step] for r in results if step in r.timings)
+        if values:
+            out['latency_s'][step] = {
+                'n': len(values),
+                'p50': round(percentile(values, 50), 2),
+                'p95': round(percentile(values, 95), 2),
+                'p99': round(percentile(values, 99), 2),
+                'max': round(values[-1], 2),
+            }
+    for r in results:
+        if not r.ok and r.error_class not in out['error_samples']:
+            out['error_samples'][r.error_class] = r.error
+    return out
+
+
+def print_report(out):
+    print(f"\n[LOAD] {out['sessions']} sessions in {out['wall_s']}s: {out['ok']} ok, {out['failed']} failed, "
+          f"{out['decks_per_minute']} decks/min")
+    print(f"\n{'step':<12} {'n':>5} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8}")
+    for step, v in out['latency_s'].items():
+        print(f"{step:<12} {v['n']:>5} {v['p50']:>8.2f} {v['p95']:>8.2f} {v['p99']:>8.2f} {v['max']:>8.2f}")
+    if out['errors']:
+        print("\nErrors:")
+        for cls, count in sorted(out['errors'].items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>4} × {cls}: {out['error_samples'].get(cls, '')[:150]}")
+    if out['resources']:
+        print("\nResources (peak / mean):")
+        for key, v in out['resources'].items():
+            print(f"  {key:<14} {v['peak']:>10} / {v['mean']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive N concurrent chat sessions against stand-in services.")
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--ramp', type=float, default=10.0, help="seconds over which sessions start")
+    parser.add_argument('--latency', type=float, default=1.0, help="mock LLM/image/search latency (s)")
+    parser.add_argument('--jitter', type=float, default=0.5, help="extra random mock latency (s)")
+    parser.add_argument('--think-time', type=float, default=1.0, help="max pause between user inputs (s)")
+    parser.add_argument('--slides', help="fixed slide count (default: random 5/8/10)")
+    parser.add_argument('--step-timeout', type=float, default=60.0, help="timeout for one script run (s)")
+    parser.add_argument('--generate-timeout', type=float, default=300.0, help="max wait for the preview (s)")
+    parser.add_argument('--poll', type=float, default=1.0, help="rerun interval while generating (s)")
+    parser.add_argument('--json', help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='loadtest_')
+    with MockServices(latency=args.latency, jitter=args.jitter) as mock:
+        # Set before the app (and the modules it imports) is first loaded
+        os.environ.update(mock.env())
+        # Everything the app writes goes to the workdir, not the repo's real stats and caches
+        for name, path in (('ARTIFACT_DIR', 'artifacts'), ('TRACE_FILE', 'traces.jsonl'),
+                           ('STATS_DB', 'stats.db'), ('EXTRACT_CACHE_DIR', 'extract_cache'),
+                           ('SUMMARY_CACHE_DIR', 'summary_cache'), ('BULK_DIR', 'bulk')):
+            os.environ.setdefault(name, os.path.join(workdir, path))
+        sampler = ResourceSampler(os.environ['ARTIFACT_DIR'])
+        sampler.start()
+
+        results = [None] * args.sessions
+        threads = []
+        started = time.perf_counter()
+        for i in range(args.sessions):
+            def _target(i=i):
+                results[i] = run_session(i, args)
+            thread = threading.Thread(target=_target, name=f"session-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+            if args.sessions > 1:
+                time.sleep(args.ramp / args.sessions)
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        sampler.stop()
+        print(f"[LOAD] Mock calls: {mock.calls}")
+
+    out = report(results, wall, sampler.summary())
+    out['config'] = vars(args)
+    print_report(out)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(out, f, indent=2)
+    return 0 if not out['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local Stand-in Services
+One stdlib HTTP server that imitates the external APIs the pipeline calls,
+so benchmarks, load tests and the HTTP API can run offline:
+
+    POST */chat/completions     Mistral/Groq style completion (PptxGenJS code or slide text)
+    GET  /prompt/...            Pollinations-style generated image
+    GET  /<w>/<h>[/<keywords>]  LoremFlickr / Picsum style photo
+    GET  /customsearch/v1       Google Custom Search results
+
+Responses are synthesized (sized by the requested slide count) unless a
+recordings directory provides chat_completions.json / customsearch.json to
+replay. Every response waits `latency` seconds first.
+
+    python mock_services.py --port 8700 --latency 0.5
+
+env_for(url) returns the environment variables that point the app at it.
+"""
+
+import io
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_SLIDES = 10
+BG_COLORS = ["1A1A2E", "16213E", "0F3460", "1B262C", "222831"]
+
+
+def fake_pptxgenjs_code(num_slides, topic="Benchmark Topic"):
+    """PptxGenJS code in the shape the real prompt asks for (title, content slides, thank-you)."""
+    lines = []
+    for n in range(1, num_slides + 1):
+        bg = BG_COLORS[n % len(BG_COLORS)]
+        lines.append(f'let slide{n} = pptx.addSlide();')
+        lines.append(f'slide{n}.background = {{ color: "{bg}" }};')
+        if n == 1:
+            lines.append(f'slide{n}.addText("{topic}", {{x:0.5,y:2.5,w:12.3,h:1.5,fontSize:44,bold:true,'
+                         f'color:"FFFFFF",fontFace:"Calibri",align:"center"}});')
+        elif n == num_slides:
+            lines.append(f'slide{n}.addText("Thank You", {{x:0.5,y:1.5,w:12.3,h:1.5,fontSize:48,bold:true,'
+                         f'color:"FFFFFF",fontFace:"Calibri",align:"center"}});')
+        else:
+            lines.append(f'slide{n}.addShape(pptx.ShapeType.rect, {{x:0,y:0,w:13.33,h:0.1,fill:{{color:"F5A623"}}}});')
+            lines.append(f'slide{n}.addText("Section {n - 1}: Key Point", {{x:0.5,y:0.4,w:12.3,h:0.9,fontSize:30,'
+                         f'bold:true,color:"FFFFFF",fontFace:"Calibri"}});')
+            bullets = ", ".join(
+                f'{{text:"Point {b}: a complete sentence about section {n - 1}.",options:{{bullet:true}}}}'
+                for b in range(1, 5)
+            )
+            lines.append(f'slide{n}.addText([{bullets}], {{x:0.7,y:1.6,w:11.8,h:4.8,fontSize:20,'
+                         f'color:"E0E0E0",fontFace:"Calibri",valign:"top"}});')
+    return "\n".join(lines)
+
+
+def fake_slide_text(num_slides):
+    """'Slide N: Title' + bullet text, as generate_ppt_content() expects."""
+    out = []
+    for n in range(1, num_slides + 1):
+        out.append(f"Slide {n}: Key Point {n}")
+        out.extend(f"- Point {b}: a complete sentence about topic {n}." for b in range(1, 5))
+        out.append("")
+    return "\n".join(out)
+
+
+def fake_image(width=800, height=500):
+    """JPEG large enough to pass the pipeline's size checks (noise does not compress)."""
+    try:
+        from PIL import Image
+        img = Image.frombytes('RGB', (width, height), os.urandom(width * height * 3))
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality=60)
+        return buf.getvalue()
+    except Exception:
+        return b''
+
+
+class MockServices:
+    """Threaded stand-in server. Use as a context manager or call start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, recordings_dir=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.recordings = {}
+        if recordings_dir:
+            for name in ('chat_completions', 'customsearch'):
+                path = os.path.join(recordings_dir, f"{name}.json")
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.recordings[name] = f.read().encode('utf-8')
+        self.calls = {'chat': 0, 'image': 0, 'search': 0}
+        self._image_cache = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment that routes every external call of the app to this server."""
+        return env_for(self.url)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _wait(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _count(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+
+    def _image(self, width, height):
+        key = (width, height)
+        if key not in self._image_cache:
+            self._image_cache[key] = fake_image(width, height)
+        return self._image_cache[key]
+
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                pass
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                services._wait()
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    return self._send(404, b'{}', 'application/json')
+                services._count('chat')
+                if 'chat_completions' in services.recordings:
+                    return self._send(200, services.recordings['chat_completions'], 'application/json')
+                text = " ".join(str(m.get('content', '')) for m in payload.get('messages', []))
+                match = re.search(r'(\d+)-slide presentation', text) or re.search(r'(\d+)\s+slides', text)
+                slides = int(match.group(1)) if match else DEFAULT_SLIDES
+                if 'PptxGenJS' in text:
+                    content = fake_pptxgenjs_code(slides)
+                else:
+                    content = fake_slide_text(slides)
+                body = json.dumps({
+                    'id': 'mock', 'object': 'chat.completion', 'model': payload.get('model', 'mock'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': content}}],
+                    'usage': {'prompt_tokens': len(text) // 4, 'completion_tokens': len(content) // 4,
+                              'total_tokens': (len(text) + len(content)) // 4},
+                }).encode('utf-8')
+                self._send(200, body, 'application/json')
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                services._wait()
+                if path.startswith('/customsearch'):
+                    services._count('search')
+                    body = services.recordings.get('customsearch') or json.dumps({'items': [
+                        {'title': f'Result {i}', 'link': f'https://en.wikipedia.org/wiki/Result_{i}',
+                         'snippet': f'Background fact number {i} about the topic.'}
+                        for i in range(1, 6)
+                    ]}).encode('utf-8')
+                    return self._send(200, body, 'application/json')
+                sizes = re.match(r'^/(\d+)/(\d+)', path)
+                if path.startswith('/prompt/') or sizes:
+                    services._count('image')
+                    width, height = (int(sizes.group(1)), int(sizes.group(2))) if sizes else (800, 500)
+                    return self._send(200, services._image(min(width, 2000), min(height, 2000)), 'image/jpeg')
+                self._send(404, b'', 'text/plain')
+
+        return Handler
+
+
+def env_for(url):
+    """Environment variables that point the pipeline's external calls at `url`."""
+    return {
+        'MISTRAL_API_URL': f"{url}/v1/chat/completions",
+        'GROQ_API_URL': f"{url}/openai/v1/chat/completions",
+        'MISTRAL_API_KEY': 'mock',
+        'GROQ_API_KEY': 'mock',
+        'POLLINATIONS_URL': url,
+        'LOREMFLICKR_URL': url,
+        'PICSUM_URL': url,
+        'GOOGLE_SEARCH_URL': f"{url}/customsearch/v1",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve stand-ins for the LLM, image and search APIs.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument('--recordings', help="directory with chat_completions.json / customsearch.json to replay")
+    args = parser.parse_args()
+
+    mock = MockServices(args.host, args.port, args.latency, args.jitter, args.recordings)
+    print(f"[MOCK] Serving on {mock.url}. Point the app at it with:")
+    for key, value in mock.env().items():
+        print(f"  export {key}={value}")
+    try:
+        mock._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -27,9 +27,15 @@
 # ═══════════════════════════════════════════════════════════════════════════════
 
 import os
+import re
 import json
+import functools
+from types import MappingProxyType
 from typing import Dict, Optional
 
+from tracing import span
+from resources import http_session
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🌍 GLOBAL VARIABLES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -37,6 +43,17 @@ from typing import Dict, Optional
 # Track which AI provider was used for the last generation
 _last_ai_source = "Unknown"
 
+# Default chat-completions endpoints; MISTRAL_API_URL / GROQ_API_URL secrets override
+# them (e.g. to point at a proxy or a local stand-in server)
+MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Markdown fences the model sometimes wraps generated JavaScript in
+_CODE_FENCE_START = re.compile(r'^```(?:javascript|js)?\s*\n?')
+_CODE_FENCE_END = re.compile(r'\n?```\s*$')
+
+_dotenv_loaded = False
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔧 UTILITY FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -60,10 +77,23 @@ def get_secret(key: str) -> Optional[str]:
             return str(st.secrets[key])
     except Exception:
         pass
-    from dotenv import load_dotenv
-    load_dotenv()
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        # .env is read once per process, not on every lookup
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
     return os.getenv(key)
 
+def _usage_attrs(result: Dict) -> Dict:
+    """Token counts from a chat-completions response, for tracing."""
+    usage = result.get("usage") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+    }
+
 def get_ollama_url():
     """Get Ollama URL - can be local or remote (ngrok/public)"""
     # Check for custom Ollama URL (for remote access via ngrok etc.)
@@ -216,8 +246,7 @@ TOPIC: {topic}
         mistral_api_key = get_secret("MISTRAL_API_KEY")
         if mistral_api_key:
             try:
-                import requests
-                mistral_url = "https://api.mistral.ai/v1/chat/completions"
+                mistral_url = get_secret("MISTRAL_API_URL") or MISTRAL_API_URL
                 headers = {
                     "Authorization": f"Bearer {mistral_api_key}",
                     "Content-Type": "application/json"
@@ -231,10 +260,13 @@ TOPIC: {topic}
                     "max_tokens": 8000,
                     "temperature": 0.7
                 }
-                resp = requests.post(mistral_url, headers=headers, json=data, timeout=60)
-                resp.raise_for_status()
-                result = resp.json()
-                ai_output = result["choices"][0]["message"]["content"]
+                with span("llm", provider="Mistral", model=data["model"], call="content") as s:
+                    resp = http_session().post(mistral_url, headers=headers, json=data, timeout=60)
+                    s.set(status_code=resp.status_code)
+                    resp.raise_for_status()
+                    result = resp.json()
+                    s.set(**_usage_attrs(result))
+                    ai_output = result["choices"][0]["message"]["content"]
                 global _last_ai_source
                 _last_ai_source = "Mistral"
                 return {"output": ai_output}
@@ -242,6 +274,57 @@ TOPIC: {topic}
                 return {"error": f"Mistral AI generation failed: {str(e)}"}
         return {"error": "No valid Mistral API key found. Please set MISTRAL_API_KEY."}
 
+    # ───────────────────────────────────────────────────────────────────────────
+    # 📝 DOCUMENT SECTION SUMMARY (map step for large uploads, see doc_summarize.py)
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def summarize_section(self, text: str, label: str = "", max_words: int = 150) -> Dict:
+        """
+        Condense one section of an uploaded document into presentation-ready notes.
+
+        Returns {'output': summary} or {'error': message}.
+        """
+        section = f" ({label})" if label else ""
+        prompt = f"""Summarize this section{section} of a document for someone building a presentation from it.
+
+RULES:
+- At most {max_words} words, as short bullet points
+- Keep every key fact, figure, name, date and conclusion
+- Skip boilerplate (headers, footers, tables of contents, references)
+- Write in the same language as the section
+- Output only the bullet points
+
+SECTION:
+{text}"""
+
+        mistral_api_key = get_secret("MISTRAL_API_KEY")
+        if not mistral_api_key:
+            return {"error": "No valid Mistral API key found. Please set MISTRAL_API_KEY."}
+        try:
+            mistral_url = get_secret("MISTRAL_API_URL") or MISTRAL_API_URL
+            headers = {
+                "Authorization": f"Bearer {mistral_api_key}",
+                "Content-Type": "application/json"
+            }
+            data = {
+                "model": "mistral-large-latest",
+                "messages": [
+                    {"role": "system", "content": "You are an expert analyst. Summarize documents faithfully and concisely."},
+                    {"role": "user", "content": prompt}
+                ],
+                "max_tokens": max_words * 3,
+                "temperature": 0.2
+            }
+            with span("llm", provider="Mistral", model=data["model"], call="summary") as s:
+                resp = http_session().post(mistral_url, headers=headers, json=data, timeout=45)
+                s.set(status_code=resp.status_code)
+                resp.raise_for_status()
+                result = resp.json()
+                s.set(**_usage_attrs(result))
+                return {"output": result["choices"][0]["message"]["content"].strip()}
+        except Exception as e:
+            return {"error": f"Mistral summary failed: {str(e)}"}
+
     # ───────────────────────────────────────────────────────────────────────────
     # 🎯 AI-POWERED AUTOMATIC TITLE GENERATION
     # ───────────────────────────────────────────────────────────────────────────
@@ -328,8 +411,7 @@ IMPORTANT RULES:
         mistral_api_key = get_secret("MISTRAL_API_KEY")
         if mistral_api_key:
             try:
-                import requests
-                mistral_url = "https://api.mistral.ai/v1/chat/completions"
+                mistral_url = get_secret("MISTRAL_API_URL") or MISTRAL_API_URL
                 headers = {
                     "Authorization": f"Bearer {mistral_api_key}",
                     "Content-Type": "application/json"
@@ -343,10 +425,13 @@ IMPORTANT RULES:
                     "max_tokens": 500,
                     "temperature": 0.8  # Higher temperature for more creative titles
                 }
-                resp = requests.post(mistral_url, headers=headers, json=data, timeout=30)
-                resp.raise_for_status()
-                result = resp.json()
-                ai_output = result["choices"][0]["message"]["content"].strip()
+                with span("llm", provider="Mistral", model=data["model"], call="title") as s:
+                    resp = http_session().post(mistral_url, headers=headers, json=data, timeout=30)
+                    s.set(status_code=resp.status_code)
+                    resp.raise_for_status()
+                    result = resp.json()
+                    s.set(**_usage_attrs(result))
+                    ai_output = result["choices"][0]["message"]["content"].strip()
 
                 _last_ai_source = "Mistral"
 
@@ -456,8 +541,7 @@ IMPORTANT RULES:
         """Generate PptxGenJS JavaScript code for a presentation."""
         global _last_ai_source
 
-        colors = self.THEME_COLORS.get(theme, self.THEME_COLORS["dark"])
-        color_block = "\n".join(f"  {k}: \"{v}\"" for k, v in colors.items())
+        colors = theme_palette(theme, brand_accent)
 
         web_section = ""
         if web_context:
@@ -471,11 +555,6 @@ IMPORTANT RULES:
         if logo_data:
             logo_section = f'\nLOGO: Add logo to top-right of every slide (including title and thank you) using:\nslide.addImage({{data: "{logo_data}", x: 11.8, y: 0.2, w: 1.3, h: 0.5}});\n'
 
-        # Override accent color if custom brand color provided
-        if brand_accent and len(brand_accent) == 6:
-            accent = brand_accent
-            teal   = brand_accent  # use same brand color for teal too
-
         company_section = ""
         if company_name:
             company_section = f'\nBRANDING: Add company name "{company_name}" as a small footer on every slide (bottom-left) using:\nslide.addText("{company_name}",{{x:0.3,y:7.1,w:4,h:0.3,fontSize:8,color:"{colors["MUTED"]}",fontFace:"Calibri",align:"left"}});\n'
@@ -580,13 +659,11 @@ Example: slide1.addNotes("Welcome everyone. Today we will explore {topic} in det
 {logo_section}{company_section}{error_section}
 Output ONLY JavaScript code. No markdown, no backticks, no explanations."""
 
-        import requests, re as _re
-
         system_msg = "You are a PptxGenJS code generator. Output ONLY valid JavaScript code that adds slides to a pptx object. No markdown, no explanations, no backticks."
 
         def _clean_output(text):
-            text = _re.sub(r'^```(?:javascript|js)?\s*\n?', '', text)
-            text = _re.sub(r'\n?```\s*$', '', text)
+            text = _CODE_FENCE_START.sub('', text)
+            text = _CODE_FENCE_END.sub('', text)
             return text.strip()
 
         def _is_truncated(text):
@@ -596,14 +673,14 @@ Output ONLY JavaScript code. No markdown, no backticks, no explanations."""
         apis = [
             {
                 "name": "Mistral",
-                "url": "https://api.mistral.ai/v1/chat/completions",
+                "url": get_secret("MISTRAL_API_URL") or MISTRAL_API_URL,
                 "key": get_secret("MISTRAL_API_KEY"),
                 "model": "mistral-small-latest",
                 "max_tokens": 16000,
             },
             {
                 "name": "Groq",
-                "url": "https://api.groq.com/openai/v1/chat/completions",
+                "url": get_secret("GROQ_API_URL") or GROQ_API_URL,
                 "key": get_secret("GROQ_API_KEY"),
                 "model": "llama-3.3-70b-versatile",
                 "max_tokens": 16000,
@@ -615,23 +692,28 @@ Output ONLY JavaScript code. No markdown, no backticks, no explanations."""
             if not api["key"]:
                 continue
             try:
-                resp = requests.post(
-                    api["url"],
-                    headers={"Authorization": f"Bearer {api['key']}", "Content-Type": "application/json"},
-                    json={
-                        "model": api["model"],
-                        "messages": [
-                            {"role": "system", "content": system_msg},
-                            {"role": "user", "content": prompt},
-                        ],
-                        "max_tokens": api["max_tokens"],
-                        "temperature": 0.3,
-                    },
-                    timeout=90,
-                )
-                resp.raise_for_status()
-                ai_output = resp.json()["choices"][0]["message"]["content"].strip()
-                ai_output = _clean_output(ai_output)
+                with span("llm", provider=api["name"], model=api["model"], call="pptxgenjs") as s:
+                    resp = http_session().post(
+                        api["url"],
+                        headers={"Authorization": f"Bearer {api['key']}", "Content-Type": "application/json"},
+                        json={
+                            "model": api["model"],
+                            "messages": [
+                                {"role": "system", "content": system_msg},
+                                {"role": "user", "content": prompt},
+                            ],
+                            "max_tokens": api["max_tokens"],
+                            "temperature": 0.3,
+                        },
+                        timeout=90,
+                    )
+                    s.set(status_code=resp.status_code)
+                    resp.raise_for_status()
+                    result = resp.json()
+                    s.set(**_usage_attrs(result))
+                    ai_output = result["choices"][0]["message"]["content"].strip()
+                    ai_output = _clean_output(ai_output)
+                    s.set(truncated=bool(ai_output) and _is_truncated(ai_output), output_chars=len(ai_output))
                 if not ai_output:
                     last_error = f"{api['name']}: empty response"
                     continue
@@ -645,3 +727,14 @@ Output ONLY JavaScript code. No markdown, no backticks, no explanations."""
                 continue
 
         return {"error": f"PptxGenJS generation failed: {last_error}"}
+
+
+@functools.lru_cache(maxsize=64)
+def theme_palette(theme: str, brand_accent: str = "") -> MappingProxyType:
+    """Read-only color map for a theme, with the brand color (if any) as accent; built once per pair."""
+    colors = dict(MultiAIGenerator.THEME_COLORS.get(theme, MultiAIGenerator.THEME_COLORS["dark"]))
+    # Override accent color if custom brand color provided
+    if brand_accent and len(brand_accent) == 6:
+        colors["ACCENT"] = brand_accent
+        colors["TEAL"] = brand_accent  # use same brand color for teal too
+    return MappingProxyType(colors)
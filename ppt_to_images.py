@@ -10,6 +10,9 @@ import os
 import sys
 from pathlib import Path
 
+from tracing import span
+from resources import get_font
+
 def ppt_to_images_fallback(ppt_file, output_dir="output/slides"):
     """
     Create simple preview images using python-pptx and PIL
@@ -18,7 +21,7 @@ def ppt_to_images_fallback(ppt_file, output_dir="output/slides"):
     try:
         from pptx import Presentation
         from pptx.util import Inches, Pt
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import Image, ImageDraw
 
         print("[PPT] Using python-pptx fallback for preview...")
 
@@ -31,17 +34,9 @@ def ppt_to_images_fallback(ppt_file, output_dir="output/slides"):
         title_color = (51, 51, 51)  # Dark gray for title
         text_color = (80, 80, 80)  # Gray for content
 
-        # Try to load a font
-        try:
-            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-            text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-        except:
-            try:
-                title_font = ImageFont.truetype("arial.ttf", 36)
-                text_font = ImageFont.truetype("arial.ttf", 24)
-            except:
-                title_font = ImageFont.load_default()
-                text_font = ImageFont.load_default()
+        # Fonts are loaded once per worker thread, not per call
+        title_font = get_font(36, bold=True)
+        text_font = get_font(24)
 
         slide_count = len(prs.slides)
         print(f"[PPT] Found {slide_count} slides")
@@ -193,6 +188,147 @@ def ppt_to_images(ppt_file, output_dir="output/slides"):
         return ppt_to_images_fallback(ppt_file, output_dir)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# PDF RASTERIZATION (poppler) - parallel, tiered thumbnails for the web preview
+# ═══════════════════════════════════════════════════════════════════════════════
+
+THUMB_WIDTH = 480        # small tier: ~2x the width of a 3-column preview cell
+THUMB_QUALITY = 70       # WebP quality for the small tier
+FULL_DPI = 144           # full-size tier, rendered on demand when a slide is opened
+
+
+def pdf_page_count(pdf_path):
+    """Read the page count of a PDF with pdfinfo. Returns 0 if unavailable."""
+    import re
+    import subprocess
+    try:
+        r = subprocess.run(['pdfinfo', pdf_path], capture_output=True, text=True, timeout=15)
+        m = re.search(r'^Pages:\s+(\d+)', r.stdout, re.MULTILINE)
+        return int(m.group(1)) if m else 0
+    except Exception:
+        return 0
+
+
+def _to_webp(png_path, quality=THUMB_QUALITY):
+    """Re-encode a PNG as WebP next to it. Returns the new path (or the PNG if PIL is missing)."""
+    try:
+        from PIL import Image
+        webp_path = os.path.splitext(png_path)[0] + '.webp'
+        with Image.open(png_path) as img:
+            img.save(webp_path, 'WEBP', quality=quality, method=4)
+        os.unlink(png_path)
+        return webp_path
+    except Exception:
+        return png_path
+
+
+def _rasterize_range(pdf_path, out_dir, first, last, width, webp):
+    """Render pages first..last with one pdftoppm call. Returns {page: image_path}."""
+    import subprocess
+    prefix = os.path.join(out_dir, 'thumb')
+    with span('pdftoppm', tier='thumb', pages=last - first + 1):
+        subprocess.run(
+            ['pdftoppm', '-png', '-scale-to-x', str(width), '-scale-to-y', '-1',
+             '-f', str(first), '-l', str(last), pdf_path, prefix],
+            capture_output=True, timeout=60
+        )
+    rendered = {}
+    for page in range(first, last + 1):
+        # pdftoppm zero-pads the page number to the width of the last page number
+        for digits in (1, 2, 3, 4):
+            png = f"{prefix}-{page:0{digits}d}.png"
+            if os.path.exists(png):
+                final = os.path.join(out_dir, f"thumb-{page:03d}.png")
+                if png != final:
+                    os.replace(png, final)
+                rendered[page] = _to_webp(final) if webp else final
+                break
+    return rendered
+
+
+def rasterize_pdf(pdf_path, out_dir, width=THUMB_WIDTH, workers=None, webp=True, on_page=None):
+    """
+    Render every page of a PDF to a small thumbnail, splitting the page range
+    across CPU cores (one pdftoppm process per range).
+    on_page(page, path) is called as each range finishes.
+    Returns a list of image paths ordered by page (None where rendering failed).
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    os.makedirs(out_dir, exist_ok=True)
+    pages = pdf_page_count(pdf_path)
+    if not pages:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, pages))
+    per_worker = -(-pages // workers)  # ceil division
+    ranges = [(start, min(start + per_worker - 1, pages))
+              for start in range(1, pages + 1, per_worker)]
+
+    results = [None] * pages
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [pool.submit(_rasterize_range, pdf_path, out_dir, a, b, width, webp) for a, b in ranges]
+        for fut in as_completed(futures):
+            try:
+                rendered = fut.result()
+            except Exception as e:
+                print(f"[RASTER] Page range failed: {e}")
+                continue
+            for page, path in sorted(rendered.items()):
+                results[page - 1] = path
+                if on_page:
+                    on_page(page, path)
+    return results
+
+
+def render_full_slide(pdf_path, page, out_dir, dpi=FULL_DPI):
+    """Render a single page at full resolution (cached on disk). Returns the path or None."""
+    import subprocess
+    os.makedirs(out_dir, exist_ok=True)
+    prefix = os.path.join(out_dir, f"full-{page:03d}")
+    if os.path.exists(prefix + '.png'):
+        return prefix + '.png'
+    try:
+        with span('pdftoppm', tier='full', page=page):
+            subprocess.run(
+                ['pdftoppm', '-png', '-r', str(dpi), '-singlefile', '-f', str(page), '-l', str(page),
+                 pdf_path, prefix],
+                capture_output=True, timeout=60
+            )
+    except Exception as e:
+        print(f"[RASTER] Full-size render failed for page {page}: {e}")
+        return None
+    return prefix + '.png' if os.path.exists(prefix + '.png') else None
+
+
+def build_sprite_sheet(image_paths, out_path, cols=3, gap=8, quality=THUMB_QUALITY):
+    """
+    Pack thumbnails into one grid image so the browser fetches a single file.
+    Returns the sprite path, or None if PIL is unavailable or there is nothing to pack.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    paths = [p for p in image_paths if p and os.path.exists(p)]
+    if not paths:
+        return None
+    tiles = [Image.open(p) for p in paths]
+    try:
+        tile_w = max(t.width for t in tiles)
+        tile_h = max(t.height for t in tiles)
+        rows = -(-len(tiles) // cols)
+        sheet = Image.new('RGB', (cols * tile_w + (cols - 1) * gap, rows * tile_h + (rows - 1) * gap), (244, 246, 249))
+        for i, tile in enumerate(tiles):
+            r, c = divmod(i, cols)
+            sheet.paste(tile.convert('RGB'), (c * (tile_w + gap), r * (tile_h + gap)))
+        fmt = 'WEBP' if out_path.lower().endswith('.webp') else 'PNG'
+        sheet.save(out_path, fmt, quality=quality)
+        return out_path
+    finally:
+        for t in tiles:
+            t.close()
+
+
 def list_slides(output_dir="output/slides"):
     """List all slide images"""
     import glob
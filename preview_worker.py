@@ -0,0 +1,171 @@
+"""
+Background Preview Worker
+Builds the PDF export and slide thumbnails for a generated PPTX off the
+Streamlit script thread, so the preview stage can render immediately and
+fill thumbnails in as they become available.
+
+Thumbnails come in two tiers: a small WebP tier rendered in parallel for the
+grid, and a full-size PNG rendered on demand when a slide is opened.
+
+Finished jobs are forgotten once unused for PREVIEW_JOB_TTL seconds, and
+rebuilt when the artifact store has evicted the files they point at.
+"""
+
+import os
+import re
+import time
+import zipfile
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+from ppt_to_images import pdf_page_count, rasterize_pdf, render_full_slide, build_sprite_sheet
+
+# At most two LibreOffice conversions at once keeps memory predictable; each worker
+# thread has its own LibreOffice profile, since two instances sharing one fail or write no PDF
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preview")
+_jobs = {}
+_lock = threading.Lock()
+PREVIEW_JOB_TTL = float(os.getenv("PREVIEW_JOB_TTL", "3600"))
+_FINISHED = ('done', 'failed')
+
+# Optional: pack the thumbnail tier into one sprite image (one request instead of N)
+SPRITE_SHEET = os.getenv("PREVIEW_SPRITE_SHEET", "").lower() in ("1", "true", "yes")
+SPRITE_COLS = 3
+
+
+def count_slides(ppt_path):
+    """Count slides in a PPTX by listing its slide parts (no python-pptx needed)."""
+    try:
+        with zipfile.ZipFile(ppt_path, 'r') as zf:
+            return sum(1 for n in zf.namelist() if re.match(r'^ppt/slides/slide\d+\.xml$', n))
+    except Exception:
+        return 0
+
+
+def _preview_dir(ppt_path):
+    return ppt_path.replace('.pptx', '_preview')
+
+
+def _update(ppt_path, **fields):
+    with _lock:
+        job = _jobs.get(ppt_path)
+        if job is not None:
+            job.update(fields)
+
+
+def _set_thumb(ppt_path, page, path):
+    with _lock:
+        job = _jobs.get(ppt_path)
+        if job is None:
+            return
+        thumbs = job['thumbs']
+        if len(thumbs) < page:
+            thumbs.extend([None] * (page - len(thumbs)))
+        thumbs[page - 1] = path
+
+
+def _libreoffice_profile():
+    """file:// URI of this worker thread's private LibreOffice profile (created by LibreOffice on first use)."""
+    path = os.path.join(tempfile.gettempdir(), f"lo_profile_{os.getpid()}_{threading.get_ident()}")
+    return Path(path).as_uri()
+
+
+def _build_preview(ppt_path):
+    """Worker: PPTX -> PDF (LibreOffice) -> small thumbnail tier (parallel pdftoppm)."""
+    preview_dir = _preview_dir(ppt_path)
+    os.makedirs(preview_dir, exist_ok=True)
+    _update(ppt_path, status='running')
+    try:
+        pdf_name = os.path.splitext(os.path.basename(ppt_path))[0] + '.pdf'
+        pdf_path = os.path.join(preview_dir, pdf_name)
+
+        if not os.path.exists(pdf_path):
+            with span('libreoffice', slides=count_slides(ppt_path)) as s:
+                result = subprocess.run(
+                    ['libreoffice', f'-env:UserInstallation={_libreoffice_profile()}', '--headless',
+                     '--convert-to', 'pdf', '--outdir', preview_dir, ppt_path],
+                    capture_output=True, timeout=90
+                )
+                s.set(returncode=result.returncode)
+        if not os.path.exists(pdf_path):
+            _update(ppt_path, status='failed', error='PDF conversion failed')
+            return
+        pages = pdf_page_count(pdf_path) or count_slides(ppt_path)
+        _update(ppt_path, pdf_path=pdf_path, slide_count=pages)
+
+        thumbs = rasterize_pdf(pdf_path, preview_dir,
+                               on_page=lambda page, path: _set_thumb(ppt_path, page, path))
+        _update(ppt_path, thumbs=thumbs)
+
+        if SPRITE_SHEET and thumbs:
+            sprite = build_sprite_sheet(thumbs, os.path.join(preview_dir, 'sprite.webp'), cols=SPRITE_COLS)
+            _update(ppt_path, sprite_path=sprite)
+        _update(ppt_path, status='done')
+    except Exception as e:
+        print(f"[PREVIEW] Background preview failed: {e}")
+        _update(ppt_path, status='failed', error=str(e))
+
+
+def _files_missing(job):
+    """True when a finished job points at a PDF or thumbnail that is no longer on disk."""
+    paths = [job['pdf_path'], job['sprite_path'], *job['thumbs']]
+    return any(path and not os.path.exists(path) for path in paths)
+
+
+def _prune(now):
+    """Drop finished jobs unused for PREVIEW_JOB_TTL and jobs whose deck is gone. Caller holds _lock."""
+    for path, job in list(_jobs.items()):
+        expired = job['status'] in _FINISHED and now - job['touched'] > PREVIEW_JOB_TTL
+        if expired or not os.path.exists(path):
+            del _jobs[path]
+
+
+def start_preview(ppt_path):
+    """Queue preview + PDF generation for ppt_path. Safe to call repeatedly."""
+    if not ppt_path:
+        return
+    with _lock:
+        if not os.path.exists(ppt_path):
+            _jobs.pop(ppt_path, None)
+            return
+        now = time.time()
+        job = _jobs.get(ppt_path)
+        if job is not None and not (job['status'] in _FINISHED and _files_missing(job)):
+            job['touched'] = now
+            return
+        _prune(now)
+        _jobs[ppt_path] = {
+            'status': 'pending',
+            'slide_count': count_slides(ppt_path),
+            'thumbs': [],
+            'sprite_path': None,
+            'pdf_path': None,
+            'error': None,
+            'touched': now,
+        }
+    _executor.submit(_build_preview, ppt_path)
+
+
+def get_preview(ppt_path):
+    """Snapshot of the preview job for ppt_path (starts it if not yet queued or its files are gone)."""
+    start_preview(ppt_path)
+    with _lock:
+        job = _jobs.get(ppt_path)
+        if job is None:
+            return {'status': 'failed', 'slide_count': 0, 'thumbs': [], 'sprite_path': None,
+                    'pdf_path': None, 'error': 'missing file'}
+        snap = dict(job)
+        snap['thumbs'] = list(job['thumbs'])
+        return snap
+
+
+def get_full_slide(ppt_path, page):
+    """Full-size image for one slide, rendered the first time it is opened."""
+    job = get_preview(ppt_path)
+    if not job.get('pdf_path'):
+        return None
+    return render_full_slide(job['pdf_path'], page, _preview_dir(ppt_path))
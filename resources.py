@@ -0,0 +1,154 @@
+"""
+Shared Resources
+Process-wide registry for objects that are costly to build and safe to share
+between Streamlit sessions (each session runs in its own thread): the LLM
+client and pooled HTTP sessions. Each one is built once per process on first
+use, however many sessions ask for it at the same time. PIL fonts are cached
+per thread instead: a FreeType face must not be used by two threads at once.
+
+    generator = get_generator()
+    resp = http_session().post(url, json=payload, timeout=60)
+    title_font = get_font(36, bold=True)
+
+Lifetimes: an entry lives for the whole process unless it was registered with
+ttl=<seconds> (rebuilt on the first get after it expires) or is dropped with
+release(key). Entries with a close() method are closed when released and at
+interpreter exit.
+"""
+
+import os
+import time
+import atexit
+import threading
+from collections import Counter
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+
+# First font that loads wins; PIL's built-in bitmap font is the last resort
+FONT_CANDIDATES = {
+    False: ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "arial.ttf"],
+    True: ["/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "arial.ttf"],
+}
+
+
+class ResourceRegistry:
+    """Thread-safe get-or-build cache with one lock per key, so a slow build does not block other keys."""
+
+    def __init__(self):
+        self._entries = {}  # key -> (value, expires_at or None)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.builds = Counter()
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry and (entry[1] is None or entry[1] > time.time()):
+            return entry
+        return None
+
+    def get(self, key, factory, ttl=None):
+        """Shared object for `key`, calling factory() only if it is missing or expired."""
+        entry = self._live(key)
+        if entry:
+            return entry[0]
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._live(key)
+            if entry:
+                return entry[0]
+            # An expired value is only dropped, not closed: another session may still be using it
+            value = factory()
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self.builds[key] += 1
+            return value
+
+    def release(self, key):
+        """Drop `key` (closing it if possible); the next get builds a fresh one."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry:
+            _close(entry[0])
+
+    def clear(self):
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        for value, _ in entries.values():
+            _close(value)
+
+
+def _close(value):
+    close = getattr(value, 'close', None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            print(f"[RESOURCES] close failed for {type(value).__name__}: {e}")
+
+
+_registry = ResourceRegistry()
+atexit.register(_registry.clear)
+
+
+def shared(key, factory, ttl=None):
+    return _registry.get(key, factory, ttl)
+
+
+def release(key):
+    _registry.release(key)
+
+
+def build_counts():
+    """{key: times built} since process start (1 per key unless released or expired)."""
+    return dict(_registry.builds)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resources
+# ─────────────────────────────────────────────────────────────────────────────
+
+def get_generator():
+    """The MultiAIGenerator every session uses (it keeps no per-request state)."""
+    from multi_ai_generator import MultiAIGenerator
+    return shared("multi_ai_generator", MultiAIGenerator)
+
+
+def _build_http_session():
+    import requests
+    from http.cookiejar import DefaultCookiePolicy
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Shared by every user: keep the connection pool, never cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def http_session(name="default"):
+    """requests.Session with a keep-alive connection pool, shared across threads."""
+    return shared(f"http:{name}", _build_http_session)
+
+
+_thread_fonts = threading.local()
+
+
+def _load_font(size, bold):
+    from PIL import ImageFont
+    for path in FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(path, size)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+
+def get_font(size, bold=False):
+    """PIL font of the given size (DejaVu, then Arial, then PIL's default), loaded once per thread."""
+    fonts = _thread_fonts.__dict__
+    key = (size, bool(bold))
+    if key not in fonts:
+        fonts[key] = _load_font(size, bool(bold))
+    return fonts[key]
@@ -0,0 +1,48 @@
+"""
+Chat Stage Handlers
+app_chatbot.py keeps the page shell (CSS, navbar, chat history, input, footer);
+everything specific to one step of the chat lives in a stage module, and only
+the active stage's module is imported and run on a rerun.
+
+A stage module may define any of these hooks (missing hooks are skipped):
+
+    render_header()      page area above the chat (home page, bulk, branding)
+    render_prompt()      quick-pick widgets right under the chat history
+    handle_input(text)   chat input while in this stage; return True if handled
+    render()             the stage's main panel below the input area
+
+Input a stage does not handle falls through to stages.topic.
+"""
+
+import importlib
+
+STAGE_MODULES = {
+    'idle': 'stages.home',
+    'bulk_mode': 'stages.bulk',
+    'branding_mode': 'stages.branding',
+    'ask_name': 'stages.presenter',
+    'ask_designation': 'stages.presenter',
+    'awaiting_topic': None,
+    'awaiting_theme': 'stages.theme',
+    'awaiting_slides': 'stages.slides',
+    'awaiting_logo': 'stages.logo',
+    'generating': 'stages.generating',
+    'regenerating': 'stages.generating',
+    'preview': 'stages.preview',
+    'done': 'stages.done',
+}
+
+# Stages that show the landing page instead of the compact chat header
+HOME_STAGES = ('idle', 'bulk_mode', 'branding_mode')
+
+
+def get_handler(stage):
+    """The module for `stage`, imported on first use (None for stages without widgets)."""
+    module_name = STAGE_MODULES.get(stage)
+    return importlib.import_module(module_name) if module_name else None
+
+
+def run_hook(stage, hook, *args):
+    """Call `hook` on the stage's module if it defines it. Returns the hook's result (None if skipped)."""
+    hook_fn = getattr(get_handler(stage), hook, None)
+    return hook_fn(*args) if hook_fn else None
@@ -0,0 +1,42 @@
+"""
+Branding Mode Stage
+Company name, tagline and accent colour applied to every generated slide.
+"""
+
+import streamlit as st
+
+from stages.common import add_message
+from stages.home import render_landing
+
+
+def render_header():
+    render_landing()
+    st.markdown('<div id="section_branding"></div>', unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("### 🏢 Custom Branding")
+    _bc1, _bc2 = st.columns(2)
+    with _bc1:
+        brand_company = st.text_input("Company / NGO Name", placeholder="e.g. Acme Corp", key="brand_company_input")
+        brand_tagline = st.text_input("Tagline (optional)", placeholder="e.g. Innovation Driven", key="brand_tagline_input")
+    with _bc2:
+        brand_color = st.color_picker("Accent Color", value="#1565C0", key="brand_color_input")
+        st.caption("This color will be used as the accent/highlight color on all slides")
+    _bsave, _bback = st.columns(2)
+    with _bsave:
+        if st.button("Save Branding", type="primary", use_container_width=True, key="save_brand_btn"):
+            st.session_state.brand_company = brand_company.strip()
+            st.session_state.brand_tagline = brand_tagline.strip()
+            st.session_state.brand_accent  = brand_color.lstrip('#')
+            st.success(f"Branding saved! Company: {brand_company} will appear on all slides.")
+    with _bback:
+        if st.button("Back to Home", use_container_width=True, key="brand_back"):
+            st.session_state.stage = 'idle'
+            st.rerun()
+    if st.session_state.get('brand_company'):
+        st.info(f"Active branding: **{st.session_state.brand_company}** | Accent: #{st.session_state.get('brand_accent','')}")
+        if st.button("Now Create PPT →", type="primary", key="brand_create"):
+            st.session_state.stage = 'awaiting_topic'
+            add_message("assistant", "What topic would you like to create a PPT on? (Branding will be applied)")
+            st.rerun()
+
+    st.markdown('<div style="height:60px"></div>', unsafe_allow_html=True)
@@ -0,0 +1,168 @@
+"""
+Bulk Mode Stage
+CSV upload → one background job that generates every row through the
+two-pool batch pipeline, checkpointed so re-uploading the same CSV resumes.
+Old run directories are swept by TTL and quota (batch_generate.sweep_runs).
+The finished ZIP is streamed by the deck API when DECK_API_PUBLIC_URL is set.
+"""
+
+import io
+import os
+import csv
+import hashlib
+import functools
+import json as json_mod
+
+import streamlit as st
+
+from api_server import bulk_download_url
+from batch_generate import run_batch, load_rows, read_manifest, sweep_runs, BULK_DIR, MANIFEST_NAME, ZIP_NAME
+from job_queue import submit_job, get_job, active_jobs, ACTIVE_STATES
+from stages.common import _fragment, JOB_POLL_SECONDS
+from stages.home import render_landing
+
+# Bulk mode: one run directory per uploaded CSV under BULK_DIR (checkpoint manifest + streamed ZIP)
+BULK_LLM_WORKERS = int(os.getenv("BULK_LLM_WORKERS", "4"))
+BULK_RENDER_WORKERS = int(os.getenv("BULK_RENDER_WORKERS", "2"))
+PREVIEW_ROWS = 10
+
+
+def _count_rows(csv_bytes):
+    """Data rows in an uploaded CSV, counted record by record (quoted newlines included)."""
+    with io.TextIOWrapper(io.BytesIO(csv_bytes), encoding='utf-8-sig', newline='') as f:
+        return max(sum(1 for row in csv.reader(f) if row) - 1, 0)
+
+
+def _sweep_old_runs():
+    """Expire old run directories, never one a bulk job is still working in."""
+    sweep_runs(keep=[job['meta'].get('bulk_dir') for job in active_jobs('bulk') if job['meta'].get('bulk_dir')])
+
+
+def _read_zip(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _run_bulk(csv_path, out_dir, zip_path, total, progress=None):
+    """Job body: bounded LLM + render pools, decks streamed into an on-disk ZIP."""
+    def _on_progress(counts):
+        finished = counts['ok'] + counts['failed'] + counts['skipped']
+        if progress:
+            progress('bulk', min(99, finished * 100 // max(total, 1)),
+                     f"{finished}/{total} done ({counts['failed']} failed)")
+    counts = run_batch(load_rows(csv_path), out_dir, llm_workers=BULK_LLM_WORKERS,
+                       render_workers=BULK_RENDER_WORKERS, resume=True,
+                       zip_path=zip_path, on_progress=_on_progress)
+    counts['zip_path'] = zip_path
+    counts['errors'] = [
+        f"{e['topic']}: {str(e.get('error'))[:40]}"
+        for e in _iter_manifest(out_dir) if e.get('status') == 'failed'
+    ][-20:]
+    _sweep_old_runs()
+    return counts
+
+
+def _iter_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as _mf:
+            for _line in _mf:
+                try:
+                    yield json_mod.loads(_line)
+                except ValueError:
+                    continue
+    except OSError:
+        return
+
+
+def _bulk_status(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return
+    if job['status'] in ACTIVE_STATES:
+        st.progress(job['progress'])
+        st.info(f"Generating... {job.get('message') or ''}")
+        return
+    if job['status'] == 'failed':
+        st.error(f"Bulk run stopped: {job.get('error')}. Click Generate again to resume.")
+        return
+    result = job['result'] or {}
+    zip_path = result.get('zip_path')
+    if zip_path and os.path.exists(zip_path):
+        url = bulk_download_url(os.path.basename(os.path.dirname(zip_path)))
+        if url:
+            # Streamed from disk by the deck API; the app never holds the ZIP in memory
+            st.link_button("Download All PPTs (ZIP)", url, type="primary")
+        else:
+            # Read only when clicked, not on every rerun of this panel
+            st.download_button("Download All PPTs (ZIP)", functools.partial(_read_zip, zip_path),
+                file_name=ZIP_NAME, mime="application/zip", type="primary")
+    if result.get('failed'):
+        st.warning("Some failed: " + " | ".join(result.get('errors') or []))
+    else:
+        st.success(f"All {result.get('ok', 0) + result.get('skipped', 0)} PPTs ready!")
+
+
+def _render_bulk_status(job_id):
+    job = get_job(job_id)
+    if _fragment and job and job['status'] in ACTIVE_STATES:
+        @_fragment(run_every=JOB_POLL_SECONDS)
+        def _poll():
+            _job = get_job(job_id)
+            if _job is None or _job['status'] not in ACTIVE_STATES:
+                st.rerun()
+            _bulk_status(job_id)
+        _poll()
+    else:
+        _bulk_status(job_id)
+
+
+def render_header():
+    render_landing()
+    st.markdown('<div id="section_bulk"></div>', unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("### 📊 Bulk PPT Generation")
+    st.caption("Upload a CSV with columns: **Topic, Theme, Slides, Language**")
+    bulk_csv = st.file_uploader("Upload CSV", type=["csv"], key="bulk_csv_upload")
+    if bulk_csv:
+        import pandas as _pd
+        try:
+            _csv_bytes = bulk_csv.getvalue()
+            # Only the first rows are parsed for the preview; the job streams the rest
+            _df = _pd.read_csv(io.BytesIO(_csv_bytes), nrows=PREVIEW_ROWS)
+            _df.columns = [c.strip().lower() for c in _df.columns]
+            if 'topic' not in _df.columns:
+                st.error("CSV must have a 'Topic' column")
+            else:
+                if 'theme'    not in _df.columns: _df['theme']    = 'modern'
+                if 'slides'   not in _df.columns: _df['slides']   = 10
+                if 'language' not in _df.columns: _df['language'] = 'English'
+                st.dataframe(_df[['topic','theme','slides','language']], use_container_width=True)
+                _bulk_total = _count_rows(_csv_bytes)
+                st.caption(f"{_bulk_total} topics found")
+                # One run directory per CSV: re-uploading the same file resumes from its manifest
+                _bulk_key = hashlib.sha256(_csv_bytes).hexdigest()[:16]
+                _bulk_dir = os.path.join(BULK_DIR, _bulk_key)
+                _bulk_zip = os.path.join(_bulk_dir, ZIP_NAME)
+                del _df
+                if st.button("Generate All PPTs", key="bulk_gen_btn", type="primary"):
+                    _sweep_old_runs()
+                    os.makedirs(_bulk_dir, exist_ok=True)
+                    _csv_path = os.path.join(_bulk_dir, "input.csv")
+                    with open(_csv_path, 'wb') as _f:
+                        _f.write(_csv_bytes)
+                    st.session_state.bulk_job_id = submit_job(
+                        _run_bulk, _csv_path, _bulk_dir, _bulk_zip, _bulk_total,
+                        dedupe_key=f"bulk:{_bulk_key}", meta={'bulk_dir': _bulk_dir}, pool='bulk',
+                    )
+                _bulk_job = get_job(st.session_state.get('bulk_job_id') or '')
+                if _bulk_job and _bulk_job['meta'].get('bulk_dir', _bulk_dir) == _bulk_dir:
+                    _render_bulk_status(_bulk_job['id'])
+                elif os.path.exists(_bulk_zip) and read_manifest(_bulk_dir):
+                    st.info("A previous run of this CSV was found — click Generate to resume it.")
+        except Exception as _e:
+            st.error(f"CSV error: {_e}")
+    if st.button("Back to Home", key="bulk_back"):
+        st.session_state.stage = 'idle'
+        st.rerun()
+
+    st.markdown('<div style="height:60px"></div>', unsafe_allow_html=True)
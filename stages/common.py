@@ -0,0 +1,412 @@
+"""
+Shared Chat Helpers
+Session defaults, chat messages, input checks, static assets and the deck
+helpers that more than one stage module needs. Imported once per process;
+nothing here runs on a rerun unless it is called.
+"""
+
+import os
+import re
+import copy
+import uuid
+import functools
+
+import streamlit as st
+
+from artifact_store import get_store
+from blob_store import get_blobs
+from deck_pipeline import build_deck
+from preview_worker import start_preview
+from job_queue import get_job
+from lazy_imports import module_available
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(_PROJECT_DIR, "static")
+
+google_api_key = os.getenv("GOOGLE_API_KEY")
+google_cse_id = os.getenv("GOOGLE_CSE_ID")
+
+# pandas is only needed once a spreadsheet is uploaded; see lazy_imports
+PANDAS_AVAILABLE = module_available("pandas")
+
+# Background jobs (generation, bulk runs) are polled from fragments where available
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+JOB_POLL_SECONDS = 1.0
+
+SESSION_DEFAULTS = {
+    'messages': [],
+    'stage': 'idle',  # see stages.STAGE_MODULES for the full list
+    'presenter_name': None,
+    'presenter_designation': None,
+    'topic': None,
+    'suggested_title': None,
+    'ppt_path': None,
+    'theme': 'modern',
+    'bullets_per_slide': 4,
+    'file_content': None,
+    'file_name': None,
+    'ai_source': None,
+    'num_slides': 6,
+    'slide_count': 10,
+    'parsed_slides': None,
+    # Large values live in blob_store; the session keeps only their keys (see put_blob)
+    'file_names': [],
+    'file_blobs': [],         # extracted text per entry in file_names
+    'doc_index_blob': None,   # BM25 passage index over file_blobs (see doc_index)
+    'chart_data': None,       # {'table_blob': key of the table_ingest.TableData, 'column_blobs': its .npy keys, 'filename': str}
+    'chart_settings': None,   # {'chart_type': str, 'chart_title': str}
+    'logo_blob': None,        # logo as a data URI
+    'pptxgenjs_blob': None,   # PptxGenJS code of the current deck
+    'full_ai_output_blob': None,
+    'show_uploader': False,
+    'awaiting_upload_confirm': False,
+    'uploaded_preview': None,
+    'gen_job_id': None,
+    'gen_job_kind': None,
+}
+
+NAVBAR_HTML = """
+<div class="hp-navbar">
+  <div class="hp-logo">PPT<span>AI</span></div>
+  <div class="hp-nav-links">
+    <a href="#">Home</a>
+    <a href="#">Features</a>
+    <a href="#">How It Works</a>
+    <a href="#">Free</a>
+  </div>
+</div>
+"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Session
+# ─────────────────────────────────────────────────────────────────────────────
+
+def init_session():
+    """Fill in session defaults once per session; keep this session's artifacts alive on every run."""
+    if not st.session_state.get('_session_ready'):
+        for key, value in SESSION_DEFAULTS.items():
+            if key not in st.session_state:
+                st.session_state[key] = copy.copy(value)
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex  # owner id for artifact store references
+        _resume_deck_job()
+        st.session_state._session_ready = True
+    get_store().heartbeat(st.session_state.session_id)
+
+
+def _resume_deck_job():
+    """Reattach to a generation started before a refresh/reconnect (?job=<id>)."""
+    if st.session_state.gen_job_id:
+        return
+    resume_id = st.query_params.get('job')
+    job = get_job(resume_id) if resume_id else None
+    if not job:
+        return
+    meta = job.get('meta') or {}
+    st.session_state.gen_job_id = job['id']
+    st.session_state.gen_job_kind = meta.get('kind', 'generate')
+    for key in ('topic', 'theme', 'language', 'slide_count'):
+        if meta.get(key):
+            st.session_state[key] = meta[key]
+    st.session_state.stage = 'generating' if st.session_state.gen_job_kind == 'generate' else 'regenerating'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Static assets (read once per process)
+# ─────────────────────────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=None)
+def css(name):
+    """<style> block for static/<name>.css."""
+    with open(os.path.join(STATIC_DIR, f"{name}.css"), 'r', encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+def render_static_assets():
+    """Page-wide CSS and the top navbar."""
+    st.markdown(css("app") + css("home") + NAVBAR_HTML, unsafe_allow_html=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Deck files (read once per file version)
+# ─────────────────────────────────────────────────────────────────────────────
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+@functools.lru_cache(maxsize=8)
+def _read_file(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def file_bytes(path):
+    """Contents of `path` for download buttons, cached until the file changes on disk."""
+    stat = os.stat(path)
+    return _read_file(path, stat.st_mtime_ns, stat.st_size)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chat messages and input checks
+# ─────────────────────────────────────────────────────────────────────────────
+
+def put_blob(value):
+    """Store a large value for this session; keep the returned key in session_state instead."""
+    return get_blobs().put(st.session_state.session_id, value)
+
+
+def get_blob(key, default=None):
+    return get_blobs().get(key, default)
+
+
+def drop_blobs(*keys):
+    """This session no longer needs these blobs (shared copies stay for other sessions)."""
+    for key in keys:
+        get_blobs().release(st.session_state.session_id, key)
+
+
+def set_blob(name, value):
+    """Store value as session_state[name], releasing the blob it replaces (None just clears it)."""
+    previous = st.session_state.get(name)
+    st.session_state[name] = put_blob(value) if value is not None else None
+    if previous and previous != st.session_state[name]:
+        drop_blobs(previous)
+
+
+def set_chart_data(table, filename):
+    """Make table this session's chart data; holds its column files and releases the previous table."""
+    previous = st.session_state.get('chart_data')
+    chart_data = None
+    if table is not None:
+        column_blobs = list(table.column_keys.values())
+        for key in column_blobs:
+            get_blobs().acquire(st.session_state.session_id, key)
+        chart_data = {'table_blob': put_blob(table), 'column_blobs': column_blobs, 'filename': filename}
+    st.session_state.chart_data = chart_data
+    if previous:
+        keep = set(chart_data['column_blobs']) | {chart_data['table_blob']} if chart_data else set()
+        drop_blobs(*[key for key in [previous['table_blob'], *previous.get('column_blobs', [])] if key not in keep])
+
+
+def rebuild_doc_index():
+    """Re-index this session's uploaded files; call after adding or removing one."""
+    from doc_index import build_index
+    drop_blobs(st.session_state.get('doc_index_blob'))
+    documents = [(name, get_blob(key, '')) for name, key in
+                 zip(st.session_state.file_names, st.session_state.file_blobs)]
+    st.session_state.doc_index_blob = put_blob(build_index(documents)) if documents else None
+
+
+def doc_passages(query, budget_tokens=None):
+    """Uploaded-document passages most relevant to query, packed to budget_tokens ('' without uploads)."""
+    index = get_blob(st.session_state.get('doc_index_blob'))
+    if not index or not query:
+        return ''
+    from doc_index import DOC_CONTEXT_TOKENS
+    return index.pack(query, budget_tokens or DOC_CONTEXT_TOKENS)
+
+
+def doc_query(topic):
+    """
+    What to search the uploaded documents for: the topic, or the documents' own
+    top terms when the deck has no real topic (upload-only decks are named
+    after their files, and a file name matches little).
+    """
+    if topic and topic != ", ".join(st.session_state.get('file_names') or []):
+        return topic
+    index = get_blob(st.session_state.get('doc_index_blob'))
+    return ' '.join(index.top_terms()) if index else ''
+
+
+def slide_passages(slide_num, instruction):
+    """Document passages for editing one slide, matched on its current text and the instruction."""
+    from doc_index import EDIT_CONTEXT_TOKENS
+    slides = st.session_state.get('parsed_slides') or []
+    slide = slides[slide_num - 1] if 0 < slide_num <= len(slides) else {}
+    query = ' '.join([slide.get('title', ''), *map(str, slide.get('bullets', [])), instruction])
+    return doc_passages(query, EDIT_CONTEXT_TOKENS)
+
+
+def add_message(role, content):
+    st.session_state.messages.append({"role": role, "content": content})
+
+
+# Global greetings - English, Hindi, Spanish, French, German, Arabic, Chinese, Japanese, etc.
+GREETINGS = (
+    # English
+    'hi', 'hello', 'hey', 'hii', 'hiii', 'hiiii', 'helo', 'hllo', 'hlw', 'hw',
+    'good morning', 'good afternoon', 'good evening', 'good night', 'gm', 'gn',
+    'howdy', 'yo', 'sup', 'whats up', "what's up", 'wassup', 'wazzup',
+    'greetings', 'salutations', 'heya', 'hiya', 'hai',
+    # Hindi / Hinglish
+    'namaste', 'namaskar', 'pranam', 'pranaam', 'namashkar', 'jai shri krishna',
+    'jai hind', 'radhe radhe', 'ram ram', 'jai shri ram', 'jai mata di',
+    'kya hal', 'kaise ho', 'kaise hai', 'kaisa hai', 'kya haal hai', 'kya chal raha',
+    'aur batao', 'sab theek', 'theek hai', 'haan bhai', 'bhai', 'bro',
+    'sat sri akal', 'sasriakal', 'kem cho', 'vanakkam', 'nomoshkar',
+    # Spanish
+    'hola', 'buenos dias', 'buenas tardes', 'buenas noches', 'que tal',
+    # French
+    'bonjour', 'bonsoir', 'salut', 'coucou',
+    # German
+    'hallo', 'guten tag', 'guten morgen', 'guten abend',
+    # Italian
+    'ciao', 'buongiorno', 'buonasera',
+    # Portuguese
+    'ola', 'bom dia', 'boa tarde', 'boa noite',
+    # Arabic
+    'marhaba', 'ahlan', 'salam', 'assalamualaikum', 'as-salamu alaykum', 'salaam',
+    # Chinese
+    'ni hao', 'nihao',
+    # Japanese
+    'konnichiwa', 'ohayo', 'konbanwa',
+    # Korean
+    'annyeong', 'annyeonghaseyo',
+    # Russian
+    'privet', 'zdravstvuyte',
+    # Other
+    'aloha', 'shalom', 'sawadee', 'jambo', 'habari'
+)
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+# Punctuation-stripped once per process instead of on every message
+_GREETING_KEYS = tuple(_PUNCTUATION.sub('', g) for g in GREETINGS)
+
+
+def is_greeting(text):
+    # Remove punctuation for matching
+    text_clean = _PUNCTUATION.sub('', text.lower().strip())
+    return any(text_clean == g or text_clean.startswith(g + ' ') for g in _GREETING_KEYS)
+
+
+def is_yes(text):
+    yes_words = ['yes', 'ya', 'yaa', 'haan', 'han', 'ok', 'okay', 'sure', 'theek', 'thik', 'sahi', 'correct', 'proceed', 'go ahead', 'bana do', 'banao']
+    return text.lower().strip() in yes_words or text.lower().strip().startswith('yes')
+
+
+def is_no(text):
+    no_words = ['no', 'nahi', 'naa', 'na', 'change', 'modify', 'edit', 'different']
+    return text.lower().strip() in no_words
+
+
+def is_valid_topic(text):
+    """Check if the input is a valid/meaningful topic for PPT generation"""
+    text = text.strip()
+
+    # ISSUE 10: Minimum 10 characters for short inputs
+    if len(text) < 10:
+        return False, "Please provide more details (at least 10 characters). Example: 'AI in Healthcare' or 'Digital India'."
+
+    # ISSUE 7: Long/structured content is always valid (user pasted content)
+    # If text is substantial (> 50 chars), has multiple lines, or has bullet points - accept it
+    if len(text) > 50:
+        return True, ""
+
+    # Multi-line content is likely structured/pasted content
+    if '\n' in text and len(text.split('\n')) >= 2:
+        return True, ""
+
+    # Content with bullet markers is structured
+    if any(marker in text for marker in ['- ', '• ', '* ', '1. ', '2. ']):
+        return True, ""
+
+    # Check for minimum vowels (gibberish often lacks vowels)
+    vowels = set('aeiouAEIOU')
+    vowel_count = sum(1 for c in text if c in vowels)
+
+    # If mostly consonants with very few vowels, likely gibberish
+    if len(text) > 5 and vowel_count < len(text) * 0.15:
+        return False, "Yeh samajh nahi aaya. Please ek clear topic likhen jaise 'Artificial Intelligence' ya 'Climate Change'."
+
+    # Check for repeated characters (like "aaaaaaa" or "jjjjj")
+    if len(text) > 4:
+        for i in range(len(text) - 3):
+            if text[i] == text[i+1] == text[i+2] == text[i+3]:
+                return False, "Please ek meaningful topic enter karein, random characters nahi."
+
+    # Check if it's just numbers
+    if text.replace(' ', '').isdigit():
+        return False, "Please topic ka naam likhen, sirf numbers nahi."
+
+    # If text is long enough and has some vowels, probably valid
+    if len(text) >= 10 and vowel_count >= 2:
+        return True, ""
+
+    return False, "Please ek clear topic batayein (minimum 10 characters). Example: 'Digital India' ya 'AI in Healthcare'."
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Decks
+# ─────────────────────────────────────────────────────────────────────────────
+
+def session_chart():
+    """Uploaded Excel/CSV chart for this session, in the shape build_deck() expects."""
+    chart_data = st.session_state.get('chart_data')
+    table = get_blob(chart_data.get('table_blob')) if chart_data and PANDAS_AVAILABLE else None
+    if table is None:
+        return None
+    chart_settings = st.session_state.get('chart_settings') or {}
+    chart_type = chart_settings.get('chart_type', 'bar')
+    return {
+        'df': table.chart_frame(chart_type),
+        'chart_type': chart_type,
+        'chart_title': chart_settings.get('chart_title', f"Data from {chart_data['filename']}"),
+    }
+
+
+def generate_ppt(content, topic, theme):
+    """Generate PPT — tries PptxGenJS first, falls back to python-pptx."""
+    return build_deck(content, topic, theme,
+                      js_code=get_blob(st.session_state.get('pptxgenjs_blob')),
+                      chart=session_chart(),
+                      brand_accent=st.session_state.get('brand_accent', ''))
+
+
+def publish_deck(ppt_path):
+    """Make ppt_path this session's current deck: hold it in the artifact store and start its preview."""
+    store = get_store()
+    previous = st.session_state.get('ppt_path')
+    if previous and previous != ppt_path:
+        store.release(st.session_state.session_id, previous)
+    store.acquire(st.session_state.session_id, ppt_path)
+    st.session_state.ppt_path = ppt_path
+    start_preview(ppt_path)
+
+
+def start_generating(message):
+    """Leave the setup questions and start generating a deck for the pending topic."""
+    st.session_state.stage = 'generating'
+    st.session_state.parsed_slides = []
+    set_blob('pptxgenjs_blob', None)
+    topic = st.session_state.get('pending_topic', '')
+    st.session_state.topic = topic
+    theme = st.session_state.get('theme', 'modern')
+    chosen = st.session_state.get('slide_count', 10)
+    add_message("assistant", message.format(theme=theme.capitalize(), topic=topic, slides=chosen))
+    st.rerun()
+
+
+def reset_chat(**overrides):
+    """Back to an empty idle chat (Create New PPT / refresh)."""
+    from stages.deck_jobs import clear_deck_job
+    st.session_state.messages = []
+    st.session_state.stage = 'idle'
+    clear_deck_job()
+    if st.session_state.ppt_path:
+        get_store().release(st.session_state.session_id, st.session_state.ppt_path)
+    st.session_state.ppt_path = None
+    st.session_state.topic = None
+    st.session_state.file_content = None
+    st.session_state.parsed_slides = None
+    # Every blob the session holds goes back to the store
+    drop_blobs(*st.session_state.file_blobs, st.session_state.doc_index_blob)
+    st.session_state.file_names = []
+    st.session_state.file_blobs = []
+    st.session_state.doc_index_blob = None
+    for name in ('logo_blob', 'pptxgenjs_blob', 'full_ai_output_blob'):
+        set_blob(name, None)
+    set_chart_data(None, None)
+    st.session_state.chart_settings = None
+    for key, value in overrides.items():
+        st.session_state[key] = value
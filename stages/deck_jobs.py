@@ -0,0 +1,155 @@
+"""
+Deck Jobs
+Generation runs on the job_queue worker pool; these helpers submit the job,
+poll it from a fragment and apply the result on the script thread. Shared by
+the generating/regenerating stages and the preview stage's slide editor.
+"""
+
+import time
+
+import streamlit as st
+
+from deck_pipeline import generate_deck
+from job_queue import submit_job, get_job, ACTIVE_STATES
+from stats_store import increment as stats_increment
+from stages.common import add_message, publish_deck, session_chart, set_blob, get_blob, doc_passages, doc_query, _fragment, JOB_POLL_SECONDS
+
+JOB_STAGE_LABELS = {
+    'queued': "⏳ Waiting for a free worker...",
+    'llm': "🤖 Step 1/3: AI generating slide content...",
+    'render': "📊 Step 2/3: Rendering PowerPoint file...",
+    'fallback': "🎨 Step 2/3: Building slides with the built-in designer...",
+    'done': "✅ Step 3/3: Finalizing...",
+}
+
+
+def deck_request(error_context='', reuse_code=True):
+    """Snapshot of everything generate_deck() needs from this session."""
+    topic = st.session_state.get('topic', '')
+    web_context = st.session_state.get('google_context', '')
+    # Attached files: only the passages that match the topic, not the whole text
+    passages = doc_passages(doc_query(topic))
+    if passages:
+        web_context = f"{web_context}\n\nFROM THE USER'S UPLOADED DOCUMENTS:\n{passages}".strip()
+    return {
+        'topic': topic,
+        'theme': st.session_state.get('theme', 'modern'),
+        'language': st.session_state.get('language', 'English'),
+        'num_slides': st.session_state.get('slide_count', 10),
+        'web_context': web_context,
+        'error_context': error_context,
+        'logo_data': get_blob(st.session_state.get('logo_blob')),
+        'company_name': st.session_state.get('brand_company', ''),
+        'brand_accent': st.session_state.get('brand_accent', ''),
+        'js_code': get_blob(st.session_state.get('pptxgenjs_blob')) if reuse_code else None,
+        'ai_source': st.session_state.get('ai_source') if reuse_code else None,
+        'slides': list(st.session_state.get('parsed_slides') or []),
+        'chart': session_chart(),
+        'session_id': st.session_state.session_id,
+    }
+
+
+def start_deck_job(kind, request, fn=generate_deck, **meta):
+    """
+    Submit (or re-attach to) this session's deck job. kind: generate / regenerate / edit.
+    fn(request, progress=...) returns a generate_deck()-shaped result dict.
+    """
+    meta.update(kind=kind, topic=request['topic'], theme=request['theme'],
+                language=request['language'], slide_count=request['num_slides'])
+    job_id = submit_job(fn, request, dedupe_key=st.session_state.session_id, meta=meta)
+    st.session_state.gen_job_id = job_id
+    st.session_state.gen_job_kind = kind
+    st.query_params['job'] = job_id
+    return job_id
+
+
+def clear_deck_job():
+    st.session_state.gen_job_id = None
+    st.session_state.gen_job_kind = None
+    if 'job' in st.query_params:
+        del st.query_params['job']
+
+
+def record_ppt_generated():
+    """Update the PPT generated count."""
+    stats_increment("ppt_generated")
+
+
+def _job_progress(job_id):
+    """Progress bar for a running job; triggers a full rerun once it finishes."""
+    job = get_job(job_id)
+    if job is None or job['status'] not in ACTIVE_STATES:
+        st.rerun()
+    st.progress(job['progress'])
+    st.text(JOB_STAGE_LABELS.get(job['stage'], job.get('message') or "Working..."))
+
+
+def poll_deck_job(job_id):
+    if _fragment:
+        _fragment(run_every=JOB_POLL_SECONDS)(_job_progress)(job_id)
+    else:
+        _job_progress(job_id)
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+
+def finish_deck_job(job):
+    """Apply a finished job's result to the session (script thread only)."""
+    kind = st.session_state.gen_job_kind or 'generate'
+    clear_deck_job()
+    result = job.get('result') or {}
+
+    if job['status'] == 'failed':
+        print(f"[GENERATE ERROR] {job.get('error')}")
+        if kind == 'generate':
+            st.session_state.stage = 'awaiting_topic'
+            add_message("assistant", f"Sorry, there was an error ({str(job.get('error'))[:80]}). Please try again.")
+        else:
+            st.session_state.stage = 'preview' if kind == 'edit' else 'done'
+            add_message("assistant", "⚠️ Failed to regenerate. Please try again.")
+        return
+
+    if result.get('success'):
+        set_blob('pptxgenjs_blob', result.get('js_code') or None)
+        publish_deck(result['ppt_path'])
+        if result.get('slides') is not None:
+            st.session_state.parsed_slides = result['slides']
+        if kind == 'generate':
+            st.session_state.stage = 'preview'
+            st.session_state.ai_source = result.get('ai_source')
+            record_ppt_generated()
+        elif kind == 'edit':
+            st.session_state.stage = 'preview'
+            add_message("assistant", result.get('note') or
+                        f"**Updated!** {job['meta'].get('edit_note', 'Your slide has been changed.')}")
+        else:
+            st.session_state.stage = 'done'
+            add_message("assistant", f"**Regenerated!** New presentation with **{st.session_state.get('theme')}** theme is ready.")
+        return
+
+    set_blob('pptxgenjs_blob', None)
+    if kind == 'generate':
+        st.session_state.stage = 'idle'
+        if not result.get('js_code'):
+            add_message("assistant", "⚠️ AI service is busy right now. Please type your topic again to retry.")
+        else:
+            add_message("assistant", "⚠️ Presentation could not be built. Please type your topic again.")
+    elif kind == 'edit':
+        st.session_state.stage = 'preview'
+        add_message("assistant", result.get('note') or "⚠️ AI failed to generate updated content. Please try again.")
+    else:
+        st.session_state.stage = 'done'
+        add_message("assistant", "⚠️ Failed to regenerate. Please try again.")
+
+
+def run_deck_stage(kind, request_factory):
+    """Drive the generating/regenerating stages: start the job once, poll, then apply the result."""
+    with st.chat_message("assistant"):
+        job = get_job(st.session_state.gen_job_id) if st.session_state.get('gen_job_id') else None
+        if job is None:
+            start_deck_job(kind, request_factory())
+            job = get_job(st.session_state.gen_job_id)
+        if job is None or job['status'] not in ACTIVE_STATES:
+            finish_deck_job(job or {'status': 'failed', 'error': 'job expired', 'meta': {}})
+            st.rerun()
+        poll_deck_job(job['id'])
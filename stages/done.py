@@ -0,0 +1,31 @@
+"""
+Done Stage
+Download button for a finished (regenerated) deck and a way to start over.
+"""
+
+import os
+
+import streamlit as st
+
+from stages.common import reset_chat, file_bytes, PPTX_MIME
+
+
+def render_prompt():
+    if not st.session_state.ppt_path:
+        return
+    with st.chat_message("assistant"):
+        if st.session_state.topic and st.session_state.topic.lower() != 'none':
+            st.success(f"Your presentation on **{st.session_state.topic}** is ready!")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            ppt_path = st.session_state.ppt_path
+            # The store may have expired or evicted the deck since it was made
+            if os.path.exists(ppt_path):
+                st.download_button("⬇️ Download PPT", file_bytes(ppt_path), file_name=os.path.basename(ppt_path),
+                    mime=PPTX_MIME, use_container_width=True, type="primary")
+            else:
+                st.info("This presentation is no longer available. Please create a new one.")
+        with col2:
+            if st.button("Create New PPT", use_container_width=True):
+                reset_chat()
+                st.rerun()
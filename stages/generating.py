@@ -0,0 +1,17 @@
+"""
+Generating / Regenerating Stages
+Start this session's deck job once, poll it, then apply the result.
+Regenerating covers theme changes and slide edits (fresh PptxGenJS code).
+"""
+
+import streamlit as st
+
+from stages.deck_jobs import deck_request, run_deck_stage
+
+
+def render():
+    if st.session_state.stage == 'generating':
+        run_deck_stage('generate', deck_request)
+    else:
+        run_deck_stage(st.session_state.get('gen_job_kind') or 'regenerate',
+                       lambda: deck_request(reuse_code=False))
@@ -0,0 +1,147 @@
+"""
+Home Stage (idle)
+Landing page above the chat (hero, quick topic box, feature cards) plus the
+welcome message and trending topics shown while the chat is empty.
+"""
+
+import streamlit as st
+
+from stages.common import add_message
+
+FEATURES = [
+    ("📝", "Create from Topic",     "Type any topic, get a full professional PPT in minutes",       "topic"),
+    ("📊", "Bulk Generation",        "Upload CSV, generate multiple PPTs at once & download ZIP",    "bulk"),
+    ("🏢", "Custom Branding",        "Add company name, logo & accent color to every slide",         "branding"),
+    ("📄", "PDF / Word to PPT",      "Upload PDF or Word document, convert to presentation",         "upload"),
+    ("🎨", "7 Themes",               "Modern, Dark, Light, Corporate, Nature, Bold, Purple",          "theme"),
+    ("🌍", "8 Languages",            "English, Hindi, Gujarati, Tamil, Bengali & more",               "lang"),
+    ("🔢", "Custom Slide Count",     "Choose 5, 8, 10, 15, or 20 slides as per your need",           "slides"),
+    ("🗒️", "Speaker Notes",         "Auto-generated presenter notes for every slide",                "notes"),
+    ("✏️", "Edit Any Slide",         "Modify content of any individual slide after generation",       "edit"),
+    ("💚", "WhatsApp Share",         "Share your presentation link directly on WhatsApp",             "share"),
+    ("📑", "PDF Download",           "Download presentation as PDF alongside PPT",                    "pdf"),
+    ("🔥", "Trending Topics",        "12 popular trending topics — one click to start",               "trending"),
+]
+
+WELCOME_MSG = """**Welcome to AI PPT Generator!**
+
+I can help you create professional PowerPoint presentations in minutes.
+
+**Here's how to get started:**
+
+Upload a document - Click the + button above and upload PDF, Word, or PowerPoint files
+
+Paste your content - Copy and paste any text, article, or notes directly in the chat
+
+Enter a topic - Just type a topic like "AI in Healthcare" or "Digital India" and I'll create a full presentation
+
+**What would you like to do?** Just type below or pick a trending topic!"""
+
+TRENDING_TOPICS = [
+    "Artificial Intelligence", "Climate Change", "Digital India",
+    "Startup Ecosystem", "Mental Health Awareness", "Women Empowerment",
+    "Blockchain Technology", "Electric Vehicles", "Yoga & Wellness",
+    "Space Exploration", "Cybersecurity", "Financial Literacy",
+]
+
+
+def render_landing():
+    """Hero, quick topic box and feature cards (shared with the bulk and branding pages)."""
+    # ── HERO SECTION ──
+    st.markdown("""
+    <div class="hp-hero">
+      <div class="hp-hero-title">Every PPT tool you need in one place</div>
+      <div class="hp-hero-sub">AI-Powered Presentation Maker — 100% Free. No Login Required.</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # ── TOPIC INPUT ──
+    _hero_col1, _hero_col2, _hero_col3 = st.columns([1, 3, 1])
+    with _hero_col2:
+        _quick_topic = st.text_input("Topic", placeholder="Enter topic e.g. Climate Change, Digital India...", label_visibility="collapsed", key="home_topic_input")
+        if st.button("Create PPT Now →", type="primary", use_container_width=True, key="home_create_btn"):
+            if _quick_topic.strip():
+                st.session_state.messages = []
+                st.session_state.stage = 'awaiting_theme'
+                st.session_state.topic = _quick_topic.strip()
+                st.session_state.pending_topic = _quick_topic.strip()
+                add_message("user", _quick_topic.strip())
+                add_message("assistant", "Great topic! Which theme would you like?")
+                st.rerun()
+
+    # ── FEATURE CARDS GRID ──
+    st.markdown('<div class="hp-section-title">All Features</div>', unsafe_allow_html=True)
+
+    _rows = [FEATURES[i:i+4] for i in range(0, len(FEATURES), 4)]
+    for _row in _rows:
+        _cols = st.columns(4)
+        for _ci, (_icon, _title, _desc, _key) in enumerate(_row):
+            with _cols[_ci]:
+                # Full card as button using CSS trick
+                _clicked = st.button(
+                    f"{_icon}\n\n**{_title}**\n\n{_desc}",
+                    key=f"feat_{_key}",
+                    use_container_width=True,
+                )
+                if _clicked:
+                    st.session_state.messages = []
+                    st.session_state.ppt_path = None
+                    if _key == "bulk":
+                        st.session_state.stage = 'bulk_mode'
+                        st.session_state['_scroll_to'] = 'section_bulk'
+                    elif _key == "branding":
+                        st.session_state.stage = 'branding_mode'
+                        st.session_state['_scroll_to'] = 'section_branding'
+                    elif _key == "upload":
+                        st.session_state.stage = 'awaiting_topic'
+                        add_message("assistant", "Upload your PDF or Word document using the + button, or paste your content directly here.")
+                        st.session_state['_scroll_to'] = 'section_chat'
+                    elif _key in ("theme", "slides", "lang", "notes", "edit", "share", "pdf", "trending"):
+                        st.session_state.stage = 'awaiting_topic'
+                        add_message("assistant", f"What topic would you like to create a PPT on? I'll apply the best settings for **{_title}**.")
+                        st.session_state['_scroll_to'] = 'section_chat'
+                    else:
+                        st.session_state.stage = 'awaiting_topic'
+                        add_message("assistant", "What topic would you like to create a PPT on?")
+                        st.session_state['_scroll_to'] = 'section_chat'
+                    st.rerun()
+
+    # ── AUTO-SCROLL JS ──
+    _scroll_target = st.session_state.pop('_scroll_to', None)
+    if _scroll_target:
+        import streamlit.components.v1 as _comp
+        _comp.html(f"""
+        <script>
+        setTimeout(function() {{
+            var el = document.getElementById('{_scroll_target}');
+            if (el) el.scrollIntoView({{behavior:'smooth', block:'start'}});
+            else window.scrollBy(0, 400);
+        }}, 300);
+        </script>
+        """, height=0)
+
+
+def render_header():
+    render_landing()
+    st.markdown('<div style="height:60px"></div>', unsafe_allow_html=True)
+
+
+def render():
+    # Simple welcome message (clean chatbot style - no buttons)
+    if not st.session_state.messages:
+        add_message("assistant", WELCOME_MSG)
+        st.rerun()
+
+    # ─── Trending Topic Suggestions ───
+    if st.session_state.get('file_content'):
+        return
+    st.markdown("**Trending Topics — Click to create:**")
+    cols = st.columns(4)
+    for i, t in enumerate(TRENDING_TOPICS):
+        if cols[i % 4].button(t, key=f"trend_{i}", use_container_width=True):
+            add_message("user", t)
+            st.session_state.stage = 'awaiting_theme'
+            st.session_state.topic = t
+            st.session_state.pending_topic = t
+            add_message("assistant", "Great topic! Which theme would you like?\n\n1. Modern (light, professional)\n2. Dark (dark background)\n3. Light (clean white)\n4. Corporate (navy blue)\n5. Nature (green)\n6. Bold (red)\n7. Purple (creative)")
+            st.rerun()
@@ -0,0 +1,38 @@
+"""
+Logo Stage (awaiting_logo)
+Optional logo for the top-right corner of every slide, then generation starts.
+"""
+
+import base64
+
+import streamlit as st
+
+from stages.common import start_generating, set_blob
+
+SKIP_WORDS = ('skip', 'no', 'nahi', 'nhi', '0')
+
+
+def handle_input(user_input):
+    if user_input.lower().strip() not in SKIP_WORDS:
+        return False  # anything else is treated as a new topic
+    set_blob('logo_blob', None)
+    start_generating("No logo — Generating your **{theme}** presentation on **{topic}** ({slides} slides)...")
+
+
+def render():
+    with st.chat_message("assistant"):
+        st.markdown("**Upload your logo (optional)**\n\nLogo will appear on the top-right corner of every slide.")
+        logo_file = st.file_uploader("Upload logo PNG or JPG", type=["png", "jpg", "jpeg"], key="logo_upload_widget")
+        col_upload, col_skip = st.columns([2, 1])
+        with col_upload:
+            if logo_file:
+                if st.button("Use this logo & Generate", type="primary", use_container_width=True):
+                    logo_b64 = base64.b64encode(logo_file.read()).decode()
+                    logo_ext = logo_file.name.split('.')[-1].lower()
+                    mime = "image/png" if logo_ext == "png" else "image/jpeg"
+                    set_blob('logo_blob', f"data:{mime};base64,{logo_b64}")
+                    start_generating("Logo added! Generating your **{theme}** presentation on **{topic}** ({slides} slides)...")
+        with col_skip:
+            if st.button("Skip", use_container_width=True):
+                set_blob('logo_blob', None)
+                start_generating("Generating your **{theme}** presentation on **{topic}** ({slides} slides)...")
@@ -0,0 +1,59 @@
+"""
+Presenter Stages (ask_name, ask_designation)
+Optional name and designation shown on the title slide.
+"""
+
+import streamlit as st
+
+from stages.common import add_message
+
+
+def _ask_name():
+    with st.chat_message("assistant"):
+        st.markdown("**Enter your name (for the presentation): (optional)**")
+        col1, col2 = st.columns([3,1])
+        with col1:
+            name = st.text_input("Your name", key="presenter_name_input", label_visibility="visible", placeholder="Type your name...", help="This will appear on the PPT (optional)")
+        with col2:
+            skip_btn = st.button("Skip", key="skip_name", help="Skip name", use_container_width=True)
+            if skip_btn:
+                st.session_state.presenter_name = None
+                st.session_state.stage = 'ask_designation'
+                st.rerun()
+        if name:
+            st.session_state.presenter_name = name
+            st.session_state.stage = 'ask_designation'
+            st.rerun()
+
+
+def _welcome(designation):
+    st.session_state.presenter_designation = designation
+    st.session_state.stage = 'idle'
+    # Show personalized welcome
+    name = st.session_state.presenter_name
+    if name:
+        welcome = f"Welcome {name}! Please tell me a topic for your presentation."
+    else:
+        welcome = "Welcome! Please tell me a topic for your presentation."
+    add_message("assistant", welcome)
+    st.rerun()
+
+
+def _ask_designation():
+    with st.chat_message("assistant"):
+        st.markdown("**Enter your designation (for the presentation): (optional)**")
+        col1, col2 = st.columns([3,1])
+        with col1:
+            designation = st.text_input("Your designation", key="presenter_designation_input", label_visibility="visible", placeholder="Type your designation...", help="This will appear on the PPT (optional)")
+        with col2:
+            if st.button("Skip", key="skip_designation", help="Skip designation", use_container_width=True):
+                _welcome(None)
+        if designation:
+            _welcome(designation)
+
+
+def render_prompt():
+    if st.session_state.stage == 'ask_name':
+        _ask_name()
+    else:
+        _ask_designation()
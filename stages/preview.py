@@ -0,0 +1,255 @@
+"""
+Preview Stage
+Slide thumbnails, PPT/PDF downloads, theme switch, WhatsApp share and the
+single-slide editor for a freshly generated deck.
+
+The thumbnail grid, the download buttons, the theme switch and the slide
+editor each run as their own fragment, so clicking inside one of them reruns
+that panel only, not the chat history and every other panel. A full rerun
+happens only when the stage changes (new theme, applied edit, new PPT).
+"""
+
+import os
+import urllib.parse
+
+import streamlit as st
+
+from preview_worker import get_preview, get_full_slide
+from stages.common import reset_chat, file_bytes, get_blob, slide_passages, PPTX_MIME, _fragment
+from stages.deck_jobs import deck_request, start_deck_job
+
+# Preview artifacts are built by preview_worker in the background; these panels
+# poll it and fill in as thumbnails / the PDF become available.
+PREVIEW_POLL_SECONDS = 1.5
+
+
+def _poll_every(ppt_path):
+    """Polling interval for preview fragments (None once the job has finished)."""
+    return None if get_preview(ppt_path)['status'] in ('done', 'failed') else PREVIEW_POLL_SECONDS
+
+
+def _open_slide(page):
+    # Button callback: the state is set before the fragment reruns, no st.rerun() needed
+    st.session_state.open_slide = page
+
+
+def _render_full_slide(ppt_path):
+    """Full-size tier: rendered on demand for the slide the user opened."""
+    page = st.session_state.get('open_slide')
+    if not page:
+        return
+    with st.spinner(f"Loading slide {page}..."):
+        full_path = get_full_slide(ppt_path, page)
+    if full_path:
+        st.image(full_path, caption=f"Slide {page}", use_container_width=True)
+    st.button("✕ Close", key="close_full_slide", on_click=_open_slide, args=(None,))
+
+
+def _render_preview_grid(ppt_path):
+    job = get_preview(ppt_path)
+    thumbs = job['thumbs']
+    total = max(job['slide_count'], len(thumbs))
+    if job['status'] == 'failed' and not any(thumbs):
+        st.info("Preview not available. Download the PPT to view.")
+        return
+    if not total:
+        st.caption("Preparing slide previews...")
+        return
+    _render_full_slide(ppt_path)
+    cols_per_row = 3
+    sprite = job.get('sprite_path')
+    if sprite and os.path.exists(sprite):
+        # One image for the whole grid; per-slide buttons open the full-size tier
+        st.image(sprite, use_container_width=True)
+    for row_start in range(0, total, cols_per_row):
+        cols = st.columns(cols_per_row)
+        for ci in range(min(cols_per_row, total - row_start)):
+            idx = row_start + ci
+            with cols[ci]:
+                thumb = thumbs[idx] if idx < len(thumbs) else None
+                if thumb and not sprite:
+                    st.image(thumb, caption=f"Slide {idx + 1}", use_container_width=True)
+                elif not thumb:
+                    st.markdown(
+                        '<div style="aspect-ratio:16/9;border-radius:8px;background:#e8ecf4;'
+                        'display:flex;align-items:center;justify-content:center;color:#6b7280;'
+                        f'font-size:13px;">Rendering slide {idx + 1}...</div>',
+                        unsafe_allow_html=True
+                    )
+                if thumb:
+                    st.button(f"🔍 Slide {idx + 1}" if sprite else "🔍 Open", key=f"open_slide_{idx + 1}",
+                              use_container_width=True, on_click=_open_slide, args=(idx + 1,))
+
+
+def _render_pdf_button(ppt_path):
+    job = get_preview(ppt_path)
+    pdf_path = job.get('pdf_path')
+    if pdf_path and os.path.exists(pdf_path):
+        st.download_button(
+            "⬇️ Download PDF",
+            file_bytes(pdf_path),
+            file_name=os.path.splitext(os.path.basename(ppt_path))[0] + '.pdf',
+            mime="application/pdf",
+            use_container_width=True,
+        )
+    elif job['status'] == 'failed':
+        st.caption("PDF not available")
+    else:
+        st.button("⏳ Preparing PDF...", disabled=True, use_container_width=True, key="pdf_pending_btn")
+
+
+def _render_ppt_button(ppt_path):
+    st.download_button(
+        "⬇️ Download PPT",
+        file_bytes(ppt_path),
+        file_name=os.path.basename(ppt_path),
+        mime=PPTX_MIME,
+        use_container_width=True,
+        type="primary"
+    )
+
+
+def _render_theme_switch():
+    current_theme = st.session_state.get('theme', 'modern')
+    theme_options = ["Modern", "Dark", "Light", "Corporate", "Nature", "Bold", "Purple"]
+    theme_map_dl = {t: t.lower() for t in theme_options}
+    theme_idx = next((i for i, t in enumerate(theme_options) if t.lower() == current_theme), 0)
+    new_theme_dl = st.selectbox("Change Theme", theme_options, index=theme_idx, label_visibility="collapsed")
+    if theme_map_dl[new_theme_dl] != current_theme:
+        st.session_state.theme = theme_map_dl[new_theme_dl]
+        st.session_state.stage = 'regenerating'
+        st.rerun()  # stage change: full rerun
+
+
+def _render_slide_editor():
+    with st.expander("Edit a Slide", expanded=False):
+        slide_count = st.session_state.get('slide_count', 10)
+        edit_col1, edit_col2 = st.columns([1, 3])
+        with edit_col1:
+            edit_slide_num = st.number_input("Slide #", min_value=1, max_value=slide_count, value=1, step=1, key="edit_slide_num")
+        with edit_col2:
+            edit_instruction = st.text_input("What to change?", placeholder="e.g. Add more points about renewable energy", key="edit_instruction")
+
+        if st.button("Apply Changes", key="apply_edit", type="primary"):
+            if edit_instruction.strip():
+                # Regenerate entire PPT with instruction for specific slide
+                edit_context = f"IMPORTANT: For slide {edit_slide_num}, apply this change: {edit_instruction}"
+                passages = slide_passages(edit_slide_num, edit_instruction)
+                if passages:
+                    edit_context += f"\nSource material for slide {edit_slide_num} (from the uploaded documents):\n{passages}"
+                start_deck_job('edit', deck_request(error_context=edit_context, reuse_code=False),
+                                edit_note=f"Slide {edit_slide_num} updated!")
+                st.session_state.stage = 'regenerating'
+                st.rerun()
+            else:
+                st.warning("Please enter what you want to change.")
+
+
+def _panel(render_fn, *args, run_every=None):
+    """Run render_fn as its own fragment (plain call on Streamlit versions without fragments)."""
+    if _fragment:
+        _fragment(run_every=run_every)(render_fn)(*args)
+    else:
+        render_fn(*args)
+
+
+def _polled(render_fn, ppt_path):
+    """Run render_fn in a fragment that also refreshes itself while the preview job is busy."""
+    poll = _poll_every(ppt_path)
+
+    def _tick():
+        render_fn(ppt_path)
+        if poll and _poll_every(ppt_path) is None:
+            st.rerun()  # job finished: one full rerun drops the polling timer
+    _panel(_tick, run_every=poll)
+
+
+def _preview_panel(ppt_path):
+    _polled(_render_preview_grid, ppt_path)
+
+
+def _pdf_panel(ppt_path):
+    _polled(_render_pdf_button, ppt_path)
+
+
+def render():
+    ppt_path = st.session_state.get('ppt_path')
+
+    # Show success message
+    st.success(f"✅ Your presentation on **{st.session_state.topic}** is ready!")
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # 📄 COLLAPSIBLE AI OUTPUT SECTION
+    # ─────────────────────────────────────────────────────────────────────────────
+    full_ai_output = get_blob(st.session_state.get('full_ai_output_blob'))
+    if full_ai_output:
+        with st.expander("📝 View Full AI Generated Content", expanded=False):
+            st.text_area("AI Output", full_ai_output, height=300, disabled=True, label_visibility="collapsed")
+
+    # ─── Slide Preview Thumbnails ───
+    st.markdown("---")
+    st.markdown("### Slide Preview")
+
+    if ppt_path and os.path.exists(ppt_path):
+        _preview_panel(ppt_path)
+    else:
+        st.info("No presentation generated yet.")
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # 💬 GUIDED CHAT INSTRUCTION
+    # ─────────────────────────────────────────────────────────────────────────────
+    st.markdown("---")
+    st.markdown("""
+    <div style="background: linear-gradient(135deg, #fef3c7, #fde68a); padding: 16px; border-radius: 12px; border: 1px solid #f59e0b;">
+        <h4 style="margin: 0 0 10px 0; color: #92400e;">💡 Want to make changes?</h4>
+        <p style="margin: 0 0 12px 0; color: #78350f; font-size: 14px;">
+            Type in the chat below. Examples:
+        </p>
+        <ul style="margin: 0; padding-left: 20px; color: #78350f; font-size: 13px;">
+            <li>"Slide 3 mein bullets kam karo"</li>
+            <li>"Slide 2 ko simple Hindi mein likho"</li>
+            <li>"Add more points in Slide 4"</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # ⬇️ DOWNLOAD BUTTON (BOTTOM - always visible, big & prominent)
+    # ─────────────────────────────────────────────────────────────────────────────
+    st.markdown("---")
+    col_dl, col_pdf, col_theme, col_new = st.columns([2, 2, 2, 1])
+    with col_dl:
+        if ppt_path and os.path.exists(ppt_path):
+            _panel(_render_ppt_button, ppt_path)
+    with col_pdf:
+        if ppt_path and os.path.exists(ppt_path):
+            _pdf_panel(ppt_path)
+    with col_theme:
+        _panel(_render_theme_switch)
+    with col_new:
+        if st.button("Create New PPT", use_container_width=True):
+            reset_chat()
+            st.rerun()
+
+    # ─── WhatsApp Share ───
+    _topic_name = (st.session_state.get('topic') or st.session_state.get('pending_topic') or 'my presentation').strip()
+    if not _topic_name or _topic_name.lower() == 'none':
+        _topic_name = 'my presentation'
+    _wa_msg = (
+        f"I just created a professional PPT on '{_topic_name}' using AI PPT Generator!\n\n"
+        f"Create your own free presentation at: https://aipptmaker.streamlit.app\n\n"
+        f"(To share the file directly, download the PPT first, then attach it on WhatsApp)"
+    )
+    _wa_url = f"https://wa.me/?text={urllib.parse.quote(_wa_msg)}"
+    st.markdown(
+        f'<a href="{_wa_url}" target="_blank" rel="noopener noreferrer" style="text-decoration:none;">'
+        f'<button style="background:#25D366;color:white;border:none;padding:8px 18px;border-radius:6px;'
+        f'font-size:14px;cursor:pointer;width:100%;margin-top:8px;">Share on WhatsApp</button></a>',
+        unsafe_allow_html=True
+    )
+
+    # ─── Edit Single Slide ───
+    _panel(_render_slide_editor)
+
+    # Store that we're in preview mode for chat handling
+    st.session_state.in_preview_mode = True
@@ -0,0 +1,33 @@
+"""
+Slide Count Stage (awaiting_slides)
+Quick buttons or a typed 5 / 8 / 10 / 15 / 20.
+"""
+
+import streamlit as st
+
+from stages.common import add_message
+
+SLIDE_CHOICES = (5, 8, 10, 15, 20)
+
+
+def _choose(count, message):
+    st.session_state.slide_count = count
+    st.session_state.stage = 'awaiting_logo'
+    add_message("assistant", message)
+    st.rerun()
+
+
+def render_prompt():
+    cols = st.columns(len(SLIDE_CHOICES))
+    for i, count in enumerate(SLIDE_CHOICES):
+        if cols[i].button(f"{count} Slides", key=f"slide_btn_{count}", use_container_width=True):
+            add_message("user", str(count))
+            _choose(count, f"**{count} slides** selected!\n\nUpload your logo (top-right on every slide) or type **skip**:")
+
+
+def handle_input(user_input):
+    chosen = {str(n): n for n in SLIDE_CHOICES}.get(user_input.strip())
+    if chosen:
+        _choose(chosen, f"**{chosen} slides** selected!\n\nUpload your company/NGO logo to add it on every slide (top-right corner), or type **skip**:")
+    add_message("assistant", "Please type: **5**, **8**, **10**, **15**, or **20**")
+    st.rerun()
@@ -0,0 +1,72 @@
+"""
+Theme Stage (awaiting_theme)
+Seven clickable mini-slide thumbnails, or a typed 1-7 / theme name.
+"""
+
+import functools
+
+import streamlit as st
+
+from stages.common import add_message
+
+THEMES_UI = [
+    ("Modern",    "#F5F7FA", "#1565C0", "#FFFFFF", "#1C3557"),
+    ("Dark",      "#0D1B2A", "#E84545", "#1B2E42", "#FFFFFF"),
+    ("Light",     "#FFFFFF", "#0072C6", "#F0F4F8", "#1A1A2E"),
+    ("Corporate", "#0A2342", "#F4A100", "#1B3A6B", "#FFFFFF"),
+    ("Nature",    "#F0F7F0", "#2E7D32", "#FFFFFF",  "#1B5E20"),
+    ("Bold",      "#1A0000", "#E53935", "#2D0A0A", "#FFFFFF"),
+    ("Purple",    "#F3E5F5", "#7B1FA2", "#FFFFFF",  "#4A148C"),
+]
+
+THEME_CHOICES = {
+    '1': 'modern', '2': 'dark', '3': 'light',
+    '4': 'corporate', '5': 'nature', '6': 'bold', '7': 'purple',
+    'modern': 'modern', 'dark': 'dark', 'light': 'light',
+    'corporate': 'corporate', 'nature': 'nature', 'bold': 'bold', 'purple': 'purple',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _thumbnail_html(bg, accent, card, title):
+    """Mini slide thumbnail (static; built once per process)."""
+    return f"""
+            <div style="background:{bg};border-radius:6px;padding:4px;cursor:pointer;
+                 border:2px solid {accent};width:100%;box-sizing:border-box;">
+              <div style="background:{accent};height:4px;border-radius:2px;margin-bottom:4px;"></div>
+              <div style="color:{title};font-size:7px;font-weight:bold;text-align:center;
+                   margin-bottom:3px;font-family:Calibri;">Title</div>
+              <div style="display:flex;gap:2px;">
+                <div style="background:{card};border-radius:2px;flex:1;height:18px;
+                     border:1px solid {accent};opacity:0.8;"></div>
+                <div style="background:{card};border-radius:2px;flex:1;height:18px;
+                     border:1px solid {accent};opacity:0.8;"></div>
+              </div>
+            </div>
+            """
+
+
+def render_prompt():
+    st.markdown("**Choose a theme:**")
+    cols = st.columns(len(THEMES_UI))
+    for i, (name, bg, accent, card, title) in enumerate(THEMES_UI):
+        with cols[i]:
+            st.markdown(_thumbnail_html(bg, accent, card, title), unsafe_allow_html=True)
+            if st.button(name, key=f"theme_btn_{i}", use_container_width=True):
+                add_message("user", name)
+                st.session_state.theme = name.lower()
+                st.session_state.stage = 'awaiting_slides'
+                add_message("assistant", f"Theme: **{name}** selected!\n\nHow many slides?\n\n**5** | **8** | **10** | **15** | **20**\n\nType a number or click:")
+                st.rerun()
+    st.markdown("")
+
+
+def handle_input(user_input):
+    chosen = THEME_CHOICES.get(user_input.strip().lower())
+    if chosen:
+        st.session_state.theme = chosen
+        st.session_state.stage = 'awaiting_slides'
+        add_message("assistant", f"Theme: **{chosen.capitalize()}** selected!\n\nHow many slides?\n\n**5** | **8** | **10** | **15** | **20**\n\nType a number:")
+    else:
+        add_message("assistant", "Please type a number 1-7:")
+    st.rerun()
@@ -0,0 +1,212 @@
+"""
+Topic Input
+Chat input that no stage handler claimed: greetings, slide-edit requests while
+a deck is being previewed, and new topics (validated, then on to the theme).
+Slide edits run as background deck jobs (edit_slide_job), like the preview
+stage's slide editor.
+"""
+
+import re
+
+import streamlit as st
+
+from resources import get_generator
+from deck_pipeline import build_deck
+from stages.common import add_message, is_greeting, is_valid_topic, slide_passages
+from stages.deck_jobs import deck_request, start_deck_job
+
+THEME_PROMPT = "🎨 Choose a theme:\n\n**1. Modern** - Clean white, navy & blue\n**2. Dark** - Dark navy, light text\n**3. Light** - White, colorful accents\n**4. Corporate** - Professional blue\n**5. Nature** - Fresh green tones\n**6. Bold** - Dark with red accents\n**7. Purple** - Creative purple\n\nType 1-7:"
+
+# Patterns to detect slide number, compiled once per process
+SLIDE_NUMBER_PATTERNS = [re.compile(p) for p in (
+    r'slide\s*(\d+)',           # "slide 3", "slide3"
+    r'स्लाइड\s*(\d+)',          # Hindi: "स्लाइड 3"
+    r'(\d+)\s*(st|nd|rd|th)\s*slide',  # "3rd slide"
+    r'#\s*(\d+)',               # "#3"
+)]
+
+
+def detect_slide_edit_request(user_text):
+    """
+    Detect if user wants to edit a specific slide.
+    Returns: (slide_number, edit_instruction) or (None, None)
+    """
+    user_text_lower = user_text.lower()
+
+    slide_num = None
+    for pattern in SLIDE_NUMBER_PATTERNS:
+        match = pattern.search(user_text_lower)
+        if match:
+            slide_num = int(match.group(1))
+            break
+
+    if slide_num:
+        return slide_num, user_text
+    return None, None
+
+
+def regenerate_single_slide(slide_num, instruction, all_slides, topic, language, passages='', bullets_per_slide=4):
+    """
+    Regenerate a single slide based on user instruction. Reads no session state,
+    so it can run on a job worker.
+    """
+    if slide_num < 1 or slide_num > len(all_slides):
+        return None, "Invalid slide number"
+
+    current_slide = all_slides[slide_num - 1]
+
+    try:
+        generator = get_generator()
+        source_section = f"\nSource material from the uploaded documents:\n{passages}\n" if passages else ""
+
+        prompt = f"""You need to modify Slide {slide_num} of a presentation on "{topic}".
+
+Current slide content:
+Title: {current_slide.get('title', '')}
+Bullets: {current_slide.get('bullets', [])}
+
+User's instruction: {instruction}
+{source_section}
+STRICT RULES:
+- Slide title: max 35 characters
+- Each bullet: exactly 1 COMPLETE sentence, max 15 words
+- Never truncate or use "..." — write short but complete sentences
+- 4 bullet points total
+
+Generate the updated slide in this exact format:
+Slide {slide_num}: [Short Title max 35 chars]
+- Complete sentence, max 15 words.
+- Complete sentence, max 15 words.
+- Complete sentence, max 15 words.
+- Complete sentence, max 15 words.
+
+Language: {language}
+Only output the slide content, nothing else."""
+
+        content_dict = generator.generate_ppt_content(
+            topic=f"Modify slide {slide_num}",
+            min_slides=1,
+            max_slides=1,
+            custom_instructions=prompt,
+            bullets_per_slide=bullets_per_slide,
+            bullet_word_limit=25
+        )
+
+        ai_output = content_dict.get("output", "")
+        if not ai_output:
+            return None, "AI returned empty response"
+
+        # Parse the single slide
+        lines = [l.strip() for l in ai_output.split('\n') if l.strip()]
+        new_slide = {"slide_number": slide_num, "bullets": []}
+
+        for line in lines:
+            m = re.match(r"^\*{0,2}Slide\s*\d+\s*[:\-–]\s*(.+?)\*{0,2}$", line, re.IGNORECASE)
+            if m:
+                new_slide["title"] = m.group(1).strip()
+            elif line.startswith('- ') or line.startswith('• ') or line.startswith('* '):
+                new_slide["bullets"].append(line[2:].strip())
+            elif re.match(r'^\d+[\.\)]\s+', line):
+                new_slide["bullets"].append(re.sub(r'^\d+[\.\)]\s+', '', line).strip())
+
+        if new_slide.get("title") or new_slide.get("bullets"):
+            # Preserve original slide properties not being changed
+            if not new_slide.get("title"):
+                new_slide["title"] = current_slide.get("title", f"Slide {slide_num}")
+            return new_slide, None
+        else:
+            return None, "Could not parse AI response"
+
+    except Exception as e:
+        return None, str(e)
+
+
+def edit_slide_job(request, progress=None):
+    """Job body for a chat slide edit: rewrite one slide, then rebuild the deck from the edited slides."""
+    edit = request['edit']
+    slide_num = edit['slide_num']
+    slides = list(request['slides'])
+    if progress:
+        progress('llm', 15, f"AI rewriting slide {slide_num}...")
+    new_slide, error = regenerate_single_slide(slide_num, edit['instruction'], slides, request['topic'],
+                                               request['language'], passages=edit['passages'],
+                                               bullets_per_slide=edit['bullets_per_slide'])
+    if error or not new_slide:
+        return {'success': False, 'ppt_path': None, 'js_code': None, 'ai_source': None, 'error': error,
+                'note': f"❌ Could not update Slide {slide_num}: {error}\n\nPlease try again with a clearer instruction."}
+
+    slides[slide_num - 1] = new_slide
+    # No PptxGenJS code, so the built-in designer renders the edited slides
+    success, result = build_deck(slides, request['topic'], request['theme'], chart=request.get('chart'),
+                                 progress=progress, brand_accent=request.get('brand_accent', ''),
+                                 session_id=request.get('session_id'))
+    if not success:
+        return {'success': False, 'ppt_path': None, 'js_code': None, 'ai_source': None, 'error': result,
+                'note': f"❌ Could not update Slide {slide_num}: {result}\n\nPlease try again."}
+    return {'success': True, 'ppt_path': result, 'js_code': None, 'ai_source': request.get('ai_source'),
+            'error': None, 'slides': slides,
+            'note': f"✅ Slide {slide_num} has been updated!\n\n**New Title:** {new_slide.get('title', 'N/A')}\n**Points:** {len(new_slide.get('bullets', []))} bullet points\n\nCheck the preview above. You can make more changes or download the PPT."}
+
+
+def handle_input(user_input):
+    # 🔧 Slide edit requests while a deck is on screen ("Slide 3 mein bullets kam karo")
+    if st.session_state.get('in_preview_mode') and st.session_state.get('parsed_slides'):
+        slide_num, instruction = detect_slide_edit_request(user_input)
+
+        if slide_num:
+            request = deck_request(reuse_code=False)
+            request['edit'] = {
+                'slide_num': slide_num,
+                'instruction': instruction,
+                'passages': slide_passages(slide_num, instruction),
+                'bullets_per_slide': st.session_state.get('bullets_per_slide', 4),
+            }
+            start_deck_job('edit', request, fn=edit_slide_job)
+            st.session_state.stage = 'regenerating'
+            st.rerun()
+        else:
+            # User is in preview mode but didn't specify a slide number
+            add_message("assistant", "💡 To edit a specific slide, please mention the slide number.\n\nExamples:\n- \"Slide 3 mein bullets kam karo\"\n- \"Slide 5 ko Hindi mein likho\"\n- \"Add more points in Slide 2\"\n\nOr click **New** to create a fresh presentation on a different topic.")
+            st.rerun()
+
+    # Show the user's message immediately in chat
+    with st.chat_message("user"):
+        st.markdown(user_input)
+
+    # Show loading spinner with context-aware message
+    # Different message for preview mode vs initial generation
+    spinner_message = "✨ Processing your changes..." if st.session_state.get('in_preview_mode') else "🤖 AI is creating your presentation..."
+
+    with st.spinner(spinner_message):
+        # If greeting, show welcome and ask for topic
+        if is_greeting(user_input):
+            name = st.session_state.presenter_name
+            name_greeting = f" {name}" if name else ""
+            if st.session_state.get('language', 'English') == 'Hindi':
+                response = (f"नमस्ते{name_greeting}!\n\n"
+                            "मैं आपकी मदद से पेशेवर PowerPoint प्रेजेंटेशन बना सकता हूँ।\n\n"
+                            "कृपया एक विषय लिखें, या डॉक्युमेंट अपलोड करें, या टेक्स्ट पेस्ट करें।\n\n"
+                            "उदाहरण: 'AI in Healthcare', 'Digital India', आदि।")
+            else:
+                response = (f"Hello{name_greeting}!\n\n"
+                            "I can help you create a professional PowerPoint presentation.\n\n"
+                            "Please enter a topic, upload a document, or paste your text.\n\n"
+                            "Example: 'AI in Healthcare', 'Digital India', etc.")
+            add_message("assistant", response)
+            st.session_state.stage = 'idle'
+            st.rerun()
+
+        # If user input is a real topic/text/file, proceed to AI slide generation
+        else:
+            # Validate topic before proceeding
+            is_valid, error_msg = is_valid_topic(user_input)
+            if not is_valid:
+                add_message("assistant", f"{error_msg}\n\nPlease try again with a proper topic.")
+                st.session_state.stage = 'idle'
+                st.rerun()
+
+            # Ask theme selection before generating
+            st.session_state.pending_topic = user_input
+            add_message("assistant", THEME_PROMPT)
+            st.session_state.stage = 'awaiting_theme'
+            st.rerun()
@@ -0,0 +1,478 @@
+"""
+Document Upload
+The + uploader (PDF, Word, text, PPTX, Excel/CSV) and the confirm step that
+turns the extracted text into slides. Imported only while one of them is open.
+"""
+
+import re
+
+import streamlit as st
+
+from doc_extract import extract_document, EXTRACTORS
+from doc_summarize import summarize_document
+from document_upload_component import document_upload_component
+from resources import get_generator
+from stages.common import add_message, put_blob, set_blob, set_chart_data, get_blob, doc_passages, rebuild_doc_index, PANDAS_AVAILABLE, google_api_key, google_cse_id
+
+
+def render_uploader():
+    st.markdown("---")
+    st.markdown("**📁 Upload Document (PDF, Word, Text, PPT, Excel, CSV)**")
+    uploaded_files = document_upload_component()
+    if uploaded_files:
+        progress = st.progress(0, text="Processing files...")
+        total = len(uploaded_files)
+        for idx, (file_name, file_content) in enumerate(uploaded_files):
+            if file_name in st.session_state.file_names:
+                continue
+            ext = file_name.lower().split('.')[-1]
+            if ext in ['xlsx', 'xls', 'csv'] and not PANDAS_AVAILABLE:
+                st.error("pandas not installed. Run: pip install pandas openpyxl")
+                content = f"[File {file_name} - pandas required]"
+            elif ext not in EXTRACTORS:
+                content = f"[File {file_name} uploaded]"
+            else:
+                file_bar = st.progress(0, text=f"Reading {file_name}...")
+
+                def _on_page(done, pages, bar=file_bar, name=file_name):
+                    bar.progress(done / pages, text=f"Reading {name}: page {done}/{pages}")
+
+                # Same bytes as an earlier upload (any session) come straight from the extraction cache
+                result = extract_document(file_name, file_content, progress=_on_page)
+                file_bar.empty()
+                content = result['text']
+                table = result['table']
+                if result['error']:
+                    kind = {'ppt': 'PPTX', 'xlsx': 'XLSX', 'xls': 'XLS', 'csv': 'CSV'}.get(ext, ext.upper())
+                    st.error(f"Could not read {kind} file: {file_name}")
+                    if ext in ['xlsx', 'xls', 'csv']:
+                        content = f"[Could not read {file_name}]"
+                elif table is not None:
+                    # Store chart data for later use (the summary only; rows stay in the column cache)
+                    set_chart_data(table, file_name)
+                    content = (f"[Excel/CSV Data: {file_name} - {table.rows} rows, {len(table.columns)} columns: "
+                               f"{', '.join(map(str, table.columns))}]\n{table.describe()}")
+                elif ext == 'pdf' and not content.strip():
+                    st.warning(f"⚠️ PDF text extraction limited for: {file_name}")
+            st.session_state.file_names.append(file_name)
+            st.session_state.file_blobs.append(put_blob(content))
+            progress.progress((idx+1)/total, text=f"Processed {idx+1}/{total} files")
+        progress.empty()
+        if st.session_state.file_names:
+            rebuild_doc_index()
+            st.session_state.show_uploader = False
+            st.session_state.awaiting_upload_confirm = True
+            st.rerun()
+
+
+def render_confirm():
+    st.success(f"✅ {len(st.session_state.file_names)} file(s) attached successfully!")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("📎 Attach more", key="attach_more_btn", use_container_width=True):
+            st.session_state.show_uploader = True
+            st.session_state.awaiting_upload_confirm = False
+            st.rerun()
+    # ─── CHART CONFIGURATION (if Excel/CSV was uploaded) ───
+    chart_data = st.session_state.get('chart_data')
+    table = get_blob(chart_data['table_blob']) if chart_data and PANDAS_AVAILABLE else None
+    if table is not None:
+        st.markdown("---")
+        st.markdown(f"**📊 Chart Options for {chart_data['filename']}**")
+        st.dataframe(table.preview.head(5), use_container_width=True)
+
+        numeric_cols = table.numeric_columns
+        all_cols = table.columns
+
+        if numeric_cols and len(all_cols) >= 2:
+            chart_col1, chart_col2 = st.columns(2)
+            with chart_col1:
+                chart_type = st.selectbox("Chart Type", ["bar", "pie", "line"],
+                                          key="chart_type_select",
+                                          format_func=lambda x: {"bar": "Bar Chart", "pie": "Pie Chart", "line": "Line Chart"}[x])
+            with chart_col2:
+                chart_title = st.text_input("Chart Title", value=f"Data from {chart_data['filename']}",
+                                            key="chart_title_input")
+
+            st.session_state.chart_settings = {
+                'chart_type': chart_type,
+                'chart_title': chart_title
+            }
+        else:
+            st.warning("Need at least 1 label column and 1 numeric column for charts.")
+
+    with col2:
+        if st.button("🚀 Generate PPT", key="generate_ppt_btn_main", use_container_width=True, type="primary"):
+            # Combine all file contents for AI analysis
+            combined_content = "\n\n---\n\n".join(get_blob(key, '') for key in st.session_state['file_blobs'])
+            file_names_str = ", ".join(st.session_state['file_names'])
+
+            # Debug: Check if content was extracted
+            print(f"[DEBUG] File contents length: {len(combined_content)}")
+            print(f"[DEBUG] File names: {file_names_str}")
+
+            # Set stage to show we're processing
+            st.session_state.awaiting_upload_confirm = False
+
+            # Check if we have actual content
+            if not combined_content.strip() or len(combined_content.strip()) < 50:
+                st.error("❌ No content could be extracted from uploaded files. Please check if files have readable text.")
+                st.session_state.awaiting_upload_confirm = True
+            else:
+                with st.spinner("🤖 AI is analyzing your documents and creating slides..."):
+                    try:
+                        # Use AI to analyze and create proper slide content
+                        generator = get_generator()
+                        language = st.session_state.get('language', 'English')
+
+                        # Large documents are summarized chunk by chunk (map-reduce) instead of cut at 8000 chars
+                        summary_bar = st.progress(0, text="Reading your documents...")
+
+                        def _on_chunk(done, chunks):
+                            summary_bar.progress(done / max(chunks, 1), text=f"Summarizing section {done}/{chunks}")
+
+                        summary = summarize_document(combined_content, progress=_on_chunk)
+                        summary_bar.empty()
+                        content_for_ai = summary['content']
+
+                        # ─────────────────────────────────────────────────────────────
+                        # 🎯 AI-POWERED SMART TITLE GENERATION
+                        # ─────────────────────────────────────────────────────────────
+                        st.info("🎨 AI is creating an attractive title for your presentation...")
+                        smart_titles = generator.generate_smart_title(
+                            content=content_for_ai,
+                            language=language,
+                            style=st.session_state.get('theme', 'corporate')
+                        )
+
+                        if smart_titles.get('success'):
+                            print("[DEBUG] AI-generated titles:")
+                            print(f"  Main Title: {smart_titles['main_title']}")
+                            print(f"  Tagline: {smart_titles['tagline']}")
+                            print(f"  Subtitle: {smart_titles['subtitle']}")
+                        else:
+                            print(f"[DEBUG] Title generation fallback: {smart_titles.get('error', 'Unknown error')}")
+
+                        # ─────────────────────────────────────────────────────────────
+                        # 🔍 WEB SEARCH ENRICHMENT - Get related content from Wikipedia/Web
+                        # ─────────────────────────────────────────────────────────────
+                        web_context = ""
+                        try:
+                            # Extract topic/keywords from file content for search
+                            first_lines = combined_content[:500].split('\n')
+                            search_topic = ""
+                            for line in first_lines[:5]:
+                                clean = line.strip()
+                                if clean and 10 < len(clean) < 100:
+                                    search_topic = clean
+                                    break
+                            if not search_topic:
+                                # Use filename as search topic
+                                search_topic = re.sub(r'\.(docx|pdf|pptx|txt)$', '', file_names_str.split(',')[0], flags=re.IGNORECASE)
+                                search_topic = search_topic.replace('_', ' ').replace('-', ' ')
+
+                            print(f"[DEBUG] Web search topic: {search_topic}")
+
+                            if google_api_key and google_cse_id and search_topic:
+                                from web_search import search_google
+                                results = search_google(search_topic, google_api_key, google_cse_id, num_results=3)
+                                if results:
+                                    web_snippets = []
+                                    for r in results:
+                                        snippet = r.get('snippet', '')
+                                        title = r.get('title', '')
+                                        if snippet:
+                                            web_snippets.append(f"• {title}: {snippet}")
+                                    if web_snippets:
+                                        web_context = "\n\nWEB RESEARCH CONTEXT (Additional information from web search):\n" + '\n'.join(web_snippets)
+                                        print(f"[DEBUG] Added web context: {len(web_context)} chars")
+                        except Exception as web_err:
+                            print(f"[DEBUG] Web search error (non-critical): {web_err}")
+
+                        # Summaries lose detail: add the passages that best match the title, verbatim
+                        key_passages = ""
+                        if summary['chunks']:
+                            title_query = ' '.join([st.session_state.get('topic') or '', smart_titles.get('main_title', ''),
+                                                    smart_titles.get('tagline', ''), smart_titles.get('subtitle', '')])
+                            key_passages = doc_passages(title_query)
+                            if key_passages:
+                                key_passages = f"\n\nKEY PASSAGES (verbatim excerpts most relevant to the title):\n{key_passages}"
+                                print(f"[DEBUG] Added key passages: {len(key_passages)} chars")
+
+                        # Calculate dynamic slide count based on content size
+                        content_length = len(combined_content)
+                        if content_length > 50000:  # Very large document (200+ pages)
+                            min_slides_dynamic = 15
+                            max_slides_dynamic = 25
+                        elif content_length > 20000:  # Large document (50-200 pages)
+                            min_slides_dynamic = 12
+                            max_slides_dynamic = 20
+                        elif content_length > 10000:  # Medium document
+                            min_slides_dynamic = 10
+                            max_slides_dynamic = 15
+                        else:  # Small document
+                            min_slides_dynamic = 8
+                            max_slides_dynamic = 12
+
+                        print(f"[DEBUG] Content length: {content_length}, slides: {min_slides_dynamic}-{max_slides_dynamic}")
+
+                        # Pass combined file content as user-provided content for AI to analyze
+                        custom_instructions = f"""USER PROVIDED DOCUMENT CONTENT{' (section-by-section summary of the full document)' if summary['chunks'] else ''} (Analyze this content and create a well-structured presentation):
+
+{content_for_ai}{key_passages}
+{web_context}
+
+STRICT RULES:
+- Each slide title: max 35 characters
+- Each bullet: exactly 1 COMPLETE sentence, max 15 words. Never leave incomplete.
+- Never truncate or use "..." — better to write less than leave incomplete.
+- 4 bullet points per slide (no more, no less)
+- Extract key points from the document content above
+- Use web research context to enrich the information
+- If Language is Hindi: Write complete short Hindi sentences, not keywords.
+- Language: {language}
+- Tone: Professional / Informative
+- Create {min_slides_dynamic}-{max_slides_dynamic} slides covering all important topics, in document order"""
+
+                        content_dict = generator.generate_ppt_content(
+                            topic=f"Presentation from: {file_names_str}",
+                            min_slides=min_slides_dynamic,
+                            max_slides=max_slides_dynamic,
+                            style=st.session_state.get('theme', 'corporate'),
+                            audience="general",
+                            custom_instructions=custom_instructions,
+                            bullets_per_slide=st.session_state.get('bullets_per_slide', 4),
+                            bullet_word_limit=30,
+                            tone="professional",
+                            required_phrases="",
+                            forbidden_content=""
+                        )
+
+                        # Debug: Check AI response
+                        print(f"[DEBUG] AI Response keys: {content_dict.keys() if isinstance(content_dict, dict) else 'Not a dict'}")
+
+                        # Parse AI output into slides (same parser used for topic-based generation)
+                        def parse_file_slides(ai_output):
+                            slides = []
+                            if not ai_output:
+                                return slides
+                            lines = [l.strip() for l in ai_output.split('\n') if l.strip()]
+                            current_slide = {}
+                            for line in lines:
+                                # More flexible pattern to match various slide formats
+                                m = re.match(r"^\*{0,2}Slide\s*(\d+)\s*[:\-–]\s*(.+?)\*{0,2}$", line, re.IGNORECASE)
+                                if m:
+                                    if current_slide:
+                                        slides.append(current_slide)
+                                    current_slide = {"slide_number": int(m.group(1)), "title": m.group(2).strip(), "bullets": []}
+                                elif line.lower().startswith('main title:'):
+                                    if current_slide:
+                                        current_slide["main_title"] = line.split(':',1)[1].strip()
+                                elif line.lower().startswith('tagline:'):
+                                    if current_slide:
+                                        current_slide["tagline"] = line.split(':',1)[1].strip()
+                                elif line.lower().startswith('subtitle:'):
+                                    if current_slide:
+                                        current_slide["subtitle"] = line.split(':',1)[1].strip()
+                                elif line.lower().startswith('presented by:'):
+                                    if current_slide:
+                                        current_slide["presented_by"] = line.split(':',1)[1].strip()
+                                elif line.startswith('- ') or line.startswith('• ') or line.startswith('* ') or line.startswith('– '):
+                                    bullet_text = line[2:].strip()
+                                    if bullet_text and current_slide:
+                                        current_slide.setdefault("bullets", []).append(bullet_text)
+                                elif re.match(r'^\d+[\.\)]\s+', line):
+                                    bullet_text = re.sub(r'^\d+[\.\)]\s+', '', line).strip()
+                                    if bullet_text and current_slide:
+                                        current_slide.setdefault("bullets", []).append(bullet_text)
+                            if current_slide:
+                                slides.append(current_slide)
+                            # Inject presenter info
+                            if slides:
+                                first = slides[0]
+                                if st.session_state.presenter_name:
+                                    first["presented_by"] = st.session_state.presenter_name
+                                if st.session_state.presenter_designation:
+                                    if first.get("subtitle"):
+                                        first["subtitle"] = (first.get("subtitle","") + f"\n{st.session_state.presenter_designation}").strip()
+                                    else:
+                                        first["subtitle"] = st.session_state.presenter_designation
+                            return slides
+
+                        ai_output = content_dict.get("output", "")
+                        if not ai_output:
+                            ai_output = content_dict.get("error", "")
+
+                        print(f"[DEBUG] AI output length: {len(ai_output) if ai_output else 0}")
+                        slides = parse_file_slides(ai_output)
+                        print(f"[DEBUG] Parsed slides count: {len(slides)}")
+
+                        # ─────────────────────────────────────────────────────────────
+                        # 🎨 INJECT AI-GENERATED SMART TITLES INTO FIRST SLIDE
+                        # ─────────────────────────────────────────────────────────────
+                        if slides and smart_titles.get('success'):
+                            first_slide = slides[0]
+                            # Override with AI-generated titles
+                            first_slide["main_title"] = smart_titles['main_title']
+                            first_slide["tagline"] = smart_titles['tagline']
+                            first_slide["subtitle"] = smart_titles['subtitle']
+                            print("[DEBUG] Smart titles injected into first slide")
+
+                        # Fallback if AI parsing returned empty slides - create content from documents
+                        if not slides:
+                            st.warning("⚠️ AI parsing incomplete, extracting content directly from documents...")
+
+                            # Smart extraction from document content
+                            all_lines = [l.strip() for l in combined_content.split('\n') if l.strip() and len(l.strip()) > 10]
+
+                            # Try to find a good title from the first few lines
+                            doc_title = None
+                            for line in all_lines[:10]:
+                                # Skip very long lines (likely paragraphs)
+                                if len(line) < 100 and len(line) > 5:
+                                    # Clean the line
+                                    clean_line = re.sub(r'^[\d\.\-\*\#]+\s*', '', line).strip()
+                                    if clean_line and len(clean_line) > 5:
+                                        doc_title = clean_line[:80]  # Limit title length
+                                        break
+
+                            # Fallback to filename-based title
+                            if not doc_title:
+                                first_file = file_names_str.split(',')[0]
+                                doc_title = re.sub(r'\.(docx|pdf|pptx|txt)$', '', first_file, flags=re.IGNORECASE).strip()
+                                doc_title = doc_title.replace('_', ' ').replace('-', ' ').title()
+
+                            # Use AI-generated smart titles if available, otherwise use fallback
+                            if smart_titles.get('success'):
+                                final_main_title = smart_titles['main_title']
+                                final_tagline = smart_titles['tagline']
+                                final_subtitle = smart_titles['subtitle']
+                            else:
+                                final_main_title = doc_title
+                                final_tagline = "Professional Presentation"
+                                final_subtitle = f"Based on {len(st.session_state['file_names'])} uploaded document(s)"
+
+                            # Create title slide with AI-generated or extracted title
+                            slides = [{
+                                "slide_number": 1,
+                                "title": "Title Slide",
+                                "main_title": final_main_title,
+                                "tagline": final_tagline,
+                                "subtitle": final_subtitle,
+                                "presented_by": st.session_state.get('presenter_name', ''),
+                                "bullets": []
+                            }]
+
+                            # Extract meaningful paragraphs for content slides
+                            paragraphs = [p.strip() for p in combined_content.split('\n\n') if p.strip() and len(p.strip()) > 30]
+
+                            # Try to extract section titles from headings
+                            section_titles = []
+                            for line in all_lines:
+                                # Look for potential headings (short lines, possibly numbered)
+                                if 10 < len(line) < 80:
+                                    clean = re.sub(r'^[\d\.\-\*\#]+\s*', '', line).strip()
+                                    if clean and not clean.endswith(','):
+                                        section_titles.append(clean)
+
+                            # Create content slides (5-6 slides)
+                            for i in range(min(5, max(1, len(paragraphs)))):
+                                para = paragraphs[i] if i < len(paragraphs) else ""
+                                if para:
+                                    # Split paragraph into bullet points
+                                    sentences = [s.strip() + '.' for s in re.split(r'[।\.\n]', para) if s.strip() and len(s.strip()) > 20][:3]
+                                    if sentences:
+                                        # Use extracted section title if available, else generic
+                                        slide_title = section_titles[i] if i < len(section_titles) else f"Key Points - Section {i + 1}"
+                                        # Limit title length
+                                        if len(slide_title) > 60:
+                                            slide_title = slide_title[:57] + "..."
+                                        slides.append({
+                                            "slide_number": i + 2,
+                                            "title": slide_title,
+                                            "bullets": sentences
+                                        })
+
+                            # Add conclusion slide
+                            slides.append({
+                                "slide_number": len(slides) + 1,
+                                "title": "Summary & Conclusion",
+                                "bullets": [
+                                    f"Key insights from {len(st.session_state['file_names'])} document(s)",
+                                    "Important points organized for presentation",
+                                    "Review and customize as needed",
+                                    "Thank you!"
+                                ]
+                            })
+
+                        # Add brief AI summary to chat (full content in collapsible preview)
+                        if ai_output and len(ai_output) > 50:
+                            msg = f"📄 Analyzed {len(st.session_state['file_names'])} file(s) and created {len(slides)} slides. View full content in the preview below."
+                            set_blob('full_ai_output_blob', ai_output)  # Store for collapsible display
+                        else:
+                            msg = f"📄 Extracted content from {len(st.session_state['file_names'])} file(s) and created {len(slides)} slides."
+                            set_blob('full_ai_output_blob', None)
+                        add_message("assistant", msg)
+
+                        st.session_state.parsed_slides = slides
+                        st.session_state.stage = 'generating'
+                        st.session_state.topic = file_names_str
+                        st.session_state.ppt_path = None
+                        st.rerun()
+
+                    except Exception as e:
+                        print(f"[DEBUG] Exception: {str(e)}")
+                        st.error(f"Error generating content: {str(e)}")
+                        # Fallback to basic extraction with better content
+                        st.info("Using direct content extraction as fallback...")
+
+                        all_lines = [l.strip() for l in combined_content.split('\n') if l.strip() and len(l.strip()) > 10]
+                        paragraphs = [p.strip() for p in combined_content.split('\n\n') if p.strip() and len(p.strip()) > 30]
+
+                        # Extract title from content
+                        doc_title = None
+                        for line in all_lines[:10]:
+                            if len(line) < 100 and len(line) > 5:
+                                clean_line = re.sub(r'^[\d\.\-\*\#]+\s*', '', line).strip()
+                                if clean_line and len(clean_line) > 5:
+                                    doc_title = clean_line[:80]
+                                    break
+                        if not doc_title:
+                            first_file = file_names_str.split(',')[0]
+                            doc_title = re.sub(r'\.(docx|pdf|pptx|txt)$', '', first_file, flags=re.IGNORECASE).strip()
+                            doc_title = doc_title.replace('_', ' ').replace('-', ' ').title()
+
+                        slides = [{
+                            "slide_number": 1,
+                            "title": "Title Slide",
+                            "main_title": doc_title,
+                            "tagline": "Professional Presentation",
+                            "subtitle": f"Based on {len(st.session_state['file_names'])} uploaded document(s)",
+                            "presented_by": st.session_state.get('presenter_name', ''),
+                            "bullets": []
+                        }]
+
+                        for i, para in enumerate(paragraphs[:5]):
+                            if para:
+                                sentences = [s.strip() + '.' for s in re.split(r'[।\.\n]', para) if s.strip() and len(s.strip()) > 20][:3]
+                                if sentences:
+                                    slides.append({
+                                        "slide_number": i + 2,
+                                        "title": f"Key Points - Section {i + 1}",
+                                        "bullets": sentences
+                                    })
+
+                        st.session_state.parsed_slides = slides
+                        st.session_state.stage = 'generating'
+                        st.session_state.topic = file_names_str
+                        st.session_state.ppt_path = None
+                        st.rerun()
+
+
+def render():
+    if st.session_state.show_uploader:
+        render_uploader()
+    # Success message and action buttons AFTER file upload (outside the uploader)
+    if st.session_state.awaiting_upload_confirm and st.session_state.get('file_names'):
+        render_confirm()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Startup Import Profile
+Runs `python -X importtime` in a fresh interpreter over the modules the app
+imports at load time and summarizes the (very long) raw trace into a report:
+total import time, peak RSS, the slowest modules by cumulative and self time,
+and a per-package rollup.
+
+    python startup_profile.py                       # modules app_chatbot.py imports at top level
+    python startup_profile.py -m deck_pipeline -m pandas --top 15
+    python startup_profile.py --json startup.json --raw importtime.log
+
+Modules imported inside functions or through lazy_imports.lazy_import() do
+not show up, which is the point: compare reports before/after a change.
+"""
+
+import os
+import re
+import ast
+import sys
+import json
+import argparse
+import subprocess
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(_PROJECT_DIR, "app_chatbot.py")
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def top_level_imports(path=APP_FILE):
+    """Modules a script imports on every load: module level and try blocks, not route-specific if branches."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.append(node.module)
+            elif isinstance(node, (ast.Try, ast.With)):
+                for field in ('body', 'orelse', 'finalbody'):
+                    visit(getattr(node, field, []))
+                for handler in getattr(node, 'handlers', []):
+                    visit(handler.body)
+
+    visit(tree.body)
+    return list(dict.fromkeys(modules))
+
+
+def run_importtime(modules):
+    """Import `modules` under -X importtime in a child interpreter. Returns (raw stderr, peak RSS MB)."""
+    code = (
+        "import importlib, resource, sys\n"
+        f"for name in {modules!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "    except Exception as e:\n"
+        "        print(f'[PROFILE] import {name} failed: {e}', file=sys.stdout)\n"
+        "print('RSS_KB', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=_PROJECT_DIR, capture_output=True, text=True, timeout=300)
+    rss_mb = None
+    for line in result.stdout.splitlines():
+        if line.startswith('RSS_KB'):
+            rss_mb = int(line.split()[1]) / 1024
+        elif line.startswith('[PROFILE]'):
+            print(line)
+    return result.stderr, rss_mb
+
+
+def parse_importtime(raw):
+    """[{'module', 'self_ms', 'cumulative_ms', 'depth'}] from -X importtime output."""
+    rows = []
+    for line in raw.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        rows.append({
+            'module': m.group(4),
+            'self_ms': int(m.group(1)) / 1000,
+            'cumulative_ms': int(m.group(2)) / 1000,
+            'depth': len(m.group(3)) // 2,
+        })
+    return rows
+
+
+def summarize(rows, top=20):
+    """Report dict: totals, slowest modules and the per-package rollup of self time."""
+    packages = {}
+    for row in rows:
+        pkg = row['module'].split('.')[0]
+        entry = packages.setdefault(pkg, {'package': pkg, 'modules': 0, 'self_ms': 0.0})
+        entry['modules'] += 1
+        entry['self_ms'] += row['self_ms']
+    total_ms = sum(row['self_ms'] for row in rows)
+    return {
+        'modules': len(rows),
+        'total_ms': round(total_ms, 1),
+        'slowest_cumulative': sorted((r for r in rows if r['depth'] == 0),
+                                     key=lambda r: r['cumulative_ms'], reverse=True)[:top],
+        'slowest_self': sorted(rows, key=lambda r: r['self_ms'], reverse=True)[:top],
+        'packages': [dict(p, self_ms=round(p['self_ms'], 1))
+                     for p in sorted(packages.values(), key=lambda p: p['self_ms'], reverse=True)[:top]],
+    }
+
+
+def print_report(report):
+    print(f"\n[PROFILE] {report['modules']} modules imported in {report['total_ms']:.0f} ms"
+          + (f", peak RSS {report['rss_mb']:.0f} MB" if report.get('rss_mb') else ""))
+    print(f"\n{'Top-level imports (cumulative)':<48} {'ms':>9}")
+    for r in report['slowest_cumulative']:
+        print(f"  {r['module']:<46} {r['cumulative_ms']:>9.1f}")
+    print(f"\n{'Slowest modules (self)':<48} {'ms':>9}")
+    for r in report['slowest_self']:
+        print(f"  {r['module']:<46} {r['self_ms']:>9.1f}")
+    print(f"\n{'Packages (self time)':<38} {'modules':>9} {'ms':>9}")
+    for p in report['packages']:
+        print(f"  {p['package']:<36} {p['modules']:>9} {p['self_ms']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize `python -X importtime` for the app's startup imports.")
+    parser.add_argument('-m', '--module', action='append', help="module to import (repeatable; default: app imports)")
+    parser.add_argument('--app', default=APP_FILE, help="script whose top-level imports are profiled")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--raw', help="also keep the raw importtime trace")
+    args = parser.parse_args(argv)
+
+    modules = args.module or top_level_imports(args.app)
+    print(f"[PROFILE] Importing {len(modules)} modules: {', '.join(modules)}")
+    raw, rss_mb = run_importtime(modules)
+    if args.raw:
+        with open(args.raw, 'w') as f:
+            f.write(raw)
+    report = summarize(parse_importtime(raw), top=args.top)
+    report['rss_mb'] = round(rss_mb, 1) if rss_mb else None
+    report['imports'] = modules
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Usage Stats Store
+Concurrency-safe replacement for the visitor_count.json read-modify-write.
+Increments are collected in memory and flushed in one transaction every
+STATS_FLUSH_SECONDS to SQLite in WAL mode, so page loads do no file I/O and
+concurrent sessions (or several server processes) never lose updates.
+
+    increment("total_visits")
+    get_total("ppt_generated")
+    time_series("ppt_generated", window_seconds=7 * 86400, bucket_seconds=86400)
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATS_DB = os.getenv("STATS_DB", os.path.join(_PROJECT_DIR, "output", "stats.db"))
+STATS_FLUSH_SECONDS = float(os.getenv("STATS_FLUSH_SECONDS", "5"))
+LEGACY_FILE = os.path.join(_PROJECT_DIR, "visitor_count.json")
+BUCKET_SECONDS = 3600  # time series resolution (hourly)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name    TEXT PRIMARY KEY,
+    value   INTEGER NOT NULL DEFAULT 0,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS series (
+    name   TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    value  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, bucket)
+);
+"""
+
+
+class StatsStore:
+    """SQLite-backed counters with batched in-memory increments."""
+
+    def __init__(self, path=STATS_DB, flush_seconds=STATS_FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = Counter()        # (name, bucket) -> count not yet written
+        self._totals = {}                # name -> value as of the last flush
+        self._last = {}                  # name -> time of the last increment
+        self._thread = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            self._import_legacy(conn)
+        self._refresh_totals()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection: commit on success, roll back on error, always close."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy(self, conn):
+        """Seed the counters from visitor_count.json the first time the database is created."""
+        if conn.execute("SELECT COUNT(*) FROM counters").fetchone()[0] or not os.path.exists(LEGACY_FILE):
+            return
+        try:
+            with open(LEGACY_FILE, 'r') as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        for name in ("total_visits", "ppt_generated"):
+            if isinstance(legacy.get(name), int):
+                conn.execute("INSERT OR IGNORE INTO counters (name, value, updated) VALUES (?, ?, ?)",
+                             (name, legacy[name], time.time()))
+        print(f"[STATS] Imported counters from {os.path.basename(LEGACY_FILE)}")
+
+    def _read_totals(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT name, value, updated FROM counters").fetchall()
+
+    def _refresh_totals(self, flushed=None):
+        """Reload totals (other processes write too) and drop the increments just flushed."""
+        rows = self._read_totals()
+        with self._lock:
+            if flushed:
+                self._pending.subtract(flushed)
+                self._pending = +self._pending  # drop zeroed keys
+            self._totals = {name: value for name, value, _ in rows}
+            for name, _, updated in rows:
+                self._last.setdefault(name, updated)
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Writing
+    # ─────────────────────────────────────────────────────────────────────
+
+    def increment(self, name, n=1):
+        """Count an event. Written to disk on the next flush."""
+        now = time.time()
+        with self._lock:
+            self._pending[(name, int(now // BUCKET_SECONDS) * BUCKET_SECONDS)] += n
+            self._last[name] = now
+        self.start()
+
+    def flush(self):
+        """Write pending increments in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                pending = Counter(self._pending)
+                last = dict(self._last)
+            if not pending:
+                return 0
+            try:
+                with self._connect() as conn:
+                    totals = Counter()
+                    for (name, bucket), n in pending.items():
+                        totals[name] += n
+                        conn.execute(
+                            "INSERT INTO series (name, bucket, value) VALUES (?, ?, ?) "
+                            "ON CONFLICT(name, bucket) DO UPDATE SET value = value + excluded.value",
+                            (name, bucket, n))
+                    for name, n in totals.items():
+                        conn.execute(
+                            "INSERT INTO counters (name, value, updated) VALUES (?, ?, ?) "
+                            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value, updated = excluded.updated",
+                            (name, n, last.get(name, time.time())))
+            except sqlite3.Error as e:
+                print(f"[STATS] Flush failed, will retry: {e}")
+                return 0
+            self._refresh_totals(flushed=pending)
+            return sum(pending.values())
+
+    def start(self):
+        """Start the periodic flush thread (idempotent)."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            def _loop():
+                while True:
+                    time.sleep(self.flush_seconds)
+                    self.flush()
+
+            self._thread = threading.Thread(target=_loop, name="stats-flush", daemon=True)
+            self._thread.start()
+        atexit.register(self.flush)
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Queries
+    # ─────────────────────────────────────────────────────────────────────
+
+    def get_total(self, name):
+        """Current total including increments not yet flushed (no disk access)."""
+        with self._lock:
+            pending = sum(n for (key, _), n in self._pending.items() if key == name)
+            return self._totals.get(name, 0) + pending
+
+    def totals(self):
+        """All counters: {name: {'value', 'last'}}."""
+        with self._lock:
+            names = set(self._totals) | {key for key, _ in self._pending}
+        return {name: {'value': self.get_total(name), 'last': self._last.get(name)} for name in sorted(names)}
+
+    def time_series(self, name, window_seconds=7 * 86400, bucket_seconds=BUCKET_SECONDS):
+        """[(bucket_start, count)] for the window, re-bucketed to bucket_seconds (multiple of an hour)."""
+        self.flush()
+        since = time.time() - window_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT bucket, value FROM series WHERE name = ? AND bucket >= ? ORDER BY bucket",
+                (name, int(since // BUCKET_SECONDS) * BUCKET_SECONDS)).fetchall()
+        series = Counter()
+        for bucket, value in rows:
+            series[int(bucket // bucket_seconds) * bucket_seconds] += value
+        return sorted(series.items())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_stats() -> StatsStore:
+    """Process-wide stats store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StatsStore()
+    return _store
+
+
+def increment(name, n=1):
+    get_stats().increment(name, n)
+
+
+def get_total(name):
+    return get_stats().get_total(name)
+
+
+def time_series(name, window_seconds=7 * 86400, bucket_seconds=BUCKET_SECONDS):
+    return get_stats().time_series(name, window_seconds, bucket_seconds)
@@ -0,0 +1,400 @@
+"""
+Spreadsheet Ingestion
+CSV / Excel uploads are read in chunks of TABLE_CHUNK_ROWS rows instead of as
+one DataFrame: column types are inferred once from a sample, CSV is parsed
+with pandas' chunked reader and Excel is streamed with openpyxl in read-only
+mode. While the rows go by, the aggregates the chart and the prompt need are
+accumulated (per-column stats, sums per label, sums per time bucket), and the
+numeric / date / label columns are written out as NumPy .npy files in the
+artifact store, which later readers memory-map instead of loading.
+
+What a session keeps is the small TableData summary, not the rows:
+
+    table = ingest_table(data, 'csv', progress=lambda done, total: ...)
+    table.rows, table.columns, table.preview, table.chart_frame(), table.describe()
+    values = table.column('Revenue')   # np.memmap, or None once evicted
+"""
+
+import io
+import os
+import shutil
+import warnings
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from artifact_store import get_store
+
+TABLE_CHUNK_ROWS = int(os.getenv("TABLE_CHUNK_ROWS", "50000"))
+# Label columns with more distinct values than this are not grouped (IDs, free text)
+TABLE_MAX_GROUPS = int(os.getenv("TABLE_MAX_GROUPS", "10000"))
+SAMPLE_ROWS = 1000
+PREVIEW_ROWS = 20
+# Share of non-empty sample values that must parse for a column to count as numeric / date
+NUMERIC_SHARE = 0.95
+DATE_SHARE = 0.8
+
+NUMBER, DATE, TEXT = 'number', 'date', 'text'
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Types
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _parse_dates(values):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # "could not infer format" on every chunk
+        return pd.to_datetime(values, errors='coerce')
+
+
+def _looks_dated(values):
+    # Bare month / day names ("Jan") parse too, but are categories
+    dated = values[values.str.contains(r'\d')]
+    return _parse_dates(dated).notna().sum() >= DATE_SHARE * len(values)
+
+
+def infer_kinds(sample):
+    """{column: 'number' | 'date' | 'text'} from a sample of rows."""
+    kinds = {}
+    for col in sample.columns:
+        values = sample[col].dropna()
+        if pd.api.types.is_bool_dtype(values):
+            kinds[col] = TEXT
+        elif pd.api.types.is_numeric_dtype(values):
+            kinds[col] = NUMBER
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            kinds[col] = DATE
+        elif len(values) and pd.to_numeric(values, errors='coerce').notna().mean() >= NUMERIC_SHARE:
+            kinds[col] = NUMBER
+        elif len(values) and _looks_dated(values.astype(str)):
+            kinds[col] = DATE
+        else:
+            kinds[col] = TEXT
+    return kinds
+
+
+def _coerce(chunk, kinds):
+    for col, kind in kinds.items():
+        if kind == NUMBER:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        elif kind == DATE:
+            chunk[col] = _parse_dates(chunk[col])
+    return chunk
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Row sources
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _csv_chunks(data, progress):
+    """(kinds, iterator of coerced chunks) for CSV bytes."""
+    kinds = infer_kinds(pd.read_csv(io.BytesIO(data), nrows=SAMPLE_ROWS))
+    buf = io.BytesIO(data)
+    # Text and date columns are read as strings in every chunk, so a chunk whose values
+    # happen to look numeric does not change the column's type halfway through
+    dtype = {col: str for col, kind in kinds.items() if kind != NUMBER}
+
+    def _chunks():
+        with pd.read_csv(buf, chunksize=TABLE_CHUNK_ROWS, dtype=dtype) as reader:
+            for chunk in reader:
+                yield _coerce(chunk, kinds)
+                if progress:
+                    progress(buf.tell(), len(data))
+    return kinds, _chunks()
+
+
+def _excel_rows(data, ext):
+    """(header, row iterator, total rows or None) for the first sheet of a workbook."""
+    if ext != 'xlsx':
+        # Legacy .xls cannot be streamed: read it whole and hand it out in slices
+        df = pd.read_excel(io.BytesIO(data))
+        rows = df.itertuples(index=False, name=None)
+        return list(df.columns), rows, len(df)
+    import openpyxl
+    wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    ws = wb.worksheets[0]
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, ())
+    header = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+    total = (ws.max_row - 1) if ws.max_row else None
+    return header, rows, total
+
+
+def _excel_chunks(data, ext, progress):
+    header, rows, total = _excel_rows(data, ext)
+    width = len(header)
+
+    def _batches():
+        batch = []
+        for row in rows:
+            batch.append(row[:width] + (None,) * (width - len(row)))
+            if len(batch) >= TABLE_CHUNK_ROWS:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch or not header:
+            yield pd.DataFrame(batch, columns=header)
+
+    batches = _batches()
+    first = next(batches, pd.DataFrame(columns=header))
+    kinds = infer_kinds(first.head(SAMPLE_ROWS))
+
+    def _chunks():
+        done = 0
+        for chunk in itertools.chain([first], batches):
+            done += len(chunk)
+            yield _coerce(chunk, kinds)
+            if progress and total:
+                progress(min(done, total), total)
+    return kinds, _chunks()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Streaming aggregation + columnar cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _ColumnFile:
+    """One column appended chunk by chunk to a raw scratch file, committed as a .npy object."""
+
+    def __init__(self, store, dtype):
+        self.store = store
+        self.dtype = np.dtype(dtype)
+        self.path = store.scratch_path(suffix='.raw', prefix='column_')
+        self.file = open(self.path, 'wb')
+        self.rows = 0
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self.file.write(values.tobytes())
+        self.rows += len(values)
+
+    def commit(self):
+        """Artifact key of the finished .npy (header + the raw data, streamed)."""
+        self.file.close()
+        out = self.store.scratch_path(suffix='.npy', prefix='column_')
+        try:
+            with open(out, 'wb') as f:
+                np.lib.format.write_array_header_1_0(f, {
+                    'descr': np.lib.format.dtype_to_descr(self.dtype),
+                    'fortran_order': False,
+                    'shape': (self.rows,),
+                })
+                with open(self.path, 'rb') as raw:
+                    shutil.copyfileobj(raw, f, 1 << 20)
+            return self.store.key_for_path(self.store.put_file(out, name="column.npy"))
+        finally:
+            self.store.discard(self.path)
+            self.store.discard(out)
+
+    def abort(self):
+        self.file.close()
+        self.store.discard(self.path)
+
+
+def _combine(total, part):
+    """Running group sums: add part to total, keeping first-seen group order."""
+    if total is None:
+        return part
+    return pd.concat([total, part]).groupby(level=0, sort=False).sum()
+
+
+def _bucket_frequency(start, end):
+    span = (end - start).days
+    if span <= 62:
+        return 'D'
+    if span <= 5 * 366:
+        return 'M'
+    return 'Y'
+
+
+class TableData:
+    """Summary of an ingested spreadsheet; the rows themselves stay in .npy files."""
+
+    def __init__(self, columns, kinds):
+        self.columns = list(columns)
+        self.kinds = dict(kinds)
+        self.rows = 0
+        self.preview = None
+        self.stats = {}            # numeric column -> {'sum', 'min', 'max', 'count'}
+        self.label_column = next((c for c in self.columns if kinds[c] != NUMBER), None)
+        self.date_column = next((c for c in self.columns if kinds[c] == DATE), None)
+        self.groups = None         # label -> sums of numeric columns + 'rows', first-seen order
+        self.time_buckets = None   # bucket start -> sums of numeric columns + 'rows'
+        self.bucket_frequency = None
+        self.categories = None     # label column values, indexed by the codes in its .npy
+        self.column_keys = {}      # column -> artifact key of its .npy
+
+    @property
+    def numeric_columns(self):
+        return [c for c in self.columns if self.kinds[c] == NUMBER]
+
+    def column(self, name):
+        """Memory-mapped values of a stored column (label column: int32 codes into categories), or None."""
+        path = get_store().object_path(self.column_keys[name]) if name in self.column_keys else None
+        if not path:
+            return None
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"[TABLE] Column {name} unreadable: {e}")
+            return None
+
+    def _raw_frame(self, columns):
+        """DataFrame over the memory-mapped columns, or None if any of them is gone."""
+        arrays = {col: self.column(col) for col in columns}
+        if any(a is None for a in arrays.values()):
+            return None
+        return pd.DataFrame(arrays, copy=False)
+
+    def chart_frame(self, chart_type="bar"):
+        """Small DataFrame (label column first, then numeric columns) for a chart slide, see chart_reduce."""
+        from chart_reduce import reduce_frame
+        values = self.numeric_columns
+        label = self.label_column
+        frame = None
+        if label and label == self.date_column:
+            # Lines are downsampled from every row; bars / pies re-bucket the per-day sums
+            if chart_type == "line":
+                frame = self._raw_frame([label] + values)
+            if frame is None and self.time_buckets is not None:
+                frame = self.time_buckets[values].rename_axis(label).reset_index()
+        elif label and self.groups is not None:
+            frame = self.groups[values].rename_axis(label).reset_index()
+        elif not label and values:
+            frame = self._raw_frame(values)
+        if frame is None:
+            frame = self.preview[[c for c in self.columns if c == label or c in values]]
+        return reduce_frame(frame, chart_type)
+
+    def describe(self, top=5):
+        """Plain-text aggregates for the prompt (and table slides)."""
+        lines = [f"{self.rows} rows"]
+        for col, s in self.stats.items():
+            if s['count']:
+                lines.append(f"{col}: total {s['sum']:,.2f}, mean {s['sum'] / s['count']:,.2f}, "
+                             f"min {s['min']:,.2f}, max {s['max']:,.2f}")
+        values = self.numeric_columns
+        if self.groups is not None and values:
+            best = self.groups.sort_values(values[0], ascending=False).head(top)
+            lines.append(f"Top {self.label_column} by {values[0]}: " +
+                         ", ".join(f"{label} ({v:,.2f})" for label, v in best[values[0]].items()))
+        if self.time_buckets is not None and len(self.time_buckets):
+            lines.append(f"{self.date_column}: {self.time_buckets.index.min():%Y-%m-%d} to "
+                         f"{self.time_buckets.index.max():%Y-%m-%d}, {len(self.time_buckets)} buckets ({self.bucket_frequency})")
+        return '\n'.join(lines)
+
+
+class _Aggregator:
+    """Feeds chunks into a TableData and its column files."""
+
+    def __init__(self, columns, kinds, store):
+        self.table = TableData(columns, kinds)
+        self.store = store
+        self.files = {}
+        self.label_codes = {}
+        self.day_sums = None
+        for col in self.table.numeric_columns:
+            self.files[col] = _ColumnFile(store, 'float64')
+        if self.table.date_column:
+            self.files[self.table.date_column] = _ColumnFile(store, 'datetime64[ns]')
+        if self.table.label_column and self.table.label_column not in self.files:
+            self.files[self.table.label_column] = _ColumnFile(store, 'int32')
+
+    def add(self, chunk):
+        table = self.table
+        values = table.numeric_columns
+        if table.preview is None:
+            table.preview = chunk.head(PREVIEW_ROWS).copy()
+        table.rows += len(chunk)
+
+        for col in values:
+            series = chunk[col]
+            s = table.stats.setdefault(col, {'sum': 0.0, 'min': np.inf, 'max': -np.inf, 'count': 0})
+            count = int(series.count())
+            if count:
+                s['sum'] += float(series.sum())
+                s['min'] = min(s['min'], float(series.min()))
+                s['max'] = max(s['max'], float(series.max()))
+                s['count'] += count
+
+        label = table.label_column
+        if label and self.label_codes is not None:
+            if table.kinds[label] == TEXT:
+                self._add_codes(chunk[label])
+            sums = chunk.groupby(label, sort=False)[values].sum() if values else pd.DataFrame(index=chunk[label].dropna().unique())
+            sums['rows'] = chunk.groupby(label, sort=False).size()
+            table.groups = _combine(table.groups, sums)
+            if len(table.groups) > TABLE_MAX_GROUPS:
+                print(f"[TABLE] {label} has over {TABLE_MAX_GROUPS} distinct values; not grouping by it")
+                table.groups = None
+                self.label_codes = None
+
+        date = table.date_column
+        if date:
+            days = chunk[date].dt.floor('D')
+            sums = chunk.groupby(days)[values].sum() if values else pd.DataFrame(index=days.dropna().unique())
+            sums['rows'] = chunk.groupby(days).size()
+            self.day_sums = _combine(self.day_sums, sums)
+
+        for col, column_file in self.files.items():
+            if table.kinds[col] == NUMBER:
+                column_file.append(chunk[col].to_numpy(dtype='float64', na_value=np.nan))
+            elif table.kinds[col] == DATE:
+                column_file.append(chunk[col].to_numpy(dtype='datetime64[ns]'))
+
+    def _add_codes(self, labels):
+        """Write int32 codes for the label column, numbering values in first-seen order."""
+        if self.label_codes is None:
+            return
+        local_codes, uniques = pd.factorize(labels, sort=False)
+        mapping = np.array([self.label_codes.setdefault(u, len(self.label_codes)) for u in uniques] + [-1],
+                           dtype='int32')
+        self.files[self.table.label_column].append(mapping[local_codes])
+
+    def finish(self):
+        table = self.table
+        if self.day_sums is not None and len(self.day_sums):
+            days = self.day_sums.sort_index()
+            table.bucket_frequency = _bucket_frequency(days.index.min(), days.index.max())
+            if table.bucket_frequency == 'D':
+                table.time_buckets = days
+            else:
+                periods = days.index.to_period(table.bucket_frequency).to_timestamp()
+                table.time_buckets = days.groupby(periods).sum()
+        if table.preview is None:
+            table.preview = pd.DataFrame(columns=table.columns)
+        if self.label_codes:
+            table.categories = list(self.label_codes)
+        for col, column_file in self.files.items():
+            if col == table.label_column and table.kinds[col] == TEXT and not self.label_codes:
+                column_file.abort()
+                continue
+            table.column_keys[col] = column_file.commit()
+        return table
+
+    def abort(self):
+        for column_file in self.files.values():
+            column_file.abort()
+
+
+def ingest_table(data, ext, progress=None):
+    """
+    Stream a CSV / Excel file (bytes) into a TableData.
+    progress(done, total) reports bytes for CSV and rows for Excel.
+    """
+    if ext == 'csv':
+        kinds, chunks = _csv_chunks(data, progress)
+    else:
+        kinds, chunks = _excel_chunks(data, ext, progress)
+    aggregator = _Aggregator(list(kinds), kinds, get_store())
+    try:
+        for chunk in chunks:
+            aggregator.add(chunk)
+    except Exception:
+        aggregator.abort()
+        raise
+    table = aggregator.finish()
+    print(f"[TABLE] {ext.upper()}: {table.rows} rows, columns: {table.columns}, "
+          f"{len(table.groups) if table.groups is not None else 'no'} groups, "
+          f"{len(table.column_keys)} columns cached")
+    return table
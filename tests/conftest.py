@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app's modules live flat in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Everything the modules write at import or first use goes to a scratch dir, not output/
+_RUNTIME_DIR = tempfile.mkdtemp(prefix="tests_")
+for _name, _path in (('ARTIFACT_DIR', 'artifacts'), ('TRACE_FILE', 'traces.jsonl'),
+                     ('STATS_DB', 'stats.db'), ('EXTRACT_CACHE_DIR', 'extract_cache'),
+                     ('SUMMARY_CACHE_DIR', 'summary_cache'), ('BULK_DIR', 'bulk')):
+    os.environ.setdefault(_name, os.path.join(_RUNTIME_DIR, _path))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh ArtifactStore under tmp_path, installed as the process-wide store (no GC thread)."""
+    import artifact_store
+    fresh = artifact_store.ArtifactStore(str(tmp_path / "artifacts"))
+    monkeypatch.setattr(artifact_store, "_store", fresh)
+    return fresh
@@ -0,0 +1,93 @@
+"""The deck API checks its bearer token and pushes back with 429 once its own jobs fill up."""
+
+import json
+import time
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import api_server
+import job_queue
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """Deck jobs block until the event is set, so they stay pending during a test."""
+    event = threading.Event()
+
+    def fake_generate_deck(request, progress=None):
+        event.wait(5)
+        return {'success': True, 'ppt_path': None, 'error': None}
+
+    monkeypatch.setattr(api_server, "generate_deck", fake_generate_deck)
+    monkeypatch.setattr(api_server, "API_TOKEN", TOKEN)
+    monkeypatch.setattr(api_server, "API_MAX_PENDING", 2)
+    monkeypatch.setattr(api_server, "_api_jobs", set())
+    monkeypatch.setattr(job_queue, "_jobs", {})
+    monkeypatch.setattr(job_queue, "_active", {})
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def api(release):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api_server.DeckAPIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(api, body, token=TOKEN):
+    headers = {'Content-Type': 'application/json'}
+    if token is not None:
+        headers['Authorization'] = f"Bearer {token}"
+    req = urllib.request.Request(f"{api}/v1/decks", data=json.dumps(body).encode('utf-8'), headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("token", [None, "wrong", TOKEN + "x"])
+def test_bad_token_is_rejected(api, token):
+    status, body = _post(api, {'topic': 'Solar'}, token=token)
+    assert status == 401
+    assert body == {'error': 'unauthorized'}
+
+
+def test_valid_token_queues_a_job(api):
+    status, body = _post(api, {'topic': 'Solar', 'slides': 500})
+    assert status == 202
+    assert job_queue.get_job(body['id'])['meta'] == {'source': 'api', 'topic': 'Solar'}
+
+
+def test_bad_body_is_400(api):
+    assert _post(api, ['Solar'])[0] == 400
+    assert _post(api, {'topic': ' '})[0] == 400
+
+
+def test_429_once_api_jobs_fill_up(api, release):
+    assert _post(api, {'topic': 'One'})[0] == 202
+    assert _post(api, {'topic': 'Two'})[0] == 202
+    status, body = _post(api, {'topic': 'Three'})
+    assert status == 429
+    assert body == {'error': 'queue full, retry later'}
+
+    release.set()
+    for job_id in list(api_server._api_jobs):
+        while job_queue.get_job(job_id)['status'] in job_queue.ACTIVE_STATES:
+            time.sleep(0.01)
+    assert _post(api, {'topic': 'Four'})[0] == 202
+
+
+def test_app_jobs_do_not_count_against_the_api(api, release):
+    for _ in range(3):
+        job_queue.submit_job(lambda progress=None: release.wait(5))
+    assert _post(api, {'topic': 'Solar'})[0] == 202
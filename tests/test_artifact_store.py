@@ -0,0 +1,101 @@
+"""Objects are committed atomically, deduplicated, and only evicted once no session in any process holds them."""
+
+import os
+import time
+
+import pytest
+
+from artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "artifacts")
+
+
+def _age(store, path, seconds):
+    """Pretend the object at path was last used `seconds` ago."""
+    past = time.time() - seconds
+    os.utime(os.path.join(store.objects_dir, store.key_for_path(path)), (past, past))
+
+
+def test_put_commits_and_deduplicates(root):
+    store = ArtifactStore(root)
+    path = store.put_bytes(b"deck", name="deck.pptx")
+    assert os.path.basename(path) == "deck.pptx"
+    with open(path, 'rb') as f:
+        assert f.read() == b"deck"
+    assert store.put_bytes(b"deck", name="deck.pptx") == path
+    # Same bytes under another name are another object
+    assert store.put_bytes(b"deck", name="other.pptx") != path
+    assert store.object_path(store.key_for_path(path)) == path
+    assert os.listdir(store.scratch_dir) == []
+
+
+def test_gc_evicts_unreferenced_past_ttl(root):
+    store = ArtifactStore(root, ttl_hours=1, grace_seconds=0)
+    kept = store.put_bytes(b"kept", name="a.bin")
+    held = store.put_bytes(b"held", name="b.bin")
+    old = store.put_bytes(b"old", name="c.bin")
+    store.acquire("s1", held)
+    for path in (held, old):
+        _age(store, path, 2 * 3600)
+
+    assert store.gc()['removed'] == 1
+    assert os.path.exists(kept) and os.path.exists(held)
+    assert not os.path.exists(old)
+
+    store.release("s1", held)
+    store.gc()
+    assert not os.path.exists(held)
+
+
+def test_gc_evicts_least_recently_used_over_quota(root):
+    store = ArtifactStore(root, quota_mb=1.5 / 1024, grace_seconds=0)  # room for one 1 KB object
+    older = store.put_bytes(b"o" * 1024, name="older.bin")
+    newer = store.put_bytes(b"n" * 1024, name="newer.bin")
+    _age(store, older, 60)
+    store.gc()
+    assert not os.path.exists(older)
+    assert os.path.exists(newer)
+
+
+def test_grace_period_protects_new_objects(root):
+    store = ArtifactStore(root, quota_mb=0, grace_seconds=600)
+    path = store.put_bytes(b"new", name="new.bin")
+    store.gc()
+    assert os.path.exists(path)
+    _age(store, path, 601)
+    store.gc()
+    assert not os.path.exists(path)
+
+
+def test_put_with_session_holds_the_object(root):
+    store = ArtifactStore(root, quota_mb=0, grace_seconds=0)
+    path = store.put_bytes(b"mine", name="mine.bin", session_id="s1")
+    store.gc()
+    assert os.path.exists(path)
+
+
+def test_refs_are_shared_between_processes(root):
+    # Two stores on one directory stand in for two app processes
+    app, worker = ArtifactStore(root, quota_mb=0, grace_seconds=0), ArtifactStore(root, quota_mb=0, grace_seconds=0)
+    path = app.put_bytes(b"shared", name="shared.bin", session_id="s1")
+    worker.gc()
+    assert os.path.exists(path)
+
+    app.release("s1", path)
+    worker.gc()
+    assert not os.path.exists(path)
+    assert os.listdir(app.refs_dir) == []
+
+
+def test_refs_of_silent_sessions_expire(root):
+    store = ArtifactStore(root, quota_mb=0, session_ttl_hours=1, grace_seconds=0)
+    path = store.put_bytes(b"stale", name="stale.bin", session_id="s1")
+    marker = os.path.join(store.refs_dir, store.key_for_path(path), "s1")
+    past = time.time() - 2 * 3600
+    os.utime(marker, (past, past))
+    # Another process, which never saw the session, still drops its stale marker
+    ArtifactStore(root, quota_mb=0, session_ttl_hours=1, grace_seconds=0).gc()
+    assert not os.path.exists(path)
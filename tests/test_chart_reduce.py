@@ -0,0 +1,87 @@
+"""Chart data is cut down to what a slide can show without losing totals, peaks or dips."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_reduce import OTHER_LABEL, lttb, reduce_frame, top_n
+
+
+def _reference_lttb(x, y, points):
+    """Textbook LTTB, one bucket at a time."""
+    n = len(x)
+    every = (n - 2) / (points - 2)
+    keep, a = [0], 0
+    for i in range(points - 2):
+        lo, hi = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        nlo, nhi = hi, min(int(np.floor((i + 2) * every)) + 1, n)
+        if i == points - 3:
+            nlo, nhi = n - 1, n
+        ax, ay = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = [abs((x[a] - ax) * (y[j] - y[a]) - (x[a] - x[j]) * (ay - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(area))
+        keep.append(a)
+    return keep + [n - 1]
+
+
+def test_top_n_keeps_small_sets_in_order():
+    labels, sums = top_n(['b', 'a', 'b', None, 'c'], np.array([[1.0], [2.0], [3.0], [9.0], [np.nan]]), n=5)
+    assert labels == ['b', 'a', 'c']
+    assert sums[:, 0].tolist() == [4.0, 2.0, 0.0]
+
+
+def test_top_n_folds_the_tail_into_other():
+    labels = [f"L{i}" for i in range(10)] * 3
+    matrix = np.array([[float(i), 1.0] for i in range(10)] * 3)
+    kept, sums = top_n(labels, matrix, n=4)
+    assert kept == ['L9', 'L8', 'L7', OTHER_LABEL]
+    assert sums[:, 0].tolist() == [27.0, 24.0, 21.0, 3.0 * sum(range(7))]
+    # Nothing is lost: every series still adds up to the original total
+    assert sums.sum(axis=0).tolist() == matrix.sum(axis=0).tolist()
+
+
+def test_lttb_matches_the_reference():
+    rng = np.random.default_rng(3)
+    x = np.arange(1000, dtype='float64')
+    y = np.cumsum(rng.normal(size=1000))
+    assert lttb(x, y, 50).tolist() == _reference_lttb(x, y, 50)
+
+
+def test_lttb_keeps_ends_and_spikes():
+    x = np.arange(10_000, dtype='float64')
+    y = np.zeros(10_000)
+    y[4321], y[7000] = 100.0, -50.0
+    keep = lttb(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 9_999
+    assert {4321, 7000} <= set(keep.tolist())
+    assert (np.diff(keep) > 0).all()
+    assert lttb(x[:10], y[:10], 100).tolist() == list(range(10))
+
+
+def test_reduce_line_sorts_and_downsamples():
+    df = pd.DataFrame({'Day': pd.date_range('2024-01-01', periods=5000, freq='h')[::-1],
+                       'Price': np.linspace(1, 2, 5000)})
+    out = reduce_frame(df, "line", points=200)
+    assert len(out) == 200
+    assert out['Day'].is_monotonic_increasing
+    assert out['Day'].iloc[0] == df['Day'].min()
+
+
+def test_reduce_bar_and_pie_limits():
+    df = pd.DataFrame({'City': [f"C{i % 30}" for i in range(3000)], 'Sales': 1.0})
+    bar, pie = reduce_frame(df, "bar"), reduce_frame(df, "pie")
+    assert len(bar) == 12 and len(pie) == 8
+    assert bar['City'].iloc[-1] == OTHER_LABEL
+    assert bar['Sales'].sum() == pie['Sales'].sum() == 3000
+
+
+def test_reduce_dates_to_calendar_buckets():
+    # Three years: 36 months do not fit in 12 bars, 12 quarters do
+    df = pd.DataFrame({'Date': pd.date_range('2021-01-01', '2023-12-31', freq='D').strftime('%Y-%m-%d'), 'Units': 1})
+    out = reduce_frame(df, "bar")
+    assert out['Date'].tolist() == [f"{y} Q{q}" for y in range(2021, 2024) for q in range(1, 5)]
+    assert out['Units'].sum() == pytest.approx(365 * 3)
+    # Four years do not fit in quarters either
+    df = pd.DataFrame({'Date': pd.date_range('2020-01-01', '2023-12-31', freq='D'), 'Units': 1})
+    assert reduce_frame(df, "bar")['Date'].tolist() == ['2020', '2021', '2022', '2023']
@@ -0,0 +1,52 @@
+"""Native chart slides, including ones rebuilt from the chart cache, survive a save and reopen."""
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+from pptx.shapes.shapetree import SlideShapes
+from pptx.util import Inches
+
+from chart_render import add_native_chart
+
+
+def _deck_with_chart(df, path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_native_chart(slide, df, "bar", "Revenue", Inches(1), Inches(1), Inches(8), Inches(4))
+    prs.save(path)
+
+
+def _chart(path):
+    shapes = [s for s in Presentation(path).slides[0].shapes if s.has_chart]
+    assert len(shapes) == 1
+    return shapes[0].chart
+
+
+def test_cached_chart_reopens(store, tmp_path, monkeypatch):
+    df = pd.DataFrame({'Region': ['North', 'South', 'East'], 'Revenue': [10.0, 20.0, 5.0]})
+    first, second = tmp_path / "first.pptx", tmp_path / "second.pptx"
+    _deck_with_chart(df, first)
+    assert len(list((tmp_path / "artifacts" / "objects").iterdir())) == 1
+    monkeypatch.setattr(SlideShapes, "add_chart", lambda *a, **k: pytest.fail("cache not used"))
+    _deck_with_chart(df, second)  # built from the cached chart part
+
+    for path in (first, second):
+        chart = _chart(path)
+        assert list(chart.plots[0].categories) == ['North', 'South', 'East']
+        assert list(chart.plots[0].series[0].values) == [10.0, 20.0, 5.0]
+        # The embedded workbook travels with the chart, so it stays editable
+        assert chart.part.chart_workbook.xlsx_part is not None
+
+
+def test_two_cached_charts_in_one_deck(store, tmp_path):
+    df = pd.DataFrame({'Region': ['North', 'South'], 'Revenue': [1.0, 2.0]})
+    _deck_with_chart(df, tmp_path / "warm.pptx")
+    prs = Presentation()
+    for _ in range(2):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        add_native_chart(slide, df, "bar", "Revenue", Inches(1), Inches(1), Inches(8), Inches(4))
+    path = tmp_path / "two.pptx"
+    prs.save(path)
+    reopened = Presentation(path)
+    parts = {shape.chart.part.partname for slide in reopened.slides for shape in slide.shapes if shape.has_chart}
+    assert len(parts) == 2
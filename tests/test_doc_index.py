@@ -0,0 +1,50 @@
+"""BM25 ranks the passages that match the query, and packing keeps to the token budget."""
+
+from doc_index import ChunkIndex, build_index, estimate_tokens, tokenize
+
+SOLAR = "Solar panels convert sunlight into electricity. Solar farms cover deserts."
+WIND = "Wind turbines turn in coastal gusts. Offshore wind is growing."
+BUDGET = "The annual budget covers salaries, travel and office rent."
+
+
+def _index():
+    return ChunkIndex([("energy.pdf", "Page 1", SOLAR), ("energy.pdf", "Page 2", WIND),
+                       ("finance.docx", "", BUDGET)])
+
+
+def test_tokenize_drops_stopwords_and_single_letters():
+    assert tokenize("The Solar slides: a plan for 2030") == ["solar", "plan", "2030"]
+
+
+def test_search_ranks_matching_passages_first():
+    index = _index()
+    assert [i for _score, i in index.search("solar electricity")] == [0]
+    assert sorted(i for _score, i in index.search("wind budget")) == [1, 2]
+    assert index.search("nothing matches here") == []
+
+
+def test_repeated_and_rare_terms_score_higher():
+    index = ChunkIndex([("a", "", "solar " * 5 + "report"), ("b", "", "solar report"), ("c", "", "report")])
+    ranked = [i for _score, i in index.search("solar report")]
+    assert ranked == [0, 1, 2]
+    # 'report' is in every passage, so it alone counts for little
+    assert index.search("report")[0][0] < index.search("solar")[0][0]
+
+
+def test_pack_fits_budget_in_document_order():
+    index = _index()
+    packed = index.pack("wind solar", budget_tokens=1000)
+    assert packed.index("[energy.pdf · Page 1]") < packed.index("[energy.pdf · Page 2]")
+    assert "finance.docx" not in packed
+
+    one = index.pack("wind solar", budget_tokens=estimate_tokens(SOLAR) + 10)
+    assert one.count("[energy.pdf") == 1
+    assert index.pack("wind", budget_tokens=1) == ""
+
+
+def test_top_terms_describe_the_documents():
+    index = build_index([("report_final.pdf", SOLAR * 3 + WIND)])
+    terms = index.top_terms(3)
+    assert terms[0] == "solar"
+    assert "report_final" not in terms
+    assert index.pack(" ".join(terms))
@@ -0,0 +1,99 @@
+"""Jobs move queued -> running -> done/failed, report progress, and dedupe repeat submits."""
+
+import time
+import threading
+
+import pytest
+
+import job_queue
+
+
+@pytest.fixture(autouse=True)
+def fresh_jobs(monkeypatch):
+    monkeypatch.setattr(job_queue, "_jobs", {})
+    monkeypatch.setattr(job_queue, "_active", {})
+
+
+def _wait(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = job_queue.get_job(job_id)
+        if job['status'] not in job_queue.ACTIVE_STATES:
+            return job
+        time.sleep(0.01)
+    pytest.fail(f"job {job_id} did not finish")
+
+
+def test_job_runs_to_done_with_progress():
+    release = threading.Event()
+    seen = []
+
+    def work(x, progress=None):
+        progress('render', 40, "halfway")
+        seen.append(True)
+        release.wait(5)
+        return x * 2
+
+    job_id = job_queue.submit_job(work, 21, meta={'topic': 'Solar'})
+    while not seen:
+        time.sleep(0.01)
+    job = job_queue.get_job(job_id)
+    assert (job['status'], job['stage'], job['progress'], job['message']) == ('running', 'render', 40, "halfway")
+    assert job['meta'] == {'topic': 'Solar'}
+    assert job_queue.queue_depth('gen') == 1
+
+    release.set()
+    job = _wait(job_id)
+    assert (job['status'], job['progress'], job['result']) == ('done', 100, 42)
+    assert job_queue.queue_depth() == 0
+
+
+def test_failed_job_keeps_its_error():
+    def work(progress=None):
+        raise RuntimeError("renderer crashed")
+
+    job = _wait(job_queue.submit_job(work))
+    assert job['status'] == 'failed'
+    assert job['error'] == "renderer crashed"
+
+
+def test_dedupe_key_reuses_active_job():
+    release = threading.Event()
+
+    def work(progress=None):
+        release.wait(5)
+        return 'ok'
+
+    first = job_queue.submit_job(work, dedupe_key='session-1')
+    assert job_queue.submit_job(work, dedupe_key='session-1') == first
+    assert job_queue.submit_job(work, dedupe_key='session-2') != first
+    release.set()
+    _wait(first)
+    # Once finished, the same key starts a new job
+    assert job_queue.submit_job(work, dedupe_key='session-1') != first
+
+
+def test_pools_are_counted_separately():
+    release = threading.Event()
+
+    def work(progress=None):
+        release.wait(5)
+
+    bulk = job_queue.submit_job(work, pool='bulk')
+    gen = job_queue.submit_job(work)
+    try:
+        assert job_queue.queue_depth('bulk') == 1
+        assert job_queue.queue_depth('gen') == 1
+        assert [job['id'] for job in job_queue.active_jobs('bulk')] == [bulk]
+    finally:
+        release.set()
+        _wait(bulk)
+        _wait(gen)
+
+
+def test_finished_jobs_expire(monkeypatch):
+    job = _wait(job_queue.submit_job(lambda progress=None: 'ok'))
+    monkeypatch.setattr(job_queue, "JOB_TTL_SECONDS", 0)
+    job_queue._jobs[job['id']]['updated'] -= 1
+    job_queue.submit_job(lambda progress=None: None)  # purges on submit
+    assert job_queue.get_job(job['id']) is None
@@ -0,0 +1,86 @@
+"""Process-wide resources are built once per key, however many sessions (threads) ask at once."""
+
+import time
+import threading
+
+import pytest
+
+import resources
+import multi_ai_generator
+
+THREADS = 16
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """A fresh registry, so builds from other tests or imports do not count."""
+    fresh = resources.ResourceRegistry()
+    monkeypatch.setattr(resources, "_registry", fresh)
+    return fresh
+
+
+def _race(fn):
+    """Call fn from THREADS threads released together; returns the results."""
+    barrier = threading.Barrier(THREADS)
+    results = [None] * THREADS
+    errors = []
+
+    def worker(i):
+        try:
+            barrier.wait()
+            results[i] = fn()
+        except Exception as e:  # surfaced below, not lost in the thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    return results
+
+
+def test_get_generator_constructed_once(registry, monkeypatch):
+    constructed = []
+
+    class SlowGenerator(multi_ai_generator.MultiAIGenerator):
+        def __init__(self):
+            constructed.append(threading.get_ident())
+            time.sleep(0.05)  # widen the window for a second build
+            super().__init__()
+
+    monkeypatch.setattr(multi_ai_generator, "MultiAIGenerator", SlowGenerator)
+    generators = _race(resources.get_generator)
+
+    assert len(constructed) == 1
+    assert all(g is generators[0] for g in generators)
+    assert resources.build_counts() == {"multi_ai_generator": 1}
+
+
+def test_http_session_constructed_once_per_name(registry, monkeypatch):
+    built = []
+    original = resources._build_http_session
+
+    def counting_build():
+        built.append(threading.get_ident())
+        time.sleep(0.05)
+        return original()
+
+    monkeypatch.setattr(resources, "_build_http_session", counting_build)
+    sessions = _race(lambda: (resources.http_session(), resources.http_session("images")))
+
+    assert len(built) == 2
+    assert all(default is sessions[0][0] for default, _ in sessions)
+    assert all(images is sessions[0][1] for _, images in sessions)
+    assert sessions[0][0] is not sessions[0][1]
+    assert resources.build_counts() == {"http:default": 1, "http:images": 1}
+
+
+def test_release_rebuilds(registry):
+    calls = []
+    first = resources.shared("thing", lambda: calls.append(1) or object())
+    assert resources.shared("thing", lambda: calls.append(1) or object()) is first
+    resources.release("thing")
+    assert resources.shared("thing", lambda: calls.append(1) or object()) is not first
+    assert len(calls) == 2
@@ -0,0 +1,58 @@
+"""Counters batch in memory, land in SQLite on flush, and add up across processes."""
+
+import threading
+
+import pytest
+
+import stats_store
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats_store, "LEGACY_FILE", str(tmp_path / "visitor_count.json"))
+    return str(tmp_path / "stats.db")
+
+
+def test_increments_batch_until_flush(db, monkeypatch):
+    monkeypatch.setattr(stats_store.StatsStore, "start", lambda self: None)  # no background flush
+    stats = stats_store.StatsStore(db)
+    for _ in range(5):
+        stats.increment("ppt_generated")
+    assert stats.get_total("ppt_generated") == 5
+    assert stats._read_totals() == []
+
+    assert stats.flush() == 5
+    assert stats.flush() == 0
+    [(name, value, _updated)] = stats._read_totals()
+    assert (name, value) == ("ppt_generated", 5)
+    assert stats.get_total("ppt_generated") == 5
+    assert sum(n for _, n in stats.time_series("ppt_generated")) == 5
+
+
+def test_concurrent_increments_from_two_processes(db, monkeypatch):
+    monkeypatch.setattr(stats_store.StatsStore, "start", lambda self: None)
+    # Two stores on one database stand in for two app processes
+    first, second = stats_store.StatsStore(db), stats_store.StatsStore(db)
+
+    def bump(stats):
+        for _ in range(200):
+            stats.increment("total_visits")
+
+    threads = [threading.Thread(target=bump, args=(s,)) for s in (first, second, first, second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    first.flush()
+    second.flush()  # adds to what the other process wrote, then reloads
+    assert second.totals()["total_visits"]["value"] == 800
+    first.increment("total_visits")
+    first.flush()
+    assert first.get_total("total_visits") == 801
+
+
+def test_legacy_counters_are_imported_once(db, tmp_path):
+    (tmp_path / "visitor_count.json").write_text('{"total_visits": 41, "ppt_generated": 7}')
+    stats = stats_store.StatsStore(db)
+    assert stats.get_total("total_visits") == 41
+    assert stats_store.StatsStore(db).get_total("ppt_generated") == 7
@@ -0,0 +1,184 @@
+"""
+Lightweight Tracing
+Context-manager spans around the slow stages of the pipeline (web search,
+LLM calls, Node render, background fix-up, image fetches, LibreOffice,
+pdftoppm). Each finished span is appended as one JSON line to a rotating
+file; the admin metrics page aggregates them into p50/p95/p99.
+
+    with span('llm', provider='Mistral', model=model) as s:
+        resp = requests.post(...)
+        s.set(prompt_tokens=..., completion_tokens=..., truncated=False)
+"""
+
+import os
+import json
+import math
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(_PROJECT_DIR, "output", "traces", "traces.jsonl"))
+TRACE_MAX_MB = float(os.getenv("TRACE_MAX_MB", "20"))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "5"))
+
+_current = contextvars.ContextVar("trace_span", default=None)
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger():
+    """JSONL writer: a logging handler gives us thread-safe appends and size-based rotation."""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                logger = logging.getLogger("deck.traces")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                try:
+                    os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+                    handler = RotatingFileHandler(TRACE_FILE, maxBytes=int(TRACE_MAX_MB * 1024 * 1024),
+                                                  backupCount=TRACE_BACKUPS, encoding='utf-8')
+                    handler.setFormatter(logging.Formatter('%(message)s'))
+                    logger.addHandler(handler)
+                except OSError as e:
+                    print(f"[TRACE] Tracing disabled, cannot open {TRACE_FILE}: {e}")
+                    logger.addHandler(logging.NullHandler())
+                _logger = logger
+    return _logger
+
+
+class Span:
+    """One timed operation. Attributes added with set() end up in the JSONL record."""
+
+    __slots__ = ('name', 'attrs', 'trace_id', 'span_id', 'parent_id', 'start')
+
+    def __init__(self, name, attrs, parent):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as `name`. Exceptions are recorded and re-raised."""
+    if not TRACE_ENABLED:
+        yield Span(name, attrs, None)
+        return
+    current = Span(name, attrs, _current.get())
+    token = _current.set(current)
+    started = time.perf_counter()
+    status, error = 'ok', None
+    try:
+        yield current
+    except BaseException as e:
+        status, error = 'error', f"{type(e).__name__}: {str(e)[:200]}"
+        raise
+    finally:
+        _current.reset(token)
+        if current.attrs.get('error') and status == 'ok':
+            status = 'error'
+        record = {
+            'ts': round(current.start, 3),
+            'name': name,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'status': status,
+            'trace_id': current.trace_id,
+            'span_id': current.span_id,
+            'parent_id': current.parent_id,
+            'thread': threading.current_thread().name,
+        }
+        if error:
+            record['error'] = error
+        record.update(current.attrs)
+        try:
+            _get_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+        except Exception:
+            pass
+
+
+def traced(name, **attrs):
+    """Decorator form of span()."""
+    def decorator(fn):
+        def wrapper(*args, **kwargs):
+            with span(name, **attrs):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return decorator
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Reading / aggregation (admin metrics page)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_spans(window_seconds=None, path=TRACE_FILE):
+    """Spans from the current file and its rotated backups, newest window only."""
+    cutoff = time.time() - window_seconds if window_seconds else 0
+    paths = [f"{path}.{i}" for i in range(TRACE_BACKUPS, 0, -1)] + [path]
+    spans = []
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        if cutoff and os.path.getmtime(p) < cutoff:
+            continue  # the whole file is older than the window
+        with open(p, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('ts', 0) >= cutoff:
+                    spans.append(record)
+    return spans
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(spans, group_by=('name',)):
+    """Rows of count / errors / p50 / p95 / p99 (ms) per group, slowest p95 first."""
+    groups = {}
+    for s in spans:
+        key = tuple(s.get(k) for k in group_by)
+        groups.setdefault(key, []).append(s)
+    rows = []
+    for key, items in groups.items():
+        durations = sorted(s['duration_ms'] for s in items)
+        row = dict(zip(group_by, key))
+        row.update(
+            count=len(items),
+            errors=sum(1 for s in items if s.get('status') != 'ok'),
+            p50_ms=percentile(durations, 50),
+            p95_ms=percentile(durations, 95),
+            p99_ms=percentile(durations, 99),
+            total_s=round(sum(durations) / 1000, 1),
+        )
+        tokens = [s.get('total_tokens') for s in items if s.get('total_tokens')]
+        if tokens:
+            row['tokens'] = sum(tokens)
+        truncated = sum(1 for s in items if s.get('truncated'))
+        if truncated:
+            row['truncated'] = truncated
+        rows.append(row)
+    rows.sort(key=lambda r: r['p95_ms'], reverse=True)
+    return rows
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Warm-up
+One-time bootstrap work kept out of module import: install the PptxGenJS
+node_modules, create the output directories and, optionally, preload the
+heavy libraries before a worker starts taking traffic.
+
+    python warmup.py              # run once at deploy / container build
+    python warmup.py --preload    # also import pandas, pptx, PIL, ...
+
+When a deploy skips this step (e.g. Streamlit Cloud), the app starts the
+npm install in a background thread instead of blocking its first page load;
+run_pptxgenjs waits for it before calling Node.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import importlib
+import subprocess
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+NODE_DIR = os.path.join(_PROJECT_DIR, "node_pptx")
+NPM_COMMANDS = ["npm", "/usr/bin/npm", "/usr/local/bin/npm"]
+NPM_TIMEOUT = int(os.getenv("NPM_INSTALL_TIMEOUT", "120"))
+OUTPUT_DIRS = [os.path.join(_PROJECT_DIR, "output")]
+
+# Libraries the request path imports lazily; --preload pays for them up front
+PRELOAD_MODULES = [
+    "requests", "pandas", "pptx", "PIL.Image",
+    "docx", "PyPDF2", "pdfplumber", "openpyxl", "ai_ppt_generator",
+]
+
+_node_ready = threading.Event()
+_node_lock = threading.Lock()
+_node_thread = None
+
+
+def node_modules_ready():
+    return os.path.isdir(os.path.join(NODE_DIR, "node_modules"))
+
+
+def install_node_modules():
+    """Run `npm install` for the PptxGenJS wrapper if node_modules is missing. Returns True when ready."""
+    try:
+        if node_modules_ready():
+            return True
+        for npm_cmd in NPM_COMMANDS:
+            try:
+                result = subprocess.run([npm_cmd, "install"], cwd=NODE_DIR, capture_output=True, timeout=NPM_TIMEOUT)
+                if result.returncode == 0:
+                    print(f"[STARTUP] npm install OK with {npm_cmd}")
+                    return True
+                print(f"[STARTUP] npm install failed with {npm_cmd}: {result.stderr[:100]}")
+            except Exception as e:
+                print(f"[STARTUP] {npm_cmd} not found: {e}")
+        return node_modules_ready()
+    finally:
+        _node_ready.set()
+
+
+def ensure_node_modules():
+    """Start the npm install in a background thread, once per process (no-op when node_modules exists)."""
+    global _node_thread
+    if _node_ready.is_set():
+        return
+    if node_modules_ready():
+        _node_ready.set()
+        return
+    with _node_lock:
+        if _node_thread is None:
+            _node_thread = threading.Thread(target=install_node_modules, name="npm-install", daemon=True)
+            _node_thread.start()
+
+
+def wait_for_node_modules(timeout=NPM_TIMEOUT):
+    """Block until the npm install has finished (starting it if nobody has). True if node_modules exists."""
+    ensure_node_modules()
+    _node_ready.wait(timeout)
+    return node_modules_ready()
+
+
+def make_dirs():
+    for path in OUTPUT_DIRS:
+        os.makedirs(path, exist_ok=True)
+
+
+def preload(modules=PRELOAD_MODULES):
+    """Import modules now so the first request does not pay for them. Returns {module: seconds or None}."""
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            timings[name] = time.perf_counter() - started
+        except Exception as e:
+            print(f"[STARTUP] preload {name} skipped: {e}")
+            timings[name] = None
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="One-time bootstrap for the deck generator.")
+    parser.add_argument('--preload', action='store_true', help="also import the heavy libraries")
+    args = parser.parse_args(argv)
+
+    make_dirs()
+    started = time.perf_counter()
+    ok = install_node_modules()
+    print(f"[STARTUP] node_modules {'ready' if ok else 'MISSING'} ({time.perf_counter() - started:.1f}s)")
+    if args.preload:
+        for name, seconds in preload().items():
+            if seconds is not None:
+                print(f"[STARTUP] preloaded {name:<20} {seconds * 1000:8.1f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
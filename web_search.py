@@ -1,24 +1,33 @@
-import requests
+import os
+
+from tracing import span
+from resources import http_session
+
+# Override to point at a proxy or a local stand-in server
+GOOGLE_SEARCH_URL = os.getenv("GOOGLE_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
 
 def search_google(query, api_key, cse_id, num_results=5):
     """Search Google using Custom Search API and return top results (title, link, snippet)."""
-    url = "https://www.googleapis.com/customsearch/v1"
+    url = GOOGLE_SEARCH_URL
     params = {
         "q": query,
         "key": api_key,
         "cx": cse_id,
         "num": num_results
     }
-    resp = requests.get(url, params=params)
-    resp.raise_for_status()
-    data = resp.json()
-    results = []
-    for item in data.get("items", []):
-        results.append({
-            "title": item.get("title"),
-            "link": item.get("link"),
-            "snippet": item.get("snippet")
-        })
+    with span("web_search", requested=num_results) as s:
+        resp = http_session().get(url, params=params)
+        s.set(status_code=resp.status_code)
+        resp.raise_for_status()
+        data = resp.json()
+        results = []
+        for item in data.get("items", []):
+            results.append({
+                "title": item.get("title"),
+                "link": item.get("link"),
+                "snippet": item.get("snippet")
+            })
+        s.set(results=len(results))
     return results
 
 # Example usage (replace with your API key and CSE ID):